@@ -3,6 +3,8 @@
 from compilertools import imports  # noqa: E402
 from compilertools.processors import get_processor as _get_processor  # noqa: E402
 from compilertools.compilers import get_compiler as _get_compiler  # noqa: E402
+from compilertools.compilers import clear_compilers as _clear_compilers  # noqa: E402
+from compilertools.processors import clear_processors as _clear_processors  # noqa: E402
 
 
 def get_compiler():
@@ -29,4 +31,15 @@ def get_processor():
     return _get_processor(arch=None, current_machine=True)
 
 
-__all__ = ["imports", "get_compiler", "get_processor"]
+def clear_registry():
+    """
+    Clear compilers and processors interned in the current process.
+
+    Compilers and processors are probed again on next use, for instance after a
+    compiler update.
+    """
+    _clear_compilers()
+    _clear_processors()
+
+
+__all__ = ["imports", "get_compiler", "get_processor", "clear_registry"]
@@ -0,0 +1,383 @@
+"""Persistent cache for CPU detection and compiler probing results."""
+
+from compilertools._config import CONFIG
+
+__all__ = [
+    "load",
+    "store",
+    "cached_call",
+    "cached_processor",
+    "inherit_processors",
+    "machine_fingerprint",
+    "binary_fingerprint",
+]
+
+#: Cache file format version. Increment it when cached values or the way they are
+#: computed change.
+CACHE_VERSION = 2
+
+#: Cache file name
+CACHE_FILE = "detection.json"
+
+_CACHE = None
+_MACHINE = None
+
+#: Processors detection results inherited from the parent process
+_INHERITED_PROCESSORS = {}
+
+
+def _cache_dir():
+    """
+    Return the user cache directory.
+
+    Returns
+    -------
+    str
+        Directory path.
+    """
+    from os import environ
+    from os.path import expanduser, join
+    from platform import system
+
+    name = system()
+    if name == "Windows":
+        base = environ.get("LOCALAPPDATA") or join(expanduser("~"), "AppData", "Local")
+    elif name == "Darwin":
+        base = join(expanduser("~"), "Library", "Caches")
+    else:
+        base = environ.get("XDG_CACHE_HOME") or join(expanduser("~"), ".cache")
+    return join(base, "compilertools")
+
+
+def _cpu_signature():
+    """
+    Return CPU identification and microcode revision, without running CPUID.
+
+    Returns
+    -------
+    str
+        CPU signature. Empty if not available on this platform.
+    """
+    from platform import system
+
+    name = system()
+    if name == "Linux":
+        lines = []
+        try:
+            with open("/proc/cpuinfo", "rt") as file:
+                for line in file:
+                    if not line.strip():
+                        # Only the first processor block is required
+                        break
+                    key = line.split(":", 1)[0].strip()
+                    if key in (
+                        "vendor_id",
+                        "cpu family",
+                        "model",
+                        "stepping",
+                        "microcode",
+                        "CPU implementer",
+                        "CPU variant",
+                        "CPU part",
+                        "CPU revision",
+                        "cpu",
+                        "revision",
+                        "mvendorid",
+                        "marchid",
+                        "mimpid",
+                    ):
+                        lines.append(" ".join(line.split()))
+        except OSError:
+            return ""
+        return ";".join(lines)
+
+    elif name == "Windows":
+        try:
+            import winreg
+
+            with winreg.OpenKey(
+                winreg.HKEY_LOCAL_MACHINE,
+                r"HARDWARE\DESCRIPTION\System\CentralProcessor\0",
+            ) as key:
+                return ";".join(
+                    str(winreg.QueryValueEx(key, value)[0])
+                    for value in ("Identifier", "Update Revision")
+                )
+        except OSError:
+            return ""
+
+    return ""
+
+
+def machine_fingerprint():
+    """
+    Return a fingerprint of the current machine.
+
+    The fingerprint changes with the kernel, the CPU or the CPU microcode.
+
+    Returns
+    -------
+    str
+        Fingerprint.
+    """
+    global _MACHINE
+    if _MACHINE is None:
+        from platform import uname
+
+        info = uname()
+        _MACHINE = "|".join(
+            (info.system, info.release, info.version, info.machine, _cpu_signature())
+        )
+    return _MACHINE
+
+
+def binary_fingerprint(command):
+    """
+    Return a fingerprint of a compiler binary.
+
+    Parameters
+    ----------
+    command : str
+        Compiler command.
+
+    Returns
+    -------
+    str or None
+        Fingerprint based on binary path, size and modification time. None if
+        command is not found.
+    """
+    from os import stat
+    from os.path import realpath
+    from shutil import which
+
+    path = which(command)
+    if path is None:
+        return None
+    path = realpath(path)
+    try:
+        stat_result = stat(path)
+    except OSError:
+        return None
+    return f"{path}|{stat_result.st_size}|{stat_result.st_mtime_ns}"
+
+
+def _cache_path():
+    """
+    Return the cache file path.
+
+    Returns
+    -------
+    str
+        Path.
+    """
+    from os.path import join
+
+    return join(_cache_dir(), CACHE_FILE)
+
+
+def _read():
+    """
+    Read the cache file once per process.
+
+    Returns
+    -------
+    dict
+        Cache content. Empty if not existing, invalid or outdated.
+    """
+    global _CACHE
+    if _CACHE is None:
+        from json import load as json_load
+
+        cache = {}
+        try:
+            with open(_cache_path(), "rt") as file:
+                content = json_load(file)
+            if (
+                content["version"] == CACHE_VERSION
+                and content["machine"] == machine_fingerprint()
+            ):
+                cache = content
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        cache["version"] = CACHE_VERSION
+        cache["machine"] = machine_fingerprint()
+        _CACHE = cache
+    return _CACHE
+
+
+def _write(cache):
+    """
+    Write the cache file atomically.
+
+    Parameters
+    ----------
+    cache : dict
+        Cache content.
+    """
+    from json import dump
+    from os import makedirs, replace, remove
+    from tempfile import NamedTemporaryFile
+
+    directory = _cache_dir()
+    try:
+        makedirs(directory, exist_ok=True)
+        with NamedTemporaryFile("wt", dir=directory, delete=False) as file:
+            dump(cache, file)
+        try:
+            replace(file.name, _cache_path())
+        except OSError:
+            remove(file.name)
+    except OSError:
+        # The cache is only an optimization
+        pass
+
+
+def load(section, key):
+    """
+    Get a value from the cache.
+
+    Parameters
+    ----------
+    section : str
+        Cache section.
+    key : str
+        Key in section.
+
+    Returns
+    -------
+    object
+        Cached value, or None if not cached or if cache is disabled.
+    """
+    if not CONFIG.get("cache", True):
+        return None
+    return _read().get(section, {}).get(key)
+
+
+def store(section, key, value):
+    """
+    Set a value in the cache.
+
+    Parameters
+    ----------
+    section : str
+        Cache section.
+    key : str
+        Key in section.
+    value : object
+        JSON serializable value to cache.
+    """
+    if not CONFIG.get("cache", True):
+        return
+    cache = _read()
+    cache.setdefault(section, {})[key] = value
+    _write(cache)
+
+
+def cached_call(command, name, func, *args):
+    """
+    Call a compiler probing function with its result cached.
+
+    The result is invalidated when the compiler binary changes.
+
+    Parameters
+    ----------
+    command : str
+        Compiler command.
+    name : str
+        Probe name.
+    func : callable
+        Probing function.
+    args
+        Probing function arguments.
+
+    Returns
+    -------
+    object
+        Probing function result.
+    """
+    from compilertools.imports import _Timer
+
+    with _Timer("compiler_probing"):
+        if not CONFIG.get("cache", True):
+            return func(*args)
+
+        binary = binary_fingerprint(command)
+        if binary is None:
+            return func(*args)
+
+        key = f"{command}|{name}"
+        entry = load("compilers", key)
+        if entry is not None and entry[0] == binary:
+            return entry[1]
+
+        value = func(*args)
+        store("compilers", key, [binary, value])
+        return value
+
+
+def cached_processor(processor):
+    """
+    Detect current machine processor properties.
+
+    Detection results are loaded from the cache if available, else detection is
+    run and results are cached.
+
+    Parameters
+    ----------
+    processor : compilertools.processors.ProcessorBase subclass instance
+        Current machine processor.
+
+    Returns
+    -------
+    compilertools.processors.ProcessorBase subclass instance
+        Processor.
+    """
+    from compilertools.imports import _Timer
+
+    with _Timer("cpu_detection"):
+        use_cache = CONFIG.get("cache", True)
+
+        # Results depend on the detection backend
+        key = f"{processor.arch}|{CONFIG.get('cpu_detection', 'auto')}"
+
+        state = _INHERITED_PROCESSORS.get(processor.arch)
+        if state is None and use_cache:
+            state = load("processors", key)
+        if state is not None:
+            try:
+                processor._import_state(state)
+                return processor
+            except (KeyError, TypeError, ValueError):
+                pass
+
+        try:
+            state = processor._export_state()
+        except Exception:
+            # Detection errors are handled on properties access
+            return processor
+
+        if use_cache:
+            store("processors", key, state)
+        return processor
+
+
+def inherit_processors(states):
+    """
+    Use processors detection results from the parent process.
+
+    Parameters
+    ----------
+    states : dict
+        Keys are architectures, values are processors states like returned by
+        "ProcessorBase._export_state".
+    """
+    _INHERITED_PROCESSORS.update(states)
+
+    # Processors already detected in this process, and compilers arguments computed
+    # with them, are replaced
+    from compilertools.compilers import clear_compilers
+    from compilertools.processors import clear_processors
+
+    clear_compilers()
+    clear_processors()
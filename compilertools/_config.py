@@ -8,6 +8,13 @@ CONFIG = {
         "arm": "arm_32",
         # ARM 64bits
         "arm64": "arm_64",
+        "aarch64": "arm_64",
+        # POWER 64bits little endian
+        "ppc64le": "ppc64le",
+        "powerpc64le": "ppc64le",
+        # RISC-V 64bits
+        "riscv64": "riscv64",
+        "rv64": "riscv64",
         # x86 32bits
         "x86_32": "x86_32",
         "x86": "x86_32",
@@ -44,4 +51,12 @@ CONFIG = {
     },
     # Logging: If False, don't log exceptions on stdout
     "logging": True,
+    # Cache: If False, don't use the persistent CPU and compilers detection cache
+    "cache": True,
+    # CPU detection: "auto" (CPUID instruction, or OS information if executable
+    # memory is not available), "cpuid", "os" (Linux only), "cross_check" (Like
+    # "auto", and log differences between CPUID and OS information), or "per_core"
+    # (Like "auto", but CPUID runs on all allowed CPUs and only features common to
+    # all of them are kept, Linux only)
+    "cpu_detection": "auto",
 }
@@ -30,8 +30,28 @@ class ConfigBuild:
         "intel_atom",
         "intel",
         "amd",
+        "amx",
+        "avx512_bf16",
+        "avxvnni",
+        "x86_64_v2",
+        "x86_64_v3",
+        "x86_64_v4",
+        "lse",
     }
 
+    #: Enabled suffixes combinations (Like "avx2-intel", see
+    #: "compilertools.fleet.plan"). If this set is not empty, only these combinations
+    #: are built, and "suffixes_includes" and "suffixes_excludes" are not used.
+    #: This does not affect current machine builds.
+    suffixes_combinations = set()
+
+    #: CPU microarchitectures to build specific files for (ex: "skylake-avx512",
+    #: "znver3"). Files are built with "-march=<name>" (suffix "march_<name>") and
+    #: "-mtune=<name>" (suffix "mtune_<name>") if supported by the compiler. On ARM
+    #: (ex: "neoverse-v1"), files are built with "-mcpu=<name>" (suffix "mcpu_<name>").
+    #: This does not affect current machine builds.
+    microarchitectures = set()
+
     #: Enables compilers options
     option = {
         # Enables Fast floating point math
@@ -19,8 +19,8 @@ def get_compile_args(
         Compiler name or instance.
     arch : str
         Target architecture name.
-    current_machine : bool
-        Only compatibles with current machine CPU
+    current_machine : bool or compilertools.processors.ProcessorBase subclass instance
+        Only compatibles with current machine CPU, or with this processor.
     current_compiler : bool
         If True, return only arguments compatibles with current compiler.
 
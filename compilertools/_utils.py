@@ -141,6 +141,26 @@ def dump_version(command):
     """
     Dump version for GCC/Clang compilers.
 
+    Result is cached until the compiler binary changes.
+
+    Parameters
+    ----------
+    command : str
+        Compiler command.
+
+    Returns
+    -------
+        float or None: version if found else None
+    """
+    from compilertools._cache import cached_call
+
+    return cached_call(command, "version", _dump_version, command)
+
+
+def _dump_version(command):
+    """
+    Dump version for GCC/Clang compilers by running them.
+
     Parameters
     ----------
     command : str
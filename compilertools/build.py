@@ -92,13 +92,22 @@ def get_build_compile_args(
                 """Filter by inclusion."""
                 return suffix_to_test not in include
 
+        from compilertools.compilers._core import _unselected_microarchitecture
+
         args = get_compile_args(compiler, arch, current_compiler=True)
+        combinations = ConfigBuild.suffixes_combinations
 
         for suffixes in set(args):
-            for suffix in suffixes.split("-"):
-                if filter_suffix(suffix):
+            if combinations:
+                # Combinations selected, like from "compilertools.fleet.plan"
+                if suffixes and suffixes not in combinations:
                     del args[suffixes]
-                    break
+                continue
+
+            if _unselected_microarchitecture(
+                suffixes, ConfigBuild.microarchitectures
+            ) or any(filter_suffix(suffix) for suffix in suffixes.split("-")):
+                del args[suffixes]
 
         for arg, suffix in zip(args.values(), suffix_from_args(args, ext_suffix, True)):
             build_args[suffix] = arg
@@ -228,6 +237,7 @@ def _update_extension(self, ext):
             default_compiler = "gcc"
         self.compilertools_store_compiler = default_compiler != compiler.name
         self.compilertools_extra_ouputs = []
+        self.compilertools_manifests = {}
 
     if self.compilertools_store_compiler:
         from os.path import join
@@ -262,7 +272,10 @@ def _update_extension(self, ext):
     ) + (ext.extra_link_args or [])
 
     exts = []
+    variants = {}
+    requires = compiler.compile_args_requires(self.plat_name)
     from copy import deepcopy
+    from os.path import basename
 
     for suffix in args:
         compile_args = args[suffix]
@@ -282,9 +295,88 @@ def _update_extension(self, ext):
             self.extensions.append(ext_copy)
         exts.append(ext_copy)
 
+        variant_requires = requires.get(suffix.lstrip("."), compiler.Requires())
+        variants[suffix.lstrip(".")] = {
+            "file": basename(
+                self.get_ext_filename(self.get_ext_fullname(ext_copy.name))
+            ),
+            "features": list(variant_requires.features),
+            "requires": {
+                name: value
+                for name, value in variant_requires._asdict().items()
+                if value
+            },
+        }
+
+    if any(variants):
+        _add_to_manifest(self, ext.name, compiler.name, variants)
+
     return exts
 
 
+def _add_to_manifest(self, ext_name, compiler_name, variants):
+    """
+    Add an extension to its package build manifest.
+
+    Top level extensions are not added, because their directory is shared with other
+    packages.
+
+    Parameters
+    ----------
+    self : build_ext instance
+        Patched build_ext.
+    ext_name : str
+        Extension name.
+    compiler_name : str
+        Compiler name.
+    variants : dict
+        Extension variants. Keys are suffixes, values are dict with "file",
+        "features" and "requires" keys.
+    """
+    package, _, module = self.get_ext_fullname(ext_name).rpartition(".")
+    if not package:
+        return
+
+    from os.path import join
+    from compilertools.imports import MANIFEST_NAME
+
+    path = join(*package.split("."), MANIFEST_NAME)
+    self.compilertools_manifests.setdefault(path, {})[module] = {
+        "compiler": compiler_name,
+        "variants": variants,
+    }
+
+
+def _write_manifest(path, extensions):
+    """
+    Write a package build manifest.
+
+    Extensions already in an existing manifest are kept.
+
+    Parameters
+    ----------
+    path : str
+        Manifest path.
+    extensions : dict
+        Extensions to write. Keys are extensions modules names.
+    """
+    from json import load, dump
+    from compilertools.imports import MANIFEST_VERSION
+
+    content = {"version": MANIFEST_VERSION, "extensions": {}}
+    try:
+        with open(path, "rt") as file:
+            existing = load(file)
+        if existing["version"] == MANIFEST_VERSION:
+            content["extensions"].update(existing["extensions"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    content["extensions"].update(extensions)
+    with open(path, "wt") as file:
+        dump(content, file, indent=1, sort_keys=True)
+
+
 # Distutils "distutils.command.build_ext.build_ext" Monkey-Patches with wrapping
 
 
@@ -351,7 +443,7 @@ def _patch_get_ext_fullname(get_ext_fullname):
 
 
 def _patch_get_outputs(get_outputs):
-    """Decorate build_ext.get_outputs for compiler memorization."""
+    """Decorate build_ext.get_outputs for compiler memorization and manifests."""
     if get_outputs.__module__.startswith("compilertools."):
         return get_outputs
 
@@ -375,6 +467,17 @@ def _patch_get_outputs(get_outputs):
                     file.write(self.compilertools_compiler_name)
 
             outputs.extend(extra_outputs)
+
+        manifests = getattr(self, "compilertools_manifests", None)
+        if manifests:
+            from os.path import join
+
+            for path, extensions in manifests.items():
+                if not self.inplace:
+                    path = join(self.build_lib, path)
+                _write_manifest(path, extensions)
+                outputs.append(path)
+
         return outputs
 
     patched.__module__ = f"compilertools.{patched.__module__}"
@@ -1,5 +1,10 @@
 """Compilers."""
 
-from compilertools.compilers._core import CompilerBase, get_compiler
+from compilertools.compilers._core import (
+    CompilerBase,
+    Requires,
+    get_compiler,
+    clear_compilers,
+)
 
-__all__ = ["CompilerBase", "get_compiler"]
+__all__ = ["CompilerBase", "Requires", "get_compiler", "clear_compilers"]
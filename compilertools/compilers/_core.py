@@ -4,15 +4,25 @@ from itertools import product
 from collections import namedtuple, OrderedDict
 from compilertools._utils import import_class, BaseClass
 from compilertools._config import CONFIG
-from compilertools.processors import get_processor, get_arch
+from compilertools.processors import get_processor, get_arch, ProcessorBase, Features
 
-__all__ = ["CompilerBase", "get_compiler"]
+__all__ = ["CompilerBase", "Requires", "get_compiler", "clear_compilers"]
+
+#: Interned compilers: {(compiler name, current_compiler): compiler}
+_COMPILERS = {}
+
+#: Processor properties required by x86-64 psABI microarchitecture levels 3 and 4
+_X86_64_LEVELS_OS_STATES = ("os_supports_avx", "os_supports_avx512")
 
 
 def get_compiler(compiler=None, current_compiler=False):
     """
     Return compiler class.
 
+    Compilers are interned: The same instance is returned for the same compiler
+    name and "current_compiler" value, so the compiler is probed once per process.
+    Returned instances are shared and should not be modified.
+
     Parameters
     ----------
     compiler : str of CompilerBase subclass
@@ -33,14 +43,42 @@ def get_compiler(compiler=None, current_compiler=False):
 
         compiler = get_default_compiler()
 
+    key = compiler, bool(current_compiler)
+    try:
+        return _COMPILERS[key]
+    except KeyError:
+        pass
+
     alias = CONFIG.get("compilers", {}).get(compiler, compiler)
 
     if alias == "unix":
         alias = _which_unix_compiler(compiler)
 
-    return import_class("compilers", alias, "Compiler", CompilerBase)(
-        current_compiler=current_compiler
-    )
+    instance = _COMPILERS[key] = import_class(
+        "compilers", alias, "Compiler", CompilerBase
+    )(current_compiler=current_compiler)
+    return instance
+
+
+def clear_compilers():
+    """
+    Clear interned compilers.
+
+    Next "get_compiler" calls return new instances, and probe compilers again (Or
+    load them from the detection cache).
+    """
+    _COMPILERS.clear()
+
+
+def _clear_args_caches():
+    """
+    Clear arguments cached by interned compilers.
+
+    Arguments are computed with processors, and must be computed again when
+    processors are cleared.
+    """
+    for compiler in tuple(_COMPILERS.values()):
+        compiler._args_cache.clear()
 
 
 def _which_unix_compiler(compiler):
@@ -54,6 +92,26 @@ def _which_unix_compiler(compiler):
     compiler : str
         Compiler Name
 
+    Returns
+    -------
+    str:
+        Detected compiler Name
+    """
+    from compilertools._cache import cached_call
+
+    command = compiler if compiler != "unix" else "cc"
+    return cached_call(command, "which", _probe_unix_compiler, command)
+
+
+def _probe_unix_compiler(command):
+    """
+    Find which Unix compiler is "cc", "c++" by running it.
+
+    Parameters
+    ----------
+    command : str
+        Compiler command.
+
     Returns
     -------
     str:
@@ -64,7 +122,7 @@ def _which_unix_compiler(compiler):
     try:
         version_str = (
             Popen(
-                [compiler if compiler != "unix" else "cc", "--version"],
+                [command, "--version"],
                 stdout=PIPE,
                 universal_newlines=True,
             )
@@ -88,8 +146,9 @@ def _get_arch_and_cpu(arch=None, current_machine=False):
     ----------
     arch : str
         CPU Architecture. If None, use current computer arch, else use specified
-    current_machine : bool
-        If True returns current machine CPU
+    current_machine : bool or compilertools.processors.ProcessorBase subclass instance
+        If True returns current machine CPU. If a processor instance, returns it with
+        its architecture.
 
     Returns
     -------
@@ -98,6 +157,9 @@ def _get_arch_and_cpu(arch=None, current_machine=False):
     compilertools.processors.ProcessorBase subclass
         Processor instance.
     """
+    if isinstance(current_machine, ProcessorBase):
+        return current_machine.arch, current_machine
+
     arch = get_arch(arch)
     return arch, get_processor(arch, current_machine=current_machine)
 
@@ -146,7 +208,7 @@ def _order_args_matrix(args_matrix, current_machine=False, current_compiler=Fals
 
             arg_suffix = arg.suffix
             if arg_suffix:
-                suffix_list.append(arg_suffix.replace(".", "_").replace("-", "_"))
+                suffix_list.append(_normalize_suffix(arg_suffix))
 
         if is_compatible:
             args_combinations["-".join(suffix_list)] = args_list
@@ -154,11 +216,273 @@ def _order_args_matrix(args_matrix, current_machine=False, current_compiler=Fals
     return args_combinations
 
 
+def _order_args_features(args_matrix):
+    """
+    Convert args matrix to CPU features required by each suffix.
+
+    Parameters
+    ----------
+    args_matrix : list of CompilerBase.Arg
+        result from self._compile_args_matrix
+
+    Returns
+    -------
+    collections.OrderedDict with str as keys and list of str as values
+        Keys are suffixes, values are sorted CPU features names.
+    """
+    return OrderedDict(
+        (suffixes, list(requires.features))
+        for suffixes, requires in _order_args_requires(args_matrix).items()
+    )
+
+
+def _order_args_requires(args_matrix):
+    """
+    Convert args matrix to requirements for importing each suffix.
+
+    Parameters
+    ----------
+    args_matrix : list of CompilerBase.Arg
+        result from self._compile_args_matrix
+
+    Returns
+    -------
+    collections.OrderedDict with str as keys and Requires as values
+        Keys are suffixes, values are requirements of all arguments "import_if".
+    """
+    requires_combinations = OrderedDict()
+    for args in product(*args_matrix):
+        features = set()
+        os_states = set()
+        requires = {}
+        suffix_list = []
+        for arg in args:
+            features.update(_arg_features(arg))
+            requirement = arg.import_if
+            if isinstance(requirement, Requires):
+                os_states.update(requirement.os)
+                for name in ("vendor", "brand", "microarchitecture"):
+                    if getattr(requirement, name):
+                        requires[name] = getattr(requirement, name)
+                requires["version"] = max(
+                    requirement.version, requires.get("version", 0.0)
+                )
+            if arg.suffix:
+                suffix_list.append(_normalize_suffix(arg.suffix))
+
+        requires_combinations["-".join(suffix_list)] = Requires(
+            features=tuple(sorted(features)), os=tuple(sorted(os_states)), **requires
+        )
+
+    return requires_combinations
+
+
+def _arg_features(arg):
+    """
+    Return CPU features required by an argument.
+
+    Parameters
+    ----------
+    arg : CompilerBase.Arg
+        Argument.
+
+    Returns
+    -------
+    tuple of str
+        Features names from "Arg.features", or from "Arg.import_if" requirements.
+    """
+    if arg.features or not isinstance(arg.import_if, Requires):
+        return arg.features
+    return arg.import_if.features
+
+
+def _evaluate_args_matrix(args_matrix, cpu=None, compiler=None):
+    """
+    Evaluate requirements of an args matrix.
+
+    This allows to evaluate the same matrix for many processors or compilers.
+
+    Parameters
+    ----------
+    args_matrix : list of CompilerBase.Arg
+        result from self._compile_args_matrix
+    cpu : compilertools.processors.ProcessorBase subclass
+        Processor instance.
+    compiler : compilertools.compilers.CompilerBase subclass
+        Compiler instance.
+
+    Returns
+    -------
+    list of CompilerBase.Arg
+        Arguments matrix with "import_if" and "build_if" as bool.
+    """
+    evaluated_matrix = []
+    for args in args_matrix:
+        evaluated = []
+        for arg in args:
+            import_if = arg.import_if
+            build_if = arg.build_if
+            if isinstance(import_if, Requires) or isinstance(build_if, Requires):
+                arg = arg._replace(
+                    import_if=_is_met(import_if, cpu, compiler),
+                    build_if=_is_met(build_if, cpu, compiler),
+                )
+            evaluated.append(arg)
+        evaluated_matrix.append(evaluated)
+    return evaluated_matrix
+
+
+def _is_met(condition, cpu=None, compiler=None):
+    """
+    Evaluate an argument condition.
+
+    Parameters
+    ----------
+    condition : bool or Requires
+        Condition.
+    cpu : compilertools.processors.ProcessorBase subclass
+        Processor instance.
+    compiler : compilertools.compilers.CompilerBase subclass
+        Compiler instance.
+
+    Returns
+    -------
+    bool
+        True if condition is met.
+    """
+    if isinstance(condition, Requires):
+        return condition.match(cpu, compiler)
+    return condition
+
+
+def _normalize_suffix(suffix):
+    """
+    Normalize an argument suffix for use in file names.
+
+    Parameters
+    ----------
+    suffix : str
+        Argument suffix.
+
+    Returns
+    -------
+    str
+        Suffix.
+    """
+    return suffix.replace(".", "_").replace("-", "_")
+
+
+def _unselected_microarchitecture(suffixes, microarchitectures):
+    """
+    Check if a suffixes combination targets a microarchitecture not selected.
+
+    Combinations with both "-march" and "-mtune" are also not selected, because
+    "-march" already tunes for its microarchitecture.
+
+    Parameters
+    ----------
+    suffixes : str
+        Suffixes combination, like keys of "CompilerBase.compile_args" result.
+    microarchitectures : set of str
+        Selected microarchitectures names.
+
+    Returns
+    -------
+    bool
+        True if not selected.
+    """
+    if "march_" in suffixes and "mtune_" in suffixes:
+        return True
+
+    microarchitectures = {_normalize_suffix(name) for name in microarchitectures}
+    for suffix in suffixes.split("-"):
+        prefix, _, name = suffix.partition("_")
+        if prefix in ("march", "mtune", "mcpu") and name not in microarchitectures:
+            return True
+    return False
+
+
+class Requires(
+    namedtuple("Requires", "features os vendor brand microarchitecture version")
+):
+    """
+    Requirements for importing or building a file.
+
+    Requirements are data that can be evaluated with many processors and compilers,
+    and serialized.
+
+    Parameters
+    ----------
+    features : tuple of str
+        CPU features names. Default value is empty.
+    os : tuple of str
+        Processor properties that must be True (Like "os_supports_avx" for the
+        operating system support of registers). Default value is empty.
+    vendor : str
+        CPU vendor. Default value is empty (Any vendor).
+    brand : str
+        Text that must be in the CPU brand. Default value is empty (Any brand).
+    microarchitecture : str
+        CPU microarchitecture. Default value is empty (Any microarchitecture).
+    version : float
+        Minimum compiler version. Default value is 0.0.
+    """
+
+    __slots__ = ()
+
+    def __new__(
+        cls, features=(), os=(), vendor="", brand="", microarchitecture="", version=0.0
+    ):
+        """Create requirements, with names sequences as tuples."""
+        return super().__new__(
+            cls, tuple(features), tuple(os), vendor, brand, microarchitecture, version
+        )
+
+    def match(self, cpu=None, compiler=None):
+        """
+        Check if requirements are met.
+
+        Parameters
+        ----------
+        cpu : compilertools.processors.ProcessorBase subclass
+            Processor instance. If None, CPU requirements are not met.
+        compiler : compilertools.compilers.CompilerBase subclass
+            Compiler instance. If None, version requirement is not met.
+
+        Returns
+        -------
+        bool
+            True if all requirements are met.
+        """
+        if self.version and (compiler is None or compiler.version < self.version):
+            return False
+
+        if cpu is None:
+            return not (
+                self.features
+                or self.os
+                or self.vendor
+                or self.brand
+                or self.microarchitecture
+            )
+
+        return (
+            cpu.features.has_all(Features.mask_of(self.features))
+            and all(getattr(cpu, name, False) for name in self.os)
+            and (not self.vendor or cpu.vendor == self.vendor)
+            and (not self.brand or self.brand in cpu.brand)
+            and (
+                not self.microarchitecture
+                or getattr(cpu, "microarchitecture", "") == self.microarchitecture
+            )
+        )
+
+
 class CompilerBase(BaseClass):
     """Base class for compiler."""
 
-    Arg = namedtuple("Argument", "args suffix import_if build_if")
-    Arg.__new__.__defaults__ = ("", "", True, True)
+    Arg = namedtuple("Argument", "args suffix import_if build_if features")
+    Arg.__new__.__defaults__ = ("", "", True, True, ())
     Arg.__doc__ = """
        Compiler argument.
 
@@ -168,20 +492,29 @@ class CompilerBase(BaseClass):
            arguments sent to compiler (ex "-flto -w").
        suffix : str
            suffix related to this argument in compiled file name.
-       import_if : bool
+       import_if : bool or Requires
            condition that must be True for importing file compiled with this argument
            (ex architecture compatibility). Default value is True.
-       build_if : bool
+       build_if : bool or Requires
            Condition that must be True for compile file with this argument and the
            current compiler (Ex compiler version). Default value is True.
+       features : tuple of str
+           CPU features required for importing file compiled with this argument. This
+           is recorded in the build manifest. Default value is empty (Features from
+           "import_if" requirements).
         """
 
+    Requires = Requires
+
     def __init__(self, current_compiler=False):
         BaseClass.__init__(self)
         self["current_compiler"] = current_compiler
         self._default["current_compiler"] = False
         self._default["version"] = 0.0
 
+        # Ordered arguments, by architecture, target and compiler version
+        self._args_cache = {}
+
     def _compile_args_matrix(self, arch, cpu):
         """
         Return available compiler arguments matrix for the specified CPU architecture.
@@ -202,6 +535,97 @@ class CompilerBase(BaseClass):
         """
         raise NotImplementedError
 
+    def _x86_64_level_arg(self, cpu, level, build_if=True):
+        """
+        Return argument for a x86-64 psABI microarchitecture level.
+
+        For compilers supporting the "-march=x86-64-vN" argument.
+
+        Parameters
+        ----------
+        cpu : compilertools.processors.x86_64.Processor
+            Processor instance.
+        level : int
+            Level (2 to 4).
+        build_if : bool or Requires
+            Condition that must be True for compile file with this argument.
+
+        Returns
+        -------
+        CompilerBase.Arg
+            Argument.
+        """
+        from compilertools.processors.x86_64 import X86_64_LEVELS
+
+        return self.Arg(
+            args=f"-march=x86-64-v{level}",
+            suffix=f"x86_64_v{level}",
+            import_if=self.Requires(
+                features=sorted(X86_64_LEVELS[level]),
+                os=_X86_64_LEVELS_OS_STATES[: max(level - 2, 0)],
+            ),
+            build_if=build_if,
+        )
+
+    def _microarchitecture_args(self, cpu, option, versions, isa=None):
+        """
+        Return arguments for CPU microarchitectures.
+
+        For compilers supporting the "-march=name" and "-mtune=name" arguments (x86),
+        or the "-mcpu=name" argument (ARM).
+
+        Parameters
+        ----------
+        cpu : compilertools.processors.ProcessorBase subclass
+            Processor instance.
+        option : str
+            "march" or "mcpu" to generate code for the microarchitecture, or "mtune"
+            to only tune code for it.
+        versions : dict
+            Keys are microarchitectures names, values are the first compiler
+            versions supporting them.
+        isa : dict
+            Keys are microarchitectures names, values are CPU features used by code
+            generated for them. Required with "march" or "mcpu", because features
+            may be disabled (Like by an hypervisor) on a known microarchitecture.
+
+        Returns
+        -------
+        list of CompilerBase.Arg
+            Arguments.
+        """
+        uarch = cpu.microarchitecture
+        if cpu.current_machine:
+            # Other microarchitectures can't be imported on the current machine
+            names = (uarch,) if uarch in versions else ()
+        else:
+            names = versions
+
+        isa = isa or {}
+        args = []
+        for name in names:
+            features = tuple(sorted(isa.get(name, ())))
+
+            # Code generated for a microarchitecture uses all its registers
+            if "AVX512F" in features:
+                os_states = ("os_supports_avx512",)
+            elif "AVX" in features:
+                os_states = ("os_supports_avx",)
+            else:
+                os_states = ()
+
+            args.append(
+                self.Arg(
+                    args=f"-{option}={name}",
+                    suffix=f"{option}_{name}",
+                    import_if=self.Requires(
+                        features=features, os=os_states, microarchitecture=name
+                    ),
+                    build_if=self.Requires(version=versions[name]),
+                )
+            )
+        return args
+
     def _compile_args_current_machine(self, arch, cpu):
         """
         Define optimized arguments for the current machine.
@@ -223,12 +647,14 @@ class CompilerBase(BaseClass):
             Best compiler arguments for current machine.
         """
         args = _order_args_matrix(
-            self._compile_args_matrix(arch, cpu), current_machine=True
+            _evaluate_args_matrix(self._compile_args_matrix(arch, cpu), cpu, self),
+            current_machine=True,
+            current_compiler=True,
         )
 
         if not args:
-            return []
-        return args[list(args)[0]]
+            return ""
+        return " ".join(args[list(args)[0]])
 
     def compile_args(self, arch=None, current_machine=False):
         """
@@ -238,22 +664,104 @@ class CompilerBase(BaseClass):
         ----------
         arch : str
             Target architecture name.
-        current_machine : bool
+        current_machine : bool or compilertools.processors.ProcessorBase subclass
             If True, returns only arguments compatible with current machine
-            (conditions from "Arg.import_if").
+            (conditions from "Arg.import_if"). If a processor instance (Like returned
+            by "ProcessorBase.from_profile"), returns only arguments compatible with
+            this processor.
 
         Returns
         -------
         collections.OrderedDict with keys and values as str
             Arguments matrix. Keys are suffixes, values are compiler arguments.
         """
-        return _order_args_matrix(
-            self._compile_args_matrix(
-                *_get_arch_and_cpu(arch, current_machine=current_machine)
+        arch, cpu = _get_arch_and_cpu(arch, current_machine=current_machine)
+
+        def order_args():
+            """Return ordered arguments."""
+            return _order_args_matrix(
+                _evaluate_args_matrix(self._compile_args_matrix(arch, cpu), cpu, self),
+                cpu.current_machine,
+                self["current_compiler"],
+            )
+
+        if isinstance(current_machine, ProcessorBase):
+            return order_args()
+
+        # Results are cached immutable, and a copy is returned
+        key = "compile_args", arch, cpu.current_machine, self["current_compiler"]
+        args = self._cached_args(
+            key,
+            lambda: tuple(
+                (suffix, tuple(args)) for suffix, args in order_args().items()
             ),
-            current_machine,
-            self["current_compiler"],
         )
+        return OrderedDict((suffix, list(args)) for suffix, args in args)
+
+    def compile_args_features(self, arch=None):
+        """
+        Get CPU features required by each suffix for a specific architecture.
+
+        Parameters
+        ----------
+        arch : str
+            Target architecture name.
+
+        Returns
+        -------
+        collections.OrderedDict with str as keys and list of str as values
+            Keys are suffixes, values are sorted CPU features names.
+        """
+        return OrderedDict(
+            (suffix, list(requires.features))
+            for suffix, requires in self.compile_args_requires(arch).items()
+        )
+
+    def compile_args_requires(self, arch=None):
+        """
+        Get requirements for importing each suffix for a specific architecture.
+
+        Parameters
+        ----------
+        arch : str
+            Target architecture name.
+
+        Returns
+        -------
+        collections.OrderedDict with str as keys and Requires as values
+            Keys are suffixes, values are requirements.
+        """
+        arch, cpu = _get_arch_and_cpu(arch)
+        requires = self._cached_args(
+            ("compile_args_requires", arch),
+            lambda: tuple(
+                _order_args_requires(self._compile_args_matrix(arch, cpu)).items()
+            ),
+        )
+        return OrderedDict(requires)
+
+    def _cached_args(self, key, func):
+        """
+        Return arguments from the cache, or compute and cache them.
+
+        Parameters
+        ----------
+        key : tuple
+            Cache key. The compiler version is also used as key.
+        func : callable
+            Function computing arguments, as immutable value.
+
+        Returns
+        -------
+        object
+            Arguments.
+        """
+        key += (self.version,)
+        try:
+            return self._args_cache[key]
+        except KeyError:
+            value = self._args_cache[key] = func()
+            return value
 
     def compile_args_current_machine(self):
         """
@@ -8,6 +8,67 @@ from compilertools._utils import (
 
 __all__ = ["Compiler"]
 
+#: First GCC versions supporting x86 microarchitectures names
+_MICROARCHITECTURES_VERSIONS = {
+    "nehalem": 4.9,
+    "westmere": 4.9,
+    "sandybridge": 4.9,
+    "ivybridge": 4.9,
+    "haswell": 4.9,
+    "broadwell": 4.9,
+    "skylake": 6.0,
+    "skylake-avx512": 6.0,
+    "cannonlake": 8.0,
+    "icelake-client": 8.0,
+    "icelake-server": 8.0,
+    "cascadelake": 9.0,
+    "cooperlake": 10.0,
+    "tigerlake": 10.0,
+    "rocketlake": 11.0,
+    "alderlake": 11.0,
+    "sapphirerapids": 11.0,
+    "meteorlake": 13.0,
+    "graniterapids": 13.0,
+    "emeraldrapids": 13.0,
+    "goldmont": 9.0,
+    "goldmont-plus": 9.0,
+    "tremont": 9.0,
+    "bdver1": 4.7,
+    "bdver2": 4.7,
+    "bdver3": 4.8,
+    "bdver4": 4.9,
+    "btver2": 4.8,
+    "znver1": 6.0,
+    "znver2": 9.0,
+    "znver3": 11.0,
+    "znver4": 13.0,
+    "znver5": 14.0,
+}
+
+#: First GCC versions supporting ARM 64-bit microarchitectures names
+_ARM_64_MICROARCHITECTURES_VERSIONS = {
+    "cortex-a53": 4.9,
+    "cortex-a57": 4.9,
+    "xgene1": 4.9,
+    "cortex-a72": 6.0,
+    "thunderx2t99": 7.0,
+    "cortex-a55": 8.0,
+    "cortex-a76": 9.0,
+    "neoverse-n1": 9.0,
+    "tsv110": 9.0,
+    "cortex-a77": 10.0,
+    "cortex-a78": 11.0,
+    "cortex-x1": 11.0,
+    "neoverse-v1": 11.0,
+    "neoverse-n2": 11.0,
+    "a64fx": 11.0,
+    "cortex-a510": 12.0,
+    "cortex-a710": 12.0,
+    "ampere1": 12.0,
+    "neoverse-v2": 13.0,
+    "ampere1a": 13.0,
+}
+
 
 class Compiler(_CompilerBase):
     """GNU Compiler Collection."""
@@ -95,133 +156,331 @@ class Compiler(_CompilerBase):
 
         # Architecture-specific optimisations
         if arch == "x86_64":
+            from compilertools.processors.x86_32 import MICROARCHITECTURES_ISA
+
             args += [
                 # CPU Generic optimisations
                 [self.Arg(args="-m64")],
                 # CPU Instructions sets
                 [
+                    *self._microarchitecture_args(
+                        cpu,
+                        "march",
+                        _MICROARCHITECTURES_VERSIONS,
+                        MICROARCHITECTURES_ISA,
+                    ),
+                    self.Arg(
+                        args=[
+                            "-mamx-tile",
+                            "-mamx-int8",
+                            "-mamx-bf16",
+                            "-mavx512fp16",
+                            "-mavx512bf16",
+                            "-mavx512vnni",
+                            "-mavx512bw",
+                            "-mavx512vl",
+                            "-mavx512dq",
+                            "-mavx512cd",
+                            "-mavx512f",
+                        ],
+                        suffix="amx",
+                        import_if=self.Requires(
+                            features=(
+                                "AMX_TILE",
+                                "AMX_INT8",
+                                "AMX_BF16",
+                                "AVX512_FP16",
+                                "AVX512_BF16",
+                                "AVX512_VNNI",
+                                "AVX512BW",
+                                "AVX512VL",
+                                "AVX512DQ",
+                                "AVX512CD",
+                                "AVX512F",
+                            ),
+                            os=("os_supports_avx512", "os_supports_amx"),
+                        ),
+                        build_if=self.Requires(version=12),
+                    ),
+                    self.Arg(
+                        args=[
+                            "-mavx512bf16",
+                            "-mavx512vnni",
+                            "-mavx512bw",
+                            "-mavx512vl",
+                            "-mavx512dq",
+                            "-mavx512cd",
+                            "-mavx512f",
+                        ],
+                        suffix="avx512_bf16",
+                        import_if=self.Requires(
+                            features=(
+                                "AVX512_BF16",
+                                "AVX512_VNNI",
+                                "AVX512BW",
+                                "AVX512VL",
+                                "AVX512DQ",
+                                "AVX512CD",
+                                "AVX512F",
+                            ),
+                            os=("os_supports_avx512",),
+                        ),
+                        build_if=self.Requires(version=10),
+                    ),
+                    self._x86_64_level_arg(cpu, 4, build_if=self.Requires(version=11)),
                     self.Arg(
                         args=["-mavx512cd", "-mavx512f"],
                         suffix="avx512",
-                        import_if=(
-                            "AVX512F" in cpu.features
-                            and "AVX512CD" in cpu.features
-                            and cpu.os_supports_xsave
+                        import_if=self.Requires(
+                            features=("AVX512F", "AVX512CD"), os=("os_supports_avx512",)
+                        ),
+                        build_if=self.Requires(version=4.9),
+                    ),
+                    self.Arg(
+                        args=["-mavxvnni", "-mavx2"],
+                        suffix="avxvnni",
+                        import_if=self.Requires(
+                            features=("AVX_VNNI", "AVX2"), os=("os_supports_avx",)
                         ),
-                        build_if=self.version >= 4.9,
+                        build_if=self.Requires(version=11),
                     ),
+                    self._x86_64_level_arg(cpu, 3, build_if=self.Requires(version=11)),
                     self.Arg(
                         args="-mavx2",
                         suffix="avx2",
-                        import_if=(
-                            self.version >= 4.7
-                            and "AVX2" in cpu.features
-                            and cpu.os_supports_xsave
+                        import_if=self.Requires(
+                            features=("AVX2",), os=("os_supports_avx",)
                         ),
+                        build_if=self.Requires(version=4.7),
                     ),
                     self.Arg(
                         args="-mavx",
                         suffix="avx",
-                        import_if=(
-                            self.version >= 4.4
-                            and "AVX" in cpu.features
-                            and cpu.os_supports_xsave
+                        import_if=self.Requires(
+                            features=("AVX",), os=("os_supports_avx",)
                         ),
+                        build_if=self.Requires(version=4.4),
                     ),
+                    self._x86_64_level_arg(cpu, 2, build_if=self.Requires(version=11)),
                     self.Arg(),
                 ],
                 # CPU Generic vendor/brand optimisations
                 [
+                    *self._microarchitecture_args(
+                        cpu, "mtune", _MICROARCHITECTURES_VERSIONS
+                    ),
                     self.Arg(
                         args="-mtune=intel",
                         suffix="intel",
-                        import_if=cpu.vendor == "GenuineIntel",
-                        build_if=self.version >= 4.9,
+                        import_if=self.Requires(vendor="GenuineIntel"),
+                        build_if=self.Requires(version=4.9),
                     ),
                     self.Arg(),
                 ],
             ]
 
         elif arch == "x86_32":
+            from compilertools.processors.x86_32 import MICROARCHITECTURES_ISA
+
             args += [
                 # CPU Generic optimisations
                 [self.Arg(args="-m32")],
                 # CPU Instructions sets
                 [
+                    *self._microarchitecture_args(
+                        cpu,
+                        "march",
+                        _MICROARCHITECTURES_VERSIONS,
+                        MICROARCHITECTURES_ISA,
+                    ),
                     self.Arg(
                         args=["-mfpmath=sse", "-mavx2"],
                         suffix="avx2",
-                        import_if=(
-                            self.version >= 4.7
-                            and "AVX2" in cpu.features
-                            and cpu.os_supports_xsave
+                        import_if=self.Requires(
+                            features=("AVX2",), os=("os_supports_avx",)
                         ),
+                        build_if=self.Requires(version=4.7),
                     ),
                     self.Arg(
                         args=["-mfpmath=sse", "-mavx"],
                         suffix="avx",
-                        import_if=(
-                            self.version >= 4.4
-                            and "AVX" in cpu.features
-                            and cpu.os_supports_xsave
+                        import_if=self.Requires(
+                            features=("AVX",), os=("os_supports_avx",)
                         ),
+                        build_if=self.Requires(version=4.4),
                     ),
                     self.Arg(
                         args=["-mfpmath=sse", "-msse4"],
                         suffix="sse4",
-                        import_if=(
-                            "SSE4_1" in cpu.features and "SSE4_2" in cpu.features
-                        ),
-                        build_if=self.version >= 4.3,
+                        import_if=self.Requires(features=("SSE4_1", "SSE4_2")),
+                        build_if=self.Requires(version=4.3),
                     ),
                     self.Arg(
                         args=["-mfpmath=sse", "-msse4.2"],
                         suffix="sse4_2",
-                        import_if="SSE4_2" in cpu.features,
-                        build_if=self.version >= 4.3,
+                        import_if=self.Requires(features=("SSE4_2",)),
+                        build_if=self.Requires(version=4.3),
                     ),
                     self.Arg(
                         args=["-mfpmath=sse", "-msse4.1"],
                         suffix="sse4_1",
-                        import_if="SSE4_1" in cpu.features,
-                        build_if=self.version >= 4.3,
+                        import_if=self.Requires(features=("SSE4_1",)),
+                        build_if=self.Requires(version=4.3),
                     ),
                     self.Arg(
                         args=["-mfpmath=sse", "-msse4a"],
                         suffix="sse4a",
-                        import_if=(
-                            self.version >= 4.9
-                            and "SSE4A" in cpu.features
-                            and cpu.vendor == "AuthenticAMD"
+                        import_if=self.Requires(
+                            features=("SSE4A",), vendor="AuthenticAMD"
                         ),
+                        build_if=self.Requires(version=4.9),
                     ),
                     self.Arg(
                         args=["-mfpmath=sse", "-mssse3"],
                         suffix="ssse3",
-                        import_if="SSSE3" in cpu.features,
-                        build_if=self.version >= 4.3,
+                        import_if=self.Requires(features=("SSSE3",)),
+                        build_if=self.Requires(version=4.3),
                     ),
                     self.Arg(
                         args=["-mfpmath=sse", "-msse2"],
                         suffix="sse2",
-                        import_if="SSE2" in cpu.features,
-                        build_if=self.version >= 3.3,
+                        import_if=self.Requires(features=("SSE2",)),
+                        build_if=self.Requires(version=3.3),
                     ),
                     self.Arg(
                         args=["-mfpmath=sse", "-msse"],
                         suffix="sse",
-                        import_if="SSE" in cpu.features,
-                        build_if=self.version >= 3.1,
+                        import_if=self.Requires(features=("SSE",)),
+                        build_if=self.Requires(version=3.1),
                     ),
                     self.Arg(),
                 ],
                 # CPU Generic vendor/brand optimisations
                 [
+                    *self._microarchitecture_args(
+                        cpu, "mtune", _MICROARCHITECTURES_VERSIONS
+                    ),
                     self.Arg(
                         args="-mtune=intel",
                         suffix="intel",
-                        import_if=cpu.vendor == "GenuineIntel",
-                        build_if=self.version >= 4.9,
+                        import_if=self.Requires(vendor="GenuineIntel"),
+                        build_if=self.Requires(version=4.9),
+                    ),
+                    self.Arg(),
+                ],
+            ]
+
+        elif arch == "arm_64":
+            from compilertools.processors.arm_64 import MICROARCHITECTURES_ISA
+
+            args += [
+                # CPU Instructions sets
+                [
+                    *self._microarchitecture_args(
+                        cpu,
+                        "mcpu",
+                        _ARM_64_MICROARCHITECTURES_VERSIONS,
+                        MICROARCHITECTURES_ISA,
+                    ),
+                    self.Arg(
+                        args="-march=armv8.2-a+sve2+bf16+i8mm+dotprod",
+                        suffix="sve2",
+                        import_if=self.Requires(
+                            features=(
+                                "SVE2",
+                                "SVE",
+                                "BF16",
+                                "I8MM",
+                                "DOTPROD",
+                                "LSE",
+                                "ASIMDRDM",
+                                "ASIMD",
+                            )
+                        ),
+                        build_if=self.Requires(version=10),
+                    ),
+                    self.Arg(
+                        args="-march=armv8.2-a+sve+dotprod",
+                        suffix="sve",
+                        import_if=self.Requires(
+                            features=("SVE", "DOTPROD", "LSE", "ASIMDRDM", "ASIMD")
+                        ),
+                        build_if=self.Requires(version=8),
+                    ),
+                    self.Arg(
+                        args="-march=armv8.2-a+dotprod",
+                        suffix="dotprod",
+                        import_if=self.Requires(
+                            features=("DOTPROD", "LSE", "ASIMDRDM", "ASIMD")
+                        ),
+                        build_if=self.Requires(version=8),
+                    ),
+                    self.Arg(
+                        args="-march=armv8.1-a",
+                        suffix="lse",
+                        import_if=self.Requires(
+                            features=("LSE", "ASIMDRDM", "CRC32", "ASIMD")
+                        ),
+                        build_if=self.Requires(version=6),
+                    ),
+                    self.Arg(),
+                ],
+            ]
+
+        elif arch == "ppc64le":
+            args += [
+                # CPU Instructions sets
+                [
+                    self.Arg(
+                        args="-mcpu=power10",
+                        suffix="power10",
+                        import_if=self.Requires(
+                            features=(
+                                "ARCH_3_1",
+                                "MMA",
+                                "ARCH_3_00",
+                                "ARCH_2_07",
+                                "VSX",
+                                "ALTIVEC",
+                            )
+                        ),
+                        build_if=self.Requires(version=10),
+                    ),
+                    self.Arg(
+                        args="-mcpu=power9",
+                        suffix="power9",
+                        import_if=self.Requires(
+                            features=("ARCH_3_00", "ARCH_2_07", "VSX", "ALTIVEC")
+                        ),
+                        build_if=self.Requires(version=6),
+                    ),
+                    self.Arg(),
+                ],
+            ]
+
+        elif arch == "riscv64":
+            from compilertools.processors.riscv64 import RV64GC
+
+            args += [
+                # CPU Instructions sets
+                [
+                    self.Arg(
+                        args="-march=rv64gcv_zba_zbb",
+                        suffix="rvv_zba_zbb",
+                        import_if=self.Requires(features=(*RV64GC, "V", "ZBA", "ZBB")),
+                        build_if=self.Requires(version=14),
+                    ),
+                    self.Arg(
+                        args="-march=rv64gcv",
+                        suffix="rvv",
+                        import_if=self.Requires(features=(*RV64GC, "V")),
+                        build_if=self.Requires(version=14),
+                    ),
+                    self.Arg(
+                        args="-march=rv64gc_zba_zbb",
+                        suffix="zba_zbb",
+                        import_if=self.Requires(features=(*RV64GC, "ZBA", "ZBB")),
+                        build_if=self.Requires(version=12),
                     ),
                     self.Arg(),
                 ],
@@ -245,7 +504,13 @@ class Compiler(_CompilerBase):
         str
             Best compiler arguments for current machine.
         """
-        args = ["-O3 -march=native -flto"]
+        if arch == "riscv64":
+            # No "native" option, uses the best arguments for the current CPU
+            return _CompilerBase._compile_args_current_machine(self, arch, cpu)
+
+        # POWER uses "-mcpu" instead of "-march"
+        option = "mcpu" if arch == "ppc64le" else "march"
+        args = [f"-O3 -{option}=native -flto"]
 
         if arch == "x86_32":
             args.append("-m32")
@@ -255,4 +520,14 @@ class Compiler(_CompilerBase):
         elif arch == "x86_64":
             args.append("-m64")
 
+        # Caches sizes used for loops optimizations (KiB for sizes, bytes for lines)
+        caches = cpu.cache_hierarchy
+        if "L1d" in caches:
+            args.append(
+                f"--param l1-cache-size={caches['L1d']['size'] // 1024} "
+                f"--param l1-cache-line-size={caches['L1d']['line_size']}"
+            )
+        if "L2" in caches:
+            args.append(f"--param l2-cache-size={caches['L2']['size'] // 1024}")
+
         return " ".join(args)
@@ -87,33 +87,33 @@ class Compiler(_CompilerBase):
                 self.Arg(
                     args="/arch:AVX2",
                     suffix="avx2",
-                    import_if=(
-                        "AVX2" in cpu.features
-                        and cpu.os_supports_xsave
-                        and self.version >= 12.0
+                    import_if=self.Requires(
+                        features=("AVX2",), os=("os_supports_avx",)
                     ),
-                    build_if=self.version >= 12.0,
+                    build_if=self.Requires(version=12.0),
                 ),
                 self.Arg(
                     args="/arch:AVX",
                     suffix="avx",
-                    import_if=(
-                        "AVX" in cpu.features
-                        and cpu.os_supports_xsave
-                        and self.version >= 10.0
-                    ),
-                    build_if=self.version >= 10.0,
+                    import_if=self.Requires(features=("AVX",), os=("os_supports_avx",)),
+                    build_if=self.Requires(version=10.0),
                 ),
                 self.Arg(
                     args="/arch:SSE2",
                     suffix="sse2",
-                    import_if="SSE2" in cpu.features and arch == "x86_32",
+                    features=("SSE2",),
+                    import_if=(
+                        self.Requires(features=("SSE2",)) if arch == "x86_32" else False
+                    ),
                     build_if=arch == "x86_32",
                 ),
                 self.Arg(
                     args="/arch:SSE",
                     suffix="sse",
-                    import_if="SSE" in cpu.features and arch == "x86_32",
+                    features=("SSE",),
+                    import_if=(
+                        self.Requires(features=("SSE",)) if arch == "x86_32" else False
+                    ),
                     build_if=arch == "x86_32",
                 ),
                 self.Arg(),
@@ -123,23 +123,27 @@ class Compiler(_CompilerBase):
                 self.Arg(
                     args="/favor:ATOM",
                     suffix="intel_atom",
-                    import_if=(
-                        cpu.vendor == "GenuineIntel"
-                        and "Atom" in cpu.brand
-                        and self.version >= 11.0
-                    ),
-                    build_if=self.version >= 11.0,
+                    import_if=self.Requires(vendor="GenuineIntel", brand="Atom"),
+                    build_if=self.Requires(version=11.0),
                 ),
                 self.Arg(
                     args="/favor:INTEL64",
                     suffix="intel",
-                    import_if=(cpu.vendor == "GenuineIntel" and arch == "x86_64"),
+                    import_if=(
+                        self.Requires(vendor="GenuineIntel")
+                        if arch == "x86_64"
+                        else False
+                    ),
                     build_if=arch == "x86_64",
                 ),
                 self.Arg(
                     args="/favor:AMD64",
                     suffix="amd",
-                    import_if=(cpu.vendor == "AuthenticAMD" and arch == "x86_64"),
+                    import_if=(
+                        self.Requires(vendor="AuthenticAMD")
+                        if arch == "x86_64"
+                        else False
+                    ),
                     build_if=arch == "x86_64",
                 ),
                 self.Arg(),
@@ -0,0 +1,348 @@
+"""Planning of files to build for a fleet of machines."""
+
+from collections import namedtuple as _namedtuple
+
+__all__ = ["Plan", "Simulation", "load_fleet", "plan", "simulate"]
+
+Plan = _namedtuple("Plan", "suffixes imports coverage")
+Plan.__doc__ = """
+Files to build for a fleet.
+
+Parameters
+----------
+suffixes : set of str
+    Suffixes combinations to build, for use as
+    "compilertools.build.ConfigBuild.suffixes_combinations". The compatibility
+    file (Without suffix) is always built and not included.
+imports : dict
+    Keys are profiles names, values are suffixes combinations imported by the
+    related machines ("" for the compatibility file).
+coverage : float
+    Fraction of nodes importing their best file (Nodes weighted).
+"""
+
+Simulation = _namedtuple("Simulation", "suffixes selection counts fallback_rate")
+Simulation.__doc__ = """
+Files imported by a fleet.
+
+Parameters
+----------
+suffixes : list of str
+    Simulated suffixes combinations, in import preference order. The last one is
+    the compatibility file ("").
+selection : sequence of int
+    Index in "suffixes" of the combination imported by each host. This is a NumPy
+    array if NumPy is available.
+counts : dict
+    Keys are suffixes combinations, values are the numbers of hosts importing them.
+fallback_rate : float
+    Fraction of hosts importing the compatibility file.
+"""
+
+
+def load_fleet(directory, nodes=None):
+    """
+    Load CPU profiles of a fleet of machines.
+
+    Profiles are JSON files recorded by
+    "compilertools.processors.ProcessorBase.snapshot".
+
+    Parameters
+    ----------
+    directory : str
+        Directory containing profiles files (".json" extension).
+    nodes : dict
+        Keys are profiles names (Files names without extension), values are the
+        numbers of nodes of this type. If not specified, the "nodes" value of the
+        profile is used, or 1.
+
+    Returns
+    -------
+    dict
+        Keys are profiles names, values are (processor, nodes) tuples.
+    """
+    from json import load
+    from os import listdir
+    from os.path import join, splitext
+    from compilertools.processors import ProcessorBase
+
+    nodes = nodes or {}
+    fleet = {}
+    for file_name in sorted(listdir(directory)):
+        name, ext = splitext(file_name)
+        if ext != ".json":
+            continue
+        with open(join(directory, file_name), "rt") as file:
+            profile = load(file)
+        fleet[name] = (
+            ProcessorBase.from_profile(profile),
+            nodes.get(name, profile.get("nodes", 1)),
+        )
+    return fleet
+
+
+def plan(fleet, compiler=None, max_variants=None):
+    """
+    Select suffixes combinations to build for a fleet of machines.
+
+    Without "max_variants", the smallest set giving to each machine its best
+    file is returned. Else, combinations are selected to maximize the number of nodes
+    importing their best file, then the number of nodes importing an optimized file.
+
+    Microarchitecture specific combinations are only used if selected in
+    "compilertools.build.ConfigBuild.microarchitectures".
+
+    Parameters
+    ----------
+    fleet : dict
+        Keys are profiles names, values are (processor, nodes) tuples, like
+        returned by "load_fleet".
+    compiler : str or compilertools.compilers.CompilerBase subclass
+        Compiler name or instance. If None, use the current compiler.
+    max_variants : int
+        Maximum number of suffixes combinations to build.
+
+    Returns
+    -------
+    compilertools.fleet.Plan
+        Plan.
+    """
+    from compilertools.compilers import get_compiler
+    from compilertools.compilers._core import (
+        _evaluate_args_matrix,
+        _is_met,
+        _order_args_matrix,
+        _unselected_microarchitecture,
+    )
+    from compilertools.processors import get_processor
+    from compilertools._config_build import ConfigBuild
+
+    compiler = get_compiler(compiler, current_compiler=True)
+
+    # Files are selected on import with a compiler that is not the current compiler,
+    # like in "compilertools.imports"
+    import_compiler = type(compiler)()
+
+    # Compatible combinations of each machine, best first
+    preferences = {}
+    weights = {}
+    matrices = {}
+    for name, (processor, nodes) in fleet.items():
+        # The same arguments matrix, with only arguments that can be built, is
+        # evaluated for all machines
+        arch = processor.arch
+        try:
+            args_matrix = matrices[arch]
+        except KeyError:
+            cpu = get_processor(arch)
+            args_matrix = matrices[arch] = [
+                [arg for arg in args if _is_met(arg.build_if, cpu, compiler)]
+                for args in compiler._compile_args_matrix(arch, cpu)
+            ]
+
+        preferences[name] = [
+            suffixes
+            for suffixes in _order_args_matrix(
+                _evaluate_args_matrix(args_matrix, processor, import_compiler),
+                current_machine=True,
+            )
+            if suffixes
+            and not _unselected_microarchitecture(
+                suffixes, ConfigBuild.microarchitectures
+            )
+        ]
+        weights[name] = nodes
+
+    def imported(name, selected):
+        """Return the combination imported by a machine."""
+        for suffixes in preferences[name]:
+            if suffixes in selected:
+                return suffixes
+        return ""
+
+    def best(name):
+        """Return the best combination of a machine."""
+        return preferences[name][0] if preferences[name] else ""
+
+    if max_variants is None:
+        selected = {best(name) for name in fleet} - {""}
+
+    else:
+
+        def score(selected):
+            """Return weighted nodes with their best, and with an optimized file."""
+            best_nodes = optimized_nodes = 0
+            for name, nodes in weights.items():
+                suffixes = imported(name, selected)
+                best_nodes += nodes if suffixes == best(name) else 0
+                optimized_nodes += nodes if suffixes else 0
+            return best_nodes, optimized_nodes
+
+        selected = set()
+        candidates = sorted(set().union(*preferences.values()))
+        current = score(selected)
+        while len(selected) < max_variants:
+            scores = {
+                suffixes: score(selected | {suffixes})
+                for suffixes in candidates
+                if suffixes not in selected
+            }
+            if not scores:
+                break
+            suffixes = max(scores, key=scores.get)
+            if scores[suffixes] <= current:
+                break
+            selected.add(suffixes)
+            current = scores[suffixes]
+
+    imports = {name: imported(name, selected) for name in fleet}
+    total = sum(weights.values())
+    covered = sum(
+        weights[name] for name, suffixes in imports.items() if suffixes == best(name)
+    )
+    return Plan(selected, imports, covered / total if total else 1.0)
+
+
+def simulate(hosts, compiler=None, arch=None, combinations=None):
+    """
+    Simulate files imported by a fleet of hosts from their CPU features.
+
+    This evaluates all hosts at once without creating processors, and is intended
+    for large fleets. Hosts with the same features are evaluated once, and selections
+    are computed with NumPy if available.
+
+    Only combinations depending on CPU features are simulated: Arguments without
+    features or also depending on other CPU properties (Like vendors or
+    microarchitectures) are ignored, and operating system support (Like AVX registers
+    saving) is assumed.
+
+    Parameters
+    ----------
+    hosts : iterable
+        CPU features of each host, as "compilertools.processors.Features" masks
+        (int), or iterables of features names.
+    compiler : str or compilertools.compilers.CompilerBase subclass
+        Compiler name or instance. If None, use the current compiler.
+    arch : str
+        Target architecture name. If None, use current computer arch.
+    combinations : set of str
+        Suffixes combinations built (Like "Plan.suffixes"). If None, use all
+        combinations built by the compiler.
+
+    Returns
+    -------
+    compilertools.fleet.Simulation
+        Simulation.
+    """
+    from compilertools.compilers import get_compiler
+    from compilertools.compilers._core import (
+        _arg_features,
+        _evaluate_args_matrix,
+        _get_arch_and_cpu,
+        _order_args_features,
+        _order_args_matrix,
+        Requires,
+    )
+    from compilertools.processors import Features
+
+    compiler = get_compiler(compiler, current_compiler=True)
+
+    def simulated(arg):
+        """Return True if the argument import only depends on CPU features."""
+        if not arg.suffix:
+            return True
+        import_if = arg.import_if
+        if isinstance(import_if, Requires) and (
+            import_if.vendor or import_if.brand or import_if.microarchitecture
+        ):
+            return False
+        return bool(_arg_features(arg))
+
+    args_matrix = [
+        [arg for arg in args if simulated(arg)]
+        for args in compiler._compile_args_matrix(*_get_arch_and_cpu(arch))
+    ]
+    features = _order_args_features(args_matrix)
+    suffixes = [
+        suffixes
+        for suffixes in _order_args_matrix(
+            _evaluate_args_matrix(args_matrix, compiler=compiler), current_compiler=True
+        )
+        if suffixes and (combinations is None or suffixes in combinations)
+    ]
+    suffixes.append("")
+    required = [Features.mask_of(tuple(features[key])) for key in suffixes]
+
+    # Hosts with the same features
+    masks = {}
+    inverse = []
+    hosts_count = []
+    for host in hosts:
+        if not isinstance(host, int):
+            host = (host if isinstance(host, Features) else Features(host)).mask
+        try:
+            index = masks[host]
+        except KeyError:
+            index = masks[host] = len(masks)
+            hosts_count.append(0)
+        hosts_count[index] += 1
+        inverse.append(index)
+
+    selected = _select(list(masks), required)
+    counts = dict.fromkeys(suffixes, 0)
+    for index, count in zip(selected, hosts_count):
+        counts[suffixes[index]] += count
+
+    try:
+        selection = selected[inverse]
+    except TypeError:
+        selection = [selected[index] for index in inverse]
+
+    total = len(inverse)
+    return Simulation(suffixes, selection, counts, counts[""] / total if total else 0.0)
+
+
+def _select(masks, required):
+    """
+    Select the first combination compatible with each features mask.
+
+    Parameters
+    ----------
+    masks : list of int
+        Hosts features masks.
+    required : list of int
+        Features masks required by combinations, in preference order. The last one
+        must be 0.
+
+    Returns
+    -------
+    numpy.ndarray or list of int
+        Combination index for each host.
+    """
+    needed = 0
+    for mask in required:
+        needed |= mask
+    bits = [bit for bit in range(needed.bit_length()) if (needed >> bit) & 1]
+
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+    if numpy is None or len(bits) > 64:
+        return [
+            next(
+                index
+                for index, require in enumerate(required)
+                if mask & require == require
+            )
+            for mask in masks
+        ]
+
+    def compact(mask):
+        """Keep only bits of required features, as consecutive bits."""
+        return sum(1 << index for index, bit in enumerate(bits) if (mask >> bit) & 1)
+
+    hosts = numpy.array([compact(mask) for mask in masks], dtype=numpy.uint64)
+    require = numpy.array([compact(mask) for mask in required], dtype=numpy.uint64)
+    return ((hosts[:, None] & require) == require).argmax(axis=1)
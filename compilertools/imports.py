@@ -1,16 +1,171 @@
 """Import machinery."""
 
 import sys as _sys
+from os import environ as _environ, listdir as _listdir, stat as _stat
 from os.path import join as _join
-from os.path import isfile as _isfile
-from importlib.abc import MetaPathFinder as _MetaPathFinder
+from time import perf_counter as _perf_counter
+from _thread import allocate_lock as _allocate_lock, get_ident as _get_ident
 import importlib.machinery as _machinery
 
-__all__ = ["ARCH_SUFFIXES", "update_extensions_suffixes"]
+__all__ = [  # noqa: F822
+    "ARCH_SUFFIXES",
+    "MANIFEST_NAME",
+    "HANDOFF_ENV_VAR",
+    "STATS_ENV_VAR",
+    "export_detection",
+    "stats",
+    "update_extensions_suffixes",
+    "warm_up",
+]
 
-#: Current arch compatibles suffixes
-ARCH_SUFFIXES = []
-_PROCESSED_COMPILERS = set()
+#: Name of the build manifest file in packages directories
+MANIFEST_NAME = "__compilertools__.json"
+
+#: Build manifest format version
+MANIFEST_VERSION = 1
+
+#: Current arch compatibles suffixes of all processed compilers (Lazily computed on
+#: first access). Tables are immutable and replaced on update, readers never need to
+#: lock.
+_ARCH_SUFFIXES = ()
+
+#: Current arch compatibles suffixes per compiler: {compiler name: suffixes}
+_SUFFIXES_TABLES = {}
+_DEFAULT_COMPILER = None
+_UPDATE_LOCK = _allocate_lock()
+
+_DETECTED = False
+_DETECTION_LOCK = _allocate_lock()
+
+#: Identifier of the thread running the detection
+_DETECTION_THREAD = None
+
+#: Directories content: {path: (mtime, (files names, modules with variants, manifest))}
+_DIRECTORIES = {}
+_EMPTY_INDEX = frozenset(), frozenset(), {}
+
+#: Permissions requested by the current process: {suffix part: granted}
+_PERMISSIONS = {}
+
+#: Environment variable passing detection results to child processes
+HANDOFF_ENV_VAR = "COMPILERTOOLS_HANDOFF"
+
+#: Detection results handoff format version
+HANDOFF_VERSION = 2
+
+#: Environment variable enabling the dump of statistics on interpreter exit
+STATS_ENV_VAR = "COMPILERTOOLS_STATS"
+
+#: Import statistics
+_STATS = {}
+_TIMERS = ("update_extensions_suffixes", "cpu_detection", "compiler_probing")
+_COUNTERS = (
+    "find_spec_calls",
+    "find_spec_hits",
+    "find_spec_misses",
+    "filesystem_probes",
+    "directory_cache_hits",
+    "directory_cache_misses",
+)
+
+
+def __getattr__(name):
+    """Compute suffixes on first "ARCH_SUFFIXES" access."""
+    if name == "ARCH_SUFFIXES":
+        _detect_suffixes()
+        return _ARCH_SUFFIXES
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _reset_stats():
+    """Reset import statistics."""
+    _STATS.clear()
+    _STATS.update((name, 0) for name in _COUNTERS)
+    _STATS.update((name, {"calls": 0, "time": 0.0}) for name in _TIMERS)
+    _STATS["dlopen"] = {}
+
+
+_reset_stats()
+
+
+def stats(reset=False):
+    """
+    Return import statistics of the current process.
+
+    Parameters
+    ----------
+    reset : bool
+        If True, reset statistics after returning them.
+
+    Returns
+    -------
+    dict
+        Statistics with following keys:
+
+        - "update_extensions_suffixes", "cpu_detection", "compiler_probing":
+          dict with number of "calls" and total "time" in seconds.
+        - "find_spec_calls": Number of calls of the import hook.
+        - "find_spec_hits", "find_spec_misses": Number of modules found and not
+          found by the import hook.
+        - "filesystem_probes": Number of filesystem accesses by the import hook.
+        - "directory_cache_hits", "directory_cache_misses": Number of directories
+          content read from the cache and from the filesystem.
+        - "dlopen": dict with modules names as keys and time spent loading their
+          shared library in seconds as values.
+    """
+    result = {
+        key: value.copy() if isinstance(value, dict) else value
+        for key, value in _STATS.items()
+    }
+    if reset:
+        _reset_stats()
+    return result
+
+
+def _dump_stats(path):
+    """
+    Dump import statistics as a JSON line.
+
+    Parameters
+    ----------
+    path : str
+        File path to append statistics to. If "-", write on stderr.
+    """
+    from json import dumps
+
+    line = dumps(stats(), sort_keys=True) + "\n"
+    try:
+        if path == "-":
+            _sys.stderr.write(line)
+        else:
+            with open(path, "at") as file:
+                file.write(line)
+    except OSError:
+        pass
+
+
+class _Timer:
+    """
+    Context manager measuring time spent in a statistics timer.
+
+    Parameters
+    ----------
+    name : str
+        Timer name.
+    """
+
+    __slots__ = ("_name", "_start")
+
+    def __init__(self, name):
+        self._name = name
+
+    def __enter__(self):
+        self._start = _perf_counter()
+
+    def __exit__(self, *_):
+        timer = _STATS[self._name]
+        timer["time"] += _perf_counter() - self._start
+        timer["calls"] += 1
 
 
 def update_extensions_suffixes(compiler):
@@ -21,6 +176,11 @@ def update_extensions_suffixes(compiler):
     ----------
         compiler : str or None
             compiler name. If None, uses default compiler name on current platform
+
+    Returns
+    -------
+    str or None
+        Compiler name. None on error.
     """
     from compilertools._core import (
         suffix_from_args,
@@ -29,16 +189,47 @@ def update_extensions_suffixes(compiler):
         log_exception,
     )
 
-    try:
-        compiler = get_compiler(compiler)
+    with _Timer("update_extensions_suffixes"):
+        try:
+            compiler = get_compiler(compiler)
 
-        suffixes = suffix_from_args(
-            get_compile_args(compiler, current_machine=True),
-            _machinery.EXTENSION_SUFFIXES,
-        )
+            _add_suffixes_table(
+                compiler.name,
+                suffix_from_args(
+                    get_compile_args(compiler, current_machine=True),
+                    _machinery.EXTENSION_SUFFIXES,
+                ),
+            )
+            return compiler.name
+
+        except Exception:
+            # Compilertools should not break user application, but only back to
+            # compatible mode. Exception is logged instead of risen.
+            log_exception()
 
-        suffixes_index = ARCH_SUFFIXES.index
-        suffixes_insert = ARCH_SUFFIXES.insert
+
+def _add_suffixes_table(compiler, suffixes):
+    """
+    Set the suffixes table of a compiler and insert its suffixes in "ARCH_SUFFIXES".
+
+    New tables are built then replaced atomically, so concurrent imports always
+    see complete tables.
+
+    Parameters
+    ----------
+    compiler : str
+        Compiler name.
+    suffixes : list of str
+        Suffixes ordered from best to the most compatible.
+    """
+    global _ARCH_SUFFIXES, _SUFFIXES_TABLES
+    with _UPDATE_LOCK:
+        tables = _SUFFIXES_TABLES.copy()
+        tables[compiler] = tuple(suffixes)
+
+        arch_suffixes = list(_ARCH_SUFFIXES)
+        suffixes_index = arch_suffixes.index
+        suffixes_insert = arch_suffixes.insert
         index = 0
         for suffix in suffixes:
             try:
@@ -47,49 +238,397 @@ def update_extensions_suffixes(compiler):
                 suffixes_insert(index, suffix)
                 index += 1
 
-        _PROCESSED_COMPILERS.add(compiler.name)
+        _ARCH_SUFFIXES = tuple(arch_suffixes)
+        _SUFFIXES_TABLES = tables
+
+
+def _detect_suffixes():
+    """
+    Compute suffixes for the default compiler once.
+
+    Modules imported by the detection itself use suffixes available at this time.
+    """
+    global _DETECTED, _DEFAULT_COMPILER, _DETECTION_THREAD
+    if not _DETECTED:
+        if _DETECTION_THREAD == _get_ident():
+            return
+
+        with _DETECTION_LOCK:
+            if not _DETECTED:
+                _DETECTION_THREAD = _get_ident()
+                try:
+                    if not _inherit_detection():
+                        _DEFAULT_COMPILER = update_extensions_suffixes(None)
+                    _DETECTED = True
+                finally:
+                    _DETECTION_THREAD = None
+
+
+def _suffixes_table(compiler=None):
+    """
+    Return the suffixes table of a compiler, computing it on first need.
+
+    Parameters
+    ----------
+    compiler : str or None
+        Compiler name. If None, uses the default compiler.
 
+    Returns
+    -------
+    tuple of str
+        Suffixes ordered from best to the most compatible. Suffixes of all
+        processed compilers if the compiler table is not available.
+    """
+    _detect_suffixes()
+    if compiler is None:
+        compiler = _DEFAULT_COMPILER
+    elif compiler not in _SUFFIXES_TABLES:
+        update_extensions_suffixes(compiler)
+    return _SUFFIXES_TABLES.get(compiler, _ARCH_SUFFIXES)
+
+
+def export_detection():
+    """
+    Pass detection results to child processes.
+
+    Detection is performed if not already done, then results are stored in the
+    "COMPILERTOOLS_HANDOFF" environment variable of the current process. Child
+    processes inheriting this environment, like those started with "subprocess" or
+    "multiprocessing", use these results instead of running the detection again.
+
+    Returns
+    -------
+    str
+        Environment variable value.
+    """
+    from json import dumps
+    from compilertools._cache import machine_fingerprint
+    from compilertools.processors import get_processor
+
+    _detect_suffixes()
+
+    try:
+        processor = get_processor(None, current_machine=True)
+        processors = {processor.arch: processor._export_state()}
     except Exception:
-        # Compilertools should not break user application, but only back to compatible
-        # mode. Exception is logged instead of risen.
-        log_exception()
+        processors = {}
 
+    value = dumps(
+        {
+            "version": HANDOFF_VERSION,
+            "machine": machine_fingerprint(),
+            "extensions": _machinery.EXTENSION_SUFFIXES,
+            "default": _DEFAULT_COMPILER,
+            "tables": _SUFFIXES_TABLES,
+            "processors": processors,
+        }
+    )
+    _environ[HANDOFF_ENV_VAR] = value
+    return value
+
+
+def _inherit_detection():
+    """
+    Use detection results from the parent process, if available.
+
+    Results are used only if the process runs on the same machine with the same
+    extensions suffixes than the parent process.
+
+    Returns
+    -------
+    bool
+        True if results were inherited.
+    """
+    value = _environ.get(HANDOFF_ENV_VAR)
+    if not value:
+        return False
+
+    global _DEFAULT_COMPILER
+    from json import loads
+    from compilertools._cache import machine_fingerprint, inherit_processors
+
+    try:
+        content = loads(value)
+        if (
+            content["version"] != HANDOFF_VERSION
+            or content["extensions"] != _machinery.EXTENSION_SUFFIXES
+            or content["machine"] != machine_fingerprint()
+        ):
+            return False
+        default = content["default"]
+        tables = content["tables"]
+        processors = content["processors"]
+        if not (
+            (default is None or default in tables)
+            and all(
+                isinstance(suffix, str)
+                for suffixes in tables.values()
+                for suffix in suffixes
+            )
+            and all(isinstance(state, dict) for state in processors.values())
+        ):
+            return False
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return False
+
+    if default is not None:
+        # Default compiler suffixes first in "ARCH_SUFFIXES"
+        _add_suffixes_table(default, tables[default])
+    for compiler, suffixes in tables.items():
+        if compiler != default:
+            _add_suffixes_table(compiler, suffixes)
+    _DEFAULT_COMPILER = default
+    inherit_processors(processors)
+    return True
+
+
+def warm_up():
+    """
+    Start CPU and compiler detection in a background thread.
+
+    By default, detection is performed on the first import of a module with
+    architecture specific optimizations. Calling this function early on application
+    startup allows running detection concurrently with the rest of the startup.
+
+    Returns
+    -------
+    threading.Thread
+        Detection thread.
+    """
+    from threading import Thread
+
+    thread = Thread(target=_detect_suffixes, name="compilertools-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def _request_permissions(suffix):
+    """
+    Request permissions required to run the instructions of a suffix.
+
+    Permissions are requested only once, and only when a file requiring them is
+    about to be loaded, so the detection has no side effects on the process.
+
+    Parameters
+    ----------
+    suffix : str
+        File suffix.
+
+    Returns
+    -------
+    bool
+        True if all required permissions are granted.
+    """
+    if "amx" not in suffix.split(".")[1].split("-"):
+        return True
+
+    try:
+        return _PERMISSIONS["amx"]
+    except KeyError:
+        pass
+
+    granted = True
+    if _sys.platform.startswith("linux"):
+        # Since Linux 5.16, using AMX tiles requires a permission
+        from compilertools.processors._linux import (
+            request_xstate_permission,
+            XFEATURE_XTILEDATA,
+        )
+
+        granted = request_xstate_permission(XFEATURE_XTILEDATA)
+    _PERMISSIONS["amx"] = granted
+    return granted
+
+
+def _directory_index(path):
+    """
+    Return the cached content of a directory.
+
+    The cache is refreshed when the directory modification time changes, or when
+    "importlib.invalidate_caches" is called.
+
+    Parameters
+    ----------
+    path : str
+        Directory path.
+
+    Returns
+    -------
+    tuple
+        Files names, Names of modules with architecture specific variants,
+        Manifest content as dict with modules names as keys and
+        (compiler name, frozenset of variants files names) as values.
+    """
+    _STATS["filesystem_probes"] += 1
+    try:
+        mtime = _stat(path or ".").st_mtime_ns
+    except OSError:
+        return _EMPTY_INDEX
+
+    try:
+        cached_mtime, index = _DIRECTORIES[path]
+        if cached_mtime == mtime:
+            _STATS["directory_cache_hits"] += 1
+            return index
+    except KeyError:
+        pass
+
+    _STATS["directory_cache_misses"] += 1
+    _STATS["filesystem_probes"] += 1
+    try:
+        names = frozenset(_listdir(path or "."))
+    except OSError:
+        names = frozenset()
+
+    extensions = sorted(_machinery.EXTENSION_SUFFIXES, key=len, reverse=True)
+    modules = set()
+    for name in names:
+        for extension in extensions:
+            if name.endswith(extension):
+                module, _, variant = name[: -len(extension)].rpartition(".")
+                if module and variant:
+                    modules.add(module)
+                break
+
+    manifest = (
+        _read_manifest(_join(path, MANIFEST_NAME)) if MANIFEST_NAME in names else {}
+    )
+
+    index = names, frozenset(modules), manifest
+    _DIRECTORIES[path] = mtime, index
+    return index
+
+
+def _read_manifest(path):
+    """
+    Read a build manifest.
+
+    Parameters
+    ----------
+    path : str
+        Manifest path.
+
+    Returns
+    -------
+    dict
+        Keys are modules names, values are (compiler name, frozenset of variants
+        files names). Empty if the manifest is invalid.
+    """
+    from json import load
+
+    _STATS["filesystem_probes"] += 1
+    try:
+        with open(path, "rt") as file:
+            content = load(file)
+        if content["version"] != MANIFEST_VERSION:
+            return {}
+        return {
+            module: (
+                extension["compiler"],
+                frozenset(
+                    variant["file"] for variant in extension["variants"].values()
+                ),
+            )
+            for module, extension in content["extensions"].items()
+        }
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return {}
+
+
+class _ExtensionFileLoader(_machinery.ExtensionFileLoader):
+    """Extension file loader measuring time spent loading the shared library."""
+
+    def create_module(self, spec):
+        """
+        Create module from the shared library.
+
+        See importlib.machinery.ExtensionFileLoader.create_module for more
+        information.
+        """
+        start = _perf_counter()
+        module = _machinery.ExtensionFileLoader.create_module(self, spec)
+        _STATS["dlopen"][spec.name] = _perf_counter() - start
+        return module
+
+
+class _ExtensionFileFinder:
+    """
+    Path finder for extensions with architecture specific optimizations.
 
-update_extensions_suffixes(None)
+    Implements the "importlib.abc.MetaPathFinder" protocol without inheriting from
+    it to avoid importing "importlib.abc" on startup.
+    """
 
+    @staticmethod
+    def invalidate_caches():
+        """
+        Clear directories content cache.
 
-class _ExtensionFileFinder(_MetaPathFinder):
-    """Path finder for extensions with architecture specific optimizations."""
+        See importlib.abc.MetaPathFinder.invalidate_caches for more information.
+        """
+        _DIRECTORIES.clear()
 
-    def find_spec(self, fullname, *args, path=None, **kwargs):
+    def find_spec(self, fullname, path=None, target=None):
         """
         Find module spec using new arch specific suffixes.
 
+        Top level modules are searched in "sys.path", submodules are searched in
+        their parent package "__path__".
+
         See importlib.abc.MetaPathFinder.find_spec for more information.
         """
-        sys_paths = _sys.path
+        _STATS["find_spec_calls"] += 1
+        if path is None:
+            path = _sys.path
+            name = fullname
+        else:
+            name = fullname.rpartition(".")[2]
+
+        marker = f"{name}.compilertools"
+        directories = []
+        compiler = None
+        for entry in path:
+            names, modules, manifest = _directory_index(entry)
 
-        file_name = f"{fullname}.compilertools"
-        for sys_path in sys_paths:
-            file_path = _join(sys_path, file_name)
-            if _isfile(file_path):
-                with open(file_path, "rt") as file:
+            if name in manifest:
+                # Files listed in the manifest may be missing (Like stripped wheels)
+                compiler, files = manifest[name]
+                directories = [(entry, files & names)]
+
+            elif marker in names:
+                _STATS["filesystem_probes"] += 1
+                with open(_join(entry, marker), "rt") as file:
                     compiler = file.read()
+                directories = [(entry, names)]
 
-                if compiler not in _PROCESSED_COMPILERS:
-                    update_extensions_suffixes(compiler)
+            else:
+                if name in modules:
+                    directories.append((entry, names))
+                continue
 
-                sys_paths = [sys_path]
-                break
+            break
+
+        if directories:
+            # Only suffixes of the compiler used to build the module are probed
+            for suffix in _suffixes_table(compiler):
+                file_name = f"{name}{suffix}"
+                for directory, names in directories:
+                    if file_name in names:
+                        if not _request_permissions(suffix):
+                            # Not allowed to run this file, uses the next one
+                            break
+                        file_path = _join(directory, file_name)
+                        loader = _ExtensionFileLoader(fullname, file_path)
+                        _STATS["find_spec_hits"] += 1
+                        return _machinery.ModuleSpec(fullname, loader, origin=file_path)
 
-        for suffix in ARCH_SUFFIXES:
-            file_name = f"{fullname}{suffix}"
-            for sys_path in sys_paths:
-                file_path = _join(sys_path, file_name)
-                if _isfile(file_path):
-                    loader = _machinery.ExtensionFileLoader(fullname, file_path)
-                    return _machinery.ModuleSpec(fullname, loader, origin=file_path)
+        _STATS["find_spec_misses"] += 1
         return None
 
 
 _sys.meta_path.insert(0, _ExtensionFileFinder())
+
+if _environ.get(STATS_ENV_VAR):
+    import atexit as _atexit
+
+    _atexit.register(_dump_stats, _environ[STATS_ENV_VAR])
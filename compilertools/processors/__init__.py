@@ -1,5 +1,11 @@
 """Processors."""
 
-from compilertools.processors._core import ProcessorBase, get_processor, get_arch
+from compilertools.processors._core import (
+    ProcessorBase,
+    Features,
+    get_processor,
+    get_arch,
+    clear_processors,
+)
 
-__all__ = ["ProcessorBase", "get_processor", "get_arch"]
+__all__ = ["ProcessorBase", "Features", "get_processor", "get_arch", "clear_processors"]
@@ -1,10 +1,25 @@
 """Base class and functions for CPU."""
 
 from platform import machine
+from _thread import allocate_lock
 from compilertools._utils import import_class, BaseClass
 from compilertools._config import CONFIG
 
-__all__ = ["ProcessorBase", "get_processor", "get_arch"]
+__all__ = ["ProcessorBase", "Features", "get_processor", "get_arch", "clear_processors"]
+
+#: Features bits: {feature name: bit}. Bits are assigned on first use of a feature
+#: name in the current process.
+_FEATURES_BITS = {}
+_FEATURES_BITS_LOCK = allocate_lock()
+
+#: Cached masks of features names groups
+_FEATURES_MASKS = {}
+
+#: CPU profiles format version
+PROFILE_VERSION = 1
+
+#: Interned processors: {(arch, current_machine): processor}
+_PROCESSORS = {}
 
 
 def get_arch(arch=None):
@@ -47,6 +62,10 @@ def get_processor(arch, *args, **kwargs):
     """
     Return processor class.
 
+    Processors are interned: The same instance is returned for the same
+    architecture and "current_machine" value, so the current machine is detected
+    once per process. Returned instances are shared and should not be modified.
+
     Parameters
     ----------
     arch : str or None
@@ -59,21 +78,153 @@ def get_processor(arch, *args, **kwargs):
     ProcessorBase subclass instance
         Processor class instance.
     """
-    return import_class("processors", get_arch(arch), "Processor", ProcessorBase)(
+    arch = get_arch(arch)
+    key = arch, bool(kwargs.get("current_machine", args[0] if args else False))
+    try:
+        return _PROCESSORS[key]
+    except KeyError:
+        pass
+
+    processor = import_class("processors", arch, "Processor", ProcessorBase)(
         *args, **kwargs
     )
 
+    if processor.current_machine:
+        from compilertools._cache import cached_processor
+
+        processor = cached_processor(processor)
+
+    _PROCESSORS[key] = processor
+    return processor
+
+
+def clear_processors():
+    """
+    Clear interned processors.
+
+    Next "get_processor" calls return new instances, and detect the current
+    machine again (Or load it from the detection cache). Compilers arguments
+    computed with previous processors are also cleared.
+    """
+    _PROCESSORS.clear()
+
+    from compilertools.compilers._core import _clear_args_caches
+
+    _clear_args_caches()
+
+
+def _feature_bit(name):
+    """
+    Return the bit of a feature.
+
+    Parameters
+    ----------
+    name : str
+        Feature name.
+
+    Returns
+    -------
+    int
+        Bit mask with only the feature bit set.
+    """
+    try:
+        return _FEATURES_BITS[name]
+    except KeyError:
+        with _FEATURES_BITS_LOCK:
+            return _FEATURES_BITS.setdefault(name, 1 << len(_FEATURES_BITS))
+
+
+class Features(frozenset):
+    """
+    Immutable set of CPU features names.
+
+    The "mask" attribute is an integer with a bit set for each feature, allowing
+    checking multiple features with a single operation.
+
+    Parameters
+    ----------
+    names : iterable of str
+        Features names.
+    """
+
+    def __new__(cls, names=()):
+        """Create features set."""
+        features = frozenset.__new__(cls, names)
+        mask = 0
+        for name in features:
+            mask |= _feature_bit(name)
+        features.mask = mask
+        return features
+
+    @staticmethod
+    def mask_of(names):
+        """
+        Return the mask of some features.
+
+        Parameters
+        ----------
+        names : tuple of str
+            Features names.
+
+        Returns
+        -------
+        int
+            Mask.
+        """
+        try:
+            return _FEATURES_MASKS[names]
+        except KeyError:
+            mask = 0
+            for name in names:
+                mask |= _feature_bit(name)
+            _FEATURES_MASKS[names] = mask
+            return mask
+
+    def has_all(self, names):
+        """
+        Check if all specified features are in this set.
+
+        Parameters
+        ----------
+        names : tuple of str or int
+            Features names, or mask returned by "mask_of".
+
+        Returns
+        -------
+        bool
+            True if all features are in this set.
+        """
+        mask = names if isinstance(names, int) else self.mask_of(names)
+        return self.mask & mask == mask
+
+    def __reduce__(self):
+        """Pickle support, masks are specific to the current process."""
+        return type(self), (sorted(self),)
+
+    def __repr__(self):
+        """Representation."""
+        return f"{type(self).__name__}({sorted(self)!r})"
+
 
 class ProcessorBase(BaseClass):
     """Base class for CPU."""
 
+    #: Detected properties stored in the persistent detection cache
+    _cached_properties = ("vendor", "brand", "features")
+
     def __init__(self, current_machine=False):
         BaseClass.__init__(self)
         self["current_machine"] = current_machine
         self._default["current_machine"] = False
         self._default["vendor"] = ""
         self._default["brand"] = ""
-        self._default["features"] = []
+        self._default["features"] = Features()
+        self._default["cache_hierarchy"] = {}
+        self._default["topology"] = {}
+
+        # Raw information recorded by "snapshot", or replayed by "from_profile"
+        self._reads = None
+        self._replay = False
 
     @BaseClass._memoized_property
     def arch(self):
@@ -86,3 +237,304 @@ class ProcessorBase(BaseClass):
             Architecture name.
         """
         return self.__module__.rsplit(".", 1)[-1]
+
+    @BaseClass._memoized_property
+    def cache_hierarchy(self):
+        """
+        CPU caches.
+
+        Returns
+        -------
+        dict
+            Keys are caches names ("L1d", "L1i", "L2", "L3"), values are dict with
+            "size" (bytes), "line_size" (bytes) and "associativity" (ways) keys.
+            Empty if not available.
+        """
+        if not self.current_machine:
+            return None
+
+        return self._read("caches")
+
+    @BaseClass._memoized_property
+    def topology(self):
+        """
+        CPU topology.
+
+        Returns
+        -------
+        dict
+            "packages", "cores" (Physical cores) and "threads" (Logical CPUs)
+            counts. Empty if not available.
+        """
+        if not self.current_machine:
+            return None
+
+        return self._read("topology")
+
+    def _read(self, source, *args):
+        """
+        Read raw information on the current machine CPU.
+
+        Detection code must only get raw information (Registers values, operating
+        system files, ...) with this method, so it can be recorded in a profile by
+        "snapshot" and replayed by "from_profile".
+
+        Parameters
+        ----------
+        source : str
+            Information source. The "_read_<source>" method is used to read it.
+        args : int or str
+            Source arguments.
+
+        Returns
+        -------
+        object
+            JSON serializable value. None if not available, or not in the replayed
+            profile.
+        """
+        reads = self._reads
+        if reads is None:
+            return getattr(self, f"_read_{source}")(*args)
+
+        key = ":".join(str(arg) for arg in (source, *args))
+        if self._replay:
+            return reads.get(key)
+        value = reads[key] = getattr(self, f"_read_{source}")(*args)
+        return value
+
+    @staticmethod
+    def _read_cpu_detection():
+        """
+        CPU detection mode from the configuration.
+
+        Returns
+        -------
+        str
+            Mode.
+        """
+        return CONFIG.get("cpu_detection", "auto")
+
+    @staticmethod
+    def _read_system():
+        """
+        Operating system name.
+
+        Returns
+        -------
+        str
+            Name.
+        """
+        from platform import system
+
+        return system()
+
+    @staticmethod
+    def _read_cpu_count():
+        """
+        Logical CPUs count.
+
+        Returns
+        -------
+        int or None
+            Count.
+        """
+        from os import cpu_count
+
+        return cpu_count()
+
+    @staticmethod
+    def _read_cpuinfo():
+        """
+        Linux "/proc/cpuinfo" first processor block.
+
+        Returns
+        -------
+        dict or None
+            Content.
+        """
+        from compilertools.processors._linux import cpuinfo
+
+        return cpuinfo()
+
+    @staticmethod
+    def _read_sysfs(name):
+        """
+        Linux sysfs CPU information file.
+
+        Parameters
+        ----------
+        name : str
+            File path relative to "/sys/devices/system/cpu".
+
+        Returns
+        -------
+        str or None
+            Content.
+        """
+        from compilertools.processors._linux import read_sysfs
+
+        return read_sysfs(name)
+
+    @staticmethod
+    def _read_getauxval(key):
+        """
+        Linux auxiliary vector value.
+
+        Parameters
+        ----------
+        key : int
+            Value type (Like AT_HWCAP).
+
+        Returns
+        -------
+        int
+            Value.
+        """
+        from compilertools.processors._linux import getauxval
+
+        return getauxval(key)
+
+    @staticmethod
+    def _read_caches():
+        """
+        CPU caches from Linux sysfs.
+
+        Returns
+        -------
+        dict or None
+            Caches.
+        """
+        from compilertools.processors._linux import caches
+
+        return caches()
+
+    @staticmethod
+    def _read_topology():
+        """
+        CPU topology from Linux sysfs.
+
+        Returns
+        -------
+        dict or None
+            Topology.
+        """
+        from compilertools.processors._linux import topology
+
+        return topology()
+
+    @classmethod
+    def snapshot(cls, path=None):
+        """
+        Record the current machine CPU raw information in a profile.
+
+        The profile can be replayed on another machine with "from_profile".
+
+        Parameters
+        ----------
+        path : str
+            If specified, the profile is also written to this JSON file.
+
+        Returns
+        -------
+        dict
+            Profile.
+        """
+        if cls is ProcessorBase:
+            cls = import_class("processors", get_arch(), "Processor", ProcessorBase)
+
+        processor = cls(current_machine=True)
+        processor._reads = reads = {}
+
+        # Detects all properties to read all required information
+        for name in dir(cls):
+            if isinstance(getattr(cls, name, None), property):
+                getattr(processor, name)
+
+        profile = {"version": PROFILE_VERSION, "arch": processor.arch, "reads": reads}
+        if path:
+            from json import dump
+
+            with open(path, "wt") as file:
+                dump(profile, file, indent=1, sort_keys=True)
+        return profile
+
+    @classmethod
+    def from_profile(cls, profile):
+        """
+        Create a processor from a profile recorded by "snapshot".
+
+        Properties are detected from the profile raw information, with the same code
+        than for the current machine. The processor can be passed as
+        "current_machine" to "CompilerBase.compile_args" to get arguments for the
+        profiled machine.
+
+        Parameters
+        ----------
+        profile : dict or str
+            Profile, or path to a profile JSON file.
+
+        Returns
+        -------
+        ProcessorBase subclass instance
+            Processor.
+        """
+        if isinstance(profile, str):
+            from json import load
+
+            with open(profile, "rt") as file:
+                profile = load(file)
+
+        if profile.get("version") != PROFILE_VERSION:
+            raise ValueError(
+                f"Unsupported CPU profile version: {profile.get('version')}"
+            )
+
+        processor_class = import_class(
+            "processors", profile["arch"], "Processor", ProcessorBase
+        )
+        if not issubclass(processor_class, cls):
+            raise ValueError(
+                f"CPU profile architecture {profile['arch']} is not compatible with "
+                f"{cls.__module__}.{cls.__name__}"
+            )
+
+        processor = processor_class(current_machine=True)
+        processor._reads = dict(profile["reads"])
+        processor._replay = True
+        return processor
+
+    def _export_state(self):
+        """
+        Export detected properties.
+
+        Returns
+        -------
+        dict
+            JSON serializable properties values.
+        """
+        state = {}
+        for name in self._cached_properties:
+            value = self[name]
+            if isinstance(value, (set, frozenset)):
+                value = sorted(value)
+            state[name] = value
+        return state
+
+    def _import_state(self, state):
+        """
+        Import detected properties.
+
+        Parameters
+        ----------
+        state : dict
+            Properties values, like returned by "_export_state".
+        """
+        values = {name: state[name] for name in self._cached_properties}
+        values["features"] = Features(values["features"])
+        self._items.update(values)
+
+    def __setitem__(self, key, value):
+        """Set."""
+        if key == "features" and value is not None:
+            value = Features(value)
+        return BaseClass.__setitem__(self, key, value)
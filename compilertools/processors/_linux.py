@@ -0,0 +1,236 @@
+"""Linux CPU information, without running any CPU instruction."""
+
+__all__ = [
+    "cpuinfo",
+    "getauxval",
+    "read_sysfs",
+    "caches",
+    "topology",
+    "request_xstate_permission",
+    "AT_HWCAP",
+    "AT_HWCAP2",
+    "XFEATURE_XTILEDATA",
+]
+
+#: "getauxval" CPU capabilities keys
+AT_HWCAP = 16
+AT_HWCAP2 = 26
+
+#: x86 extended states requiring a permission: AMX tiles data
+XFEATURE_XTILEDATA = 18
+
+#: "arch_prctl" code to request an extended state permission
+ARCH_REQ_XCOMP_PERM = 0x1023
+
+#: "arch_prctl" system call numbers on x86-64 and x86-32
+SYS_ARCH_PRCTL = {8: 158, 4: 384}
+
+#: CPU information in sysfs
+SYSFS_CPU = "/sys/devices/system/cpu"
+
+
+def cpuinfo(path="/proc/cpuinfo"):
+    """
+    Read the first processor information block of "/proc/cpuinfo".
+
+    Parameters
+    ----------
+    path : str
+        File path.
+
+    Returns
+    -------
+    dict or None
+        Keys and values of the block. None if not available.
+    """
+    info = {}
+    try:
+        with open(path, "rt") as file:
+            for line in file:
+                if not line.strip():
+                    if info:
+                        # Only the first processor block is required
+                        break
+                    continue
+                key, _, value = line.partition(":")
+                info[key.strip()] = value.strip()
+    except OSError:
+        return None
+    return info or None
+
+
+def getauxval(key):
+    """
+    Get a value from the auxiliary vector passed by the kernel to the process.
+
+    Parameters
+    ----------
+    key : int
+        Value type (Like AT_HWCAP, AT_HWCAP2).
+
+    Returns
+    -------
+    int
+        Value. 0 if not available.
+    """
+    from ctypes import CDLL, c_ulong
+
+    try:
+        function = CDLL(None).getauxval
+    except (OSError, AttributeError):
+        return 0
+    function.restype = c_ulong
+    function.argtypes = [c_ulong]
+    return function(key)
+
+
+def read_sysfs(name):
+    """
+    Read a CPU information file from sysfs.
+
+    Parameters
+    ----------
+    name : str
+        File path relative to "/sys/devices/system/cpu".
+
+    Returns
+    -------
+    str or None
+        File content. None if not available.
+    """
+    from os.path import join
+
+    try:
+        with open(join(SYSFS_CPU, name), "rt") as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def caches(cpu=0):
+    """
+    Read CPU caches information from sysfs.
+
+    Parameters
+    ----------
+    cpu : int
+        CPU number.
+
+    Returns
+    -------
+    dict or None
+        Keys are caches names ("L1d", "L1i", "L2", "L3"), values are dict with
+        "size" (bytes), "line_size" (bytes) and "associativity" (ways) keys. None
+        if not available.
+    """
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    result = {}
+    index = 0
+    while True:
+        path = f"cpu{cpu}/cache/index{index}/"
+        level = read_sysfs(path + "level")
+        if level is None:
+            break
+        index += 1
+
+        cache_type = read_sysfs(path + "type") or ""
+        size = read_sysfs(path + "size") or "0"
+        try:
+            size = int(size[:-1]) * units[size[-1]]
+        except (KeyError, ValueError):
+            try:
+                size = int(size)
+            except ValueError:
+                size = 0
+        result[_cache_name(int(level), cache_type)] = {
+            "size": size,
+            "line_size": int(read_sysfs(path + "coherency_line_size") or 0),
+            "associativity": int(read_sysfs(path + "ways_of_associativity") or 0),
+        }
+    return result or None
+
+
+def _cache_name(level, cache_type):
+    """
+    Return a cache name.
+
+    Parameters
+    ----------
+    level : int
+        Cache level.
+    cache_type : str
+        "Data", "Instruction" or "Unified".
+
+    Returns
+    -------
+    str
+        Name.
+    """
+    suffix = "" if cache_type == "Unified" else cache_type[:1].lower()
+    return f"L{level}{suffix}"
+
+
+def topology():
+    """
+    Read CPU topology from sysfs.
+
+    Returns
+    -------
+    dict or None
+        "packages", "cores" (Physical cores) and "threads" (Logical CPUs) counts.
+        None if not available.
+    """
+    from os import listdir
+
+    try:
+        names = listdir(SYSFS_CPU)
+    except OSError:
+        return None
+
+    packages = set()
+    cores = set()
+    threads = 0
+    for name in names:
+        if not name.startswith("cpu") or not name[3:].isdigit():
+            continue
+        package = read_sysfs(f"{name}/topology/physical_package_id")
+        if package is None:
+            # Offline CPU
+            continue
+        die = read_sysfs(f"{name}/topology/die_id")
+        core = read_sysfs(f"{name}/topology/core_id")
+        packages.add(package)
+        cores.add((package, die, core))
+        threads += 1
+
+    if not threads:
+        return None
+    return {"packages": len(packages), "cores": len(cores), "threads": threads}
+
+
+def request_xstate_permission(xfeature):
+    """
+    Request the permission to use an x86 extended state in the current process.
+
+    Since Linux 5.16, processes must request this permission before running
+    instructions using large registers states like AMX tiles.
+
+    Parameters
+    ----------
+    xfeature : int
+        Extended state component (Like XFEATURE_XTILEDATA).
+
+    Returns
+    -------
+    bool
+        True if permission granted.
+    """
+    from ctypes import CDLL, c_long, c_void_p, sizeof
+
+    try:
+        function = CDLL(None).syscall
+        number = SYS_ARCH_PRCTL[sizeof(c_void_p)]
+    except (OSError, AttributeError, KeyError):
+        return False
+    function.restype = c_long
+    return function(c_long(number), c_long(ARCH_REQ_XCOMP_PERM), c_long(xfeature)) == 0
@@ -0,0 +1,282 @@
+"""ARM 64-bit Processors."""
+
+from compilertools.processors import ProcessorBase as _ProcessorBase
+from compilertools.processors import Features as _Features
+
+__all__ = ["Processor", "MICROARCHITECTURES_ISA"]
+
+#: Linux "AT_HWCAP" feature bits: {bit: feature}
+_HWCAP = {
+    0: "FP",
+    1: "ASIMD",
+    2: "EVTSTRM",
+    3: "AES",
+    4: "PMULL",
+    5: "SHA1",
+    6: "SHA2",
+    7: "CRC32",
+    8: "LSE",
+    9: "FPHP",
+    10: "ASIMDHP",
+    11: "CPUID",
+    12: "ASIMDRDM",
+    13: "JSCVT",
+    14: "FCMA",
+    15: "LRCPC",
+    16: "DCPOP",
+    17: "SHA3",
+    18: "SM3",
+    19: "SM4",
+    20: "DOTPROD",
+    21: "SHA512",
+    22: "SVE",
+    23: "ASIMDFHM",
+    24: "DIT",
+    25: "USCAT",
+    26: "ILRCPC",
+    27: "FLAGM",
+    28: "SSBS",
+    29: "SB",
+    30: "PACA",
+    31: "PACG",
+}
+
+#: Linux "AT_HWCAP2" feature bits: {bit: feature}
+_HWCAP2 = {
+    0: "DCPODP",
+    1: "SVE2",
+    2: "SVEAES",
+    3: "SVEPMULL",
+    4: "SVEBITPERM",
+    5: "SVESHA3",
+    6: "SVESM4",
+    7: "FLAGM2",
+    8: "FRINT",
+    9: "SVEI8MM",
+    10: "SVEF32MM",
+    11: "SVEF64MM",
+    12: "SVEBF16",
+    13: "I8MM",
+    14: "BF16",
+    15: "DGH",
+    16: "RNG",
+    17: "BTI",
+    18: "MTE",
+}
+
+#: All features names
+_FEATURES_NAMES = frozenset(_HWCAP.values()) | frozenset(_HWCAP2.values())
+
+#: Linux "/proc/cpuinfo" features with names different from features names
+_LINUX_FLAGS = {"asimddp": "DOTPROD", "atomics": "LSE"}
+
+#: CPU implementers IDs
+_IMPLEMENTERS = {
+    0x41: "ARM",
+    0x42: "Broadcom",
+    0x43: "Cavium",
+    0x46: "Fujitsu",
+    0x48: "HiSilicon",
+    0x4E: "NVIDIA",
+    0x50: "APM",
+    0x51: "Qualcomm",
+    0x53: "Samsung",
+    0x61: "Apple",
+    0xC0: "Ampere",
+}
+
+#: Microarchitectures names (GCC/Clang "-mcpu" values) from implementer and part IDs
+_MICROARCHITECTURES = {
+    (0x41, 0xD03): "cortex-a53",
+    (0x41, 0xD05): "cortex-a55",
+    (0x41, 0xD07): "cortex-a57",
+    (0x41, 0xD08): "cortex-a72",
+    (0x41, 0xD0B): "cortex-a76",
+    (0x41, 0xD0C): "neoverse-n1",
+    (0x41, 0xD0D): "cortex-a77",
+    (0x41, 0xD40): "neoverse-v1",
+    (0x41, 0xD41): "cortex-a78",
+    (0x41, 0xD44): "cortex-x1",
+    (0x41, 0xD46): "cortex-a510",
+    (0x41, 0xD47): "cortex-a710",
+    (0x41, 0xD49): "neoverse-n2",
+    (0x41, 0xD4F): "neoverse-v2",
+    (0x43, 0x0AF): "thunderx2t99",
+    (0x46, 0x001): "a64fx",
+    (0x48, 0xD01): "tsv110",
+    (0x50, 0x000): "xgene1",
+    (0xC0, 0xAC3): "ampere1",
+    (0xC0, 0xAC4): "ampere1a",
+}
+
+#: Microarchitectures instructions sets, by architecture version
+_MCPU_V8 = frozenset(("FP", "ASIMD"))
+_MCPU_V8_1 = _MCPU_V8 | {"CRC32", "LSE", "ASIMDRDM"}
+_MCPU_V8_2 = _MCPU_V8_1 | {"FPHP", "ASIMDHP"}
+_MCPU_V8_2_DOTPROD = _MCPU_V8_2 | {"DOTPROD", "LRCPC"}
+_MCPU_V8_6 = _MCPU_V8_2_DOTPROD | {"BF16", "I8MM"}
+
+#: Instructions sets used by code generated for microarchitectures ("-mcpu").
+#: {name: features}
+MICROARCHITECTURES_ISA = {
+    "cortex-a53": _MCPU_V8 | {"CRC32"},
+    "cortex-a57": _MCPU_V8 | {"CRC32"},
+    "cortex-a72": _MCPU_V8 | {"CRC32"},
+    "xgene1": _MCPU_V8,
+    "thunderx2t99": _MCPU_V8_1,
+    "cortex-a55": _MCPU_V8_2_DOTPROD,
+    "cortex-a76": _MCPU_V8_2_DOTPROD,
+    "neoverse-n1": _MCPU_V8_2_DOTPROD,
+    "cortex-a77": _MCPU_V8_2_DOTPROD,
+    "cortex-a78": _MCPU_V8_2_DOTPROD,
+    "cortex-x1": _MCPU_V8_2_DOTPROD,
+    "tsv110": _MCPU_V8_2 | {"DOTPROD"},
+    "a64fx": _MCPU_V8_2 | {"SVE"},
+    "neoverse-v1": _MCPU_V8_6 | {"SVE"},
+    "ampere1": _MCPU_V8_6,
+    "ampere1a": _MCPU_V8_6,
+    "cortex-a510": _MCPU_V8_6 | {"SVE", "SVE2"},
+    "cortex-a710": _MCPU_V8_6 | {"SVE", "SVE2"},
+    "neoverse-n2": _MCPU_V8_6 | {"SVE", "SVE2"},
+    "neoverse-v2": _MCPU_V8_6 | {"SVE", "SVE2"},
+}
+
+
+class Processor(_ProcessorBase):
+    """ARM 64-bit CPU."""
+
+    _cached_properties = _ProcessorBase._cached_properties + ("implementer", "part")
+
+    def __init__(self, current_machine=False):
+        _ProcessorBase.__init__(self, current_machine)
+        self._default["implementer"] = 0
+        self._default["part"] = 0
+        self._default["microarchitecture"] = ""
+
+    @_ProcessorBase._memoized_property
+    def implementer(self):
+        """
+        CPU implementer ID.
+
+        Returns
+        -------
+        int
+            Implementer ID.
+        """
+        return self._cpuinfo_id("CPU implementer")
+
+    @_ProcessorBase._memoized_property
+    def part(self):
+        """
+        CPU part ID (Model, in the implementer parts).
+
+        Returns
+        -------
+        int
+            Part ID.
+        """
+        return self._cpuinfo_id("CPU part")
+
+    def _cpuinfo_id(self, key):
+        """
+        Get an hexadecimal ID from "/proc/cpuinfo".
+
+        Parameters
+        ----------
+        key : str
+            Key.
+
+        Returns
+        -------
+        int or None
+            ID. None if not available.
+        """
+        if not self.current_machine:
+            return None
+
+        try:
+            return int((self._read("cpuinfo") or {})[key], 16)
+        except (KeyError, ValueError):
+            return None
+
+    @_ProcessorBase._memoized_property
+    def vendor(self):
+        """
+        CPU implementer name.
+
+        Returns
+        -------
+        str
+            Implementer name.
+        """
+        if not self.current_machine:
+            return None
+
+        return _IMPLEMENTERS.get(self.implementer)
+
+    @_ProcessorBase._memoized_property
+    def brand(self):
+        """
+        Brand from "/proc/cpuinfo", if available.
+
+        Returns
+        -------
+        str
+            Brand.
+        """
+        if not self.current_machine:
+            return None
+
+        return (self._read("cpuinfo") or {}).get("model name")
+
+    @_ProcessorBase._memoized_property
+    def microarchitecture(self):
+        """
+        CPU microarchitecture.
+
+        Names are GCC and Clang "-mcpu" values.
+
+        Returns
+        -------
+        str
+            Microarchitecture. Empty if unknown.
+        """
+        if not self.current_machine:
+            return None
+
+        return _MICROARCHITECTURES.get((self.implementer, self.part))
+
+    @_ProcessorBase._memoized_property
+    def features(self):
+        """
+        Features flags from Linux "getauxval" and "/proc/cpuinfo".
+
+        Returns
+        -------
+        compilertools.processors.Features
+            Flags names.
+
+        References
+        ----------
+        Reference: Linux kernel "arch/arm64/include/uapi/asm/hwcap.h"
+
+        Exceptions in names: ASIMDDP called DOTPROD and ATOMICS called LSE (Like
+        compilers extensions names)
+        """
+        if not self.current_machine:
+            return None
+
+        from compilertools.processors._linux import AT_HWCAP, AT_HWCAP2
+
+        flags = set()
+        add_flag = flags.add
+        for key, bits_names in ((AT_HWCAP, _HWCAP), (AT_HWCAP2, _HWCAP2)):
+            bits = self._read("getauxval", key) or 0
+            for bit in bits_names:
+                if ((1 << bit) & bits) != 0:
+                    add_flag(bits_names[bit])
+
+        for flag in (self._read("cpuinfo") or {}).get("Features", "").split():
+            add_flag(_LINUX_FLAGS.get(flag, flag.upper()))
+
+        return _Features(flags & _FEATURES_NAMES)
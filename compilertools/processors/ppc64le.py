@@ -0,0 +1,130 @@
+"""POWER 64-bit little-endian Processors."""
+
+from compilertools.processors import ProcessorBase as _ProcessorBase
+from compilertools.processors import Features as _Features
+
+__all__ = ["Processor"]
+
+#: Linux "AT_HWCAP" feature bits: {bit: feature}
+_HWCAP = {
+    1: "TRUE_LE",
+    7: "VSX",
+    8: "ARCH_2_06",
+    10: "DFP",
+    27: "FPU",
+    28: "ALTIVEC",
+    30: "PPC64",
+}
+
+#: Linux "AT_HWCAP2" feature bits: {bit: feature}
+_HWCAP2 = {
+    17: "MMA",
+    18: "ARCH_3_1",
+    21: "DARN",
+    22: "IEEE128",
+    23: "ARCH_3_00",
+    25: "VEC_CRYPTO",
+    27: "ISEL",
+    30: "HTM",
+    31: "ARCH_2_07",
+}
+
+#: Microarchitectures names (GCC/Clang "-mcpu" values) from ISA levels features
+_ISA_LEVELS = (
+    ("ARCH_3_1", "power10"),
+    ("ARCH_3_00", "power9"),
+    ("ARCH_2_07", "power8"),
+)
+
+
+class Processor(_ProcessorBase):
+    """POWER 64-bit little-endian CPU."""
+
+    def __init__(self, current_machine=False):
+        _ProcessorBase.__init__(self, current_machine)
+        self._default["microarchitecture"] = ""
+
+    @_ProcessorBase._memoized_property
+    def vendor(self):
+        """
+        CPU vendor.
+
+        Returns
+        -------
+        str
+            Vendor.
+        """
+        if not self.current_machine:
+            return None
+
+        return "IBM"
+
+    @_ProcessorBase._memoized_property
+    def brand(self):
+        """
+        CPU from "/proc/cpuinfo" (Like "POWER9 (raw), altivec supported").
+
+        Returns
+        -------
+        str
+            Brand.
+        """
+        if not self.current_machine:
+            return None
+
+        return (self._read("cpuinfo") or {}).get("cpu")
+
+    @_ProcessorBase._memoized_property
+    def microarchitecture(self):
+        """
+        CPU microarchitecture.
+
+        Names are GCC and Clang "-mcpu" values. Guessed from the highest ISA level
+        if the CPU is not named in "/proc/cpuinfo".
+
+        Returns
+        -------
+        str
+            Microarchitecture. Empty if unknown.
+        """
+        if not self.current_machine:
+            return None
+
+        brand = self["brand"].split(" ", 1)[0].lower()
+        if brand.startswith("power") and brand[5:].isdigit():
+            return brand
+
+        features = self["features"]
+        for feature, name in _ISA_LEVELS:
+            if feature in features:
+                return name
+        return None
+
+    @_ProcessorBase._memoized_property
+    def features(self):
+        """
+        Features flags from Linux "getauxval".
+
+        Returns
+        -------
+        compilertools.processors.Features
+            Flags names.
+
+        References
+        ----------
+        Reference: Linux kernel "arch/powerpc/include/uapi/asm/cputable.h"
+        """
+        if not self.current_machine:
+            return None
+
+        from compilertools.processors._linux import AT_HWCAP, AT_HWCAP2
+
+        flags = set()
+        add_flag = flags.add
+        for key, bits_names in ((AT_HWCAP, _HWCAP), (AT_HWCAP2, _HWCAP2)):
+            bits = self._read("getauxval", key) or 0
+            for bit in bits_names:
+                if ((1 << bit) & bits) != 0:
+                    add_flag(bits_names[bit])
+
+        return _Features(flags)
@@ -0,0 +1,145 @@
+"""RISC-V 64-bit Processors."""
+
+from compilertools.processors import ProcessorBase as _ProcessorBase
+from compilertools.processors import Features as _Features
+
+__all__ = ["Processor", "RV64GC"]
+
+#: "G" is a shortcut for the general purpose extensions
+_ISA_G = ("I", "M", "A", "F", "D", "ZICSR", "ZIFENCEI")
+
+#: Extensions required by the "rv64gc" base of optimized files
+RV64GC = ("I", "M", "A", "F", "D", "C")
+
+#: Multi-letter extensions prefixes
+_ISA_PREFIXES = ("z", "s", "x")
+
+#: CPU vendors IDs ("mvendorid")
+_VENDORS = {0x31E: "Andes", 0x489: "SiFive", 0x5B7: "T-Head"}
+
+
+def _parse_isa(isa):
+    """
+    Parse a RISC-V ISA string.
+
+    Parameters
+    ----------
+    isa : str
+        ISA string (Like "rv64imafdcv_zba_zbb").
+
+    Returns
+    -------
+    set of str
+        Extensions names.
+    """
+    isa = isa.strip().lower()
+    for base in ("rv64", "rv32"):
+        if isa.startswith(base):
+            isa = isa[len(base) :]
+            break
+    else:
+        return set()
+
+    from re import sub
+
+    # Removes versions (Like "i2p1")
+    tokens = [sub(r"\d+p\d+", "", token) for token in isa.split("_")]
+
+    extensions = set()
+    for token in tokens:
+        if token.startswith(_ISA_PREFIXES):
+            # Multi-letter extension
+            extensions.add(token.upper())
+            continue
+
+        # Single-letter extensions, optionally followed by a multi-letter one
+        for index, letter in enumerate(token):
+            if letter in _ISA_PREFIXES:
+                extensions.add(token[index:].upper())
+                break
+            elif letter == "g":
+                extensions.update(_ISA_G)
+            elif letter.isalpha():
+                extensions.add(letter.upper())
+
+    return extensions
+
+
+class Processor(_ProcessorBase):
+    """RISC-V 64-bit CPU."""
+
+    def _cpuinfo(self, key):
+        """
+        Get a value from "/proc/cpuinfo".
+
+        Parameters
+        ----------
+        key : str
+            Key.
+
+        Returns
+        -------
+        str or None
+            Value. None if not available.
+        """
+        if not self.current_machine:
+            return None
+
+        return (self._read("cpuinfo") or {}).get(key)
+
+    @_ProcessorBase._memoized_property
+    def vendor(self):
+        """
+        CPU vendor from "mvendorid".
+
+        Returns
+        -------
+        str
+            Vendor.
+        """
+        try:
+            return _VENDORS.get(int(self._cpuinfo("mvendorid"), 16))
+        except (TypeError, ValueError):
+            return None
+
+    @_ProcessorBase._memoized_property
+    def brand(self):
+        """
+        CPU microarchitecture from "/proc/cpuinfo" (Like "sifive,u74-mc").
+
+        Returns
+        -------
+        str
+            Brand.
+        """
+        return self._cpuinfo("uarch")
+
+    @_ProcessorBase._memoized_property
+    def features(self):
+        """
+        Extensions from the "/proc/cpuinfo" ISA string and Linux "getauxval".
+
+        Returns
+        -------
+        compilertools.processors.Features
+            Extensions names (Like "V", "ZBA", "ZBB").
+
+        References
+        ----------
+        Reference: RISC-V unprivileged specification, "ISA Extension Naming
+        Conventions".
+        """
+        if not self.current_machine:
+            return None
+
+        from compilertools.processors._linux import AT_HWCAP
+
+        flags = _parse_isa(self._cpuinfo("isa") or "")
+
+        # Single-letter extensions, bit is letter index in alphabet
+        bits = self._read("getauxval", AT_HWCAP) or 0
+        for bit in range(26):
+            if ((1 << bit) & bits) != 0:
+                flags.add(chr(ord("A") + bit))
+
+        return _Features(flags)
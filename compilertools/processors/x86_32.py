@@ -1,17 +1,476 @@
 """X86-32 Processors."""
 
+from _thread import allocate_lock as _allocate_lock
+from ctypes import Structure as _Structure, c_uint32 as _c_uint32
 from compilertools.processors import ProcessorBase as _ProcessorBase
+from compilertools.processors import Features as _Features
+from compilertools._config import CONFIG as _CONFIG
 
-__all__ = ["Processor", "Cpuid"]
+__all__ = ["Processor", "Cpuid", "MICROARCHITECTURES_ISA"]
+
+
+#: Feature bits description
+#: {(eax, ecx): registers_dict}
+#: registers_dict: {register_name: feature_dict}
+#: feature_dict: {bit: feature}
+_FEATURE_BITS = {
+    # Intel
+    (1, 0): {
+        "edx": {
+            0: "FPU",
+            1: "VME",
+            2: "DE",
+            3: "PSE",
+            4: "TSC",
+            5: "MSR",
+            6: "PAE",
+            7: "MCE",
+            8: "CX8",
+            9: "APIC",
+            11: "SEP",
+            12: "MTRR",
+            13: "PGE",
+            14: "MCA",
+            15: "CMOV",
+            16: "PAT",
+            17: "PSE36",
+            18: "PN",
+            19: "CLFLUSH",
+            21: "DS",
+            22: "ACPI",
+            23: "MMX",
+            24: "FXSR",
+            25: "SSE",
+            26: "SSE2",
+            27: "SS",
+            28: "HT",
+            29: "TM",
+            30: "IA64",
+            31: "PBE",
+        },
+        "ecx": {
+            0: "SSE3",
+            1: "PCLMULQDQ",
+            2: "DTES64",
+            3: "MONITOR",
+            4: "DS_CPL",
+            5: "VMX",
+            6: "SMX",
+            7: "EST",
+            8: "TM2",
+            9: "SSSE3",
+            10: "CID",
+            11: "SDBG",
+            12: "FMA",
+            13: "CX16",
+            14: "XTPR",
+            15: "PDCM",
+            17: "PCID",
+            18: "DCA",
+            19: "SSE4_1",
+            20: "SSE4_2",
+            21: "X2APIC",
+            22: "MOVBE",
+            23: "POPCNT",
+            24: "TSC_DEADLINE_TIMER",
+            25: "AES",
+            26: "XSAVE",
+            27: "OSXSAVE",
+            28: "AVX",
+            29: "F16C",
+            30: "RDRAND",
+            31: "HYPERVISOR",
+        },
+    },
+    # Intel structured extended
+    (7, 0): {
+        "ebx": {
+            0: "FSGSBASE",
+            1: "TSC_ADJUST",
+            3: "BMI1",
+            4: "HLE",
+            5: "AVX2",
+            7: "SMEP",
+            8: "BMI2",
+            9: "ERMS",
+            10: "INVPCID",
+            11: "RTM",
+            12: "CQM",
+            14: "MPX",
+            15: "RDT_A",
+            16: "AVX512F",
+            17: "AVX512DQ",
+            18: "RDSEED",
+            19: "ADX",
+            20: "SMAP",
+            21: "AVX512IFMA",
+            23: "CLFLUSHOPT",
+            24: "CLWB",
+            26: "AVX512PF",
+            27: "AVX512ER",
+            28: "AVX512CD",
+            29: "SHA_NI",
+            30: "AVX512BW",
+            31: "AVX512VL",
+        },
+        "ecx": {
+            0: "PREFETCHWT1",
+            1: "AVX512VBMI",
+            2: "UMIP",
+            3: "PKU",
+            4: "OSPKE",
+            6: "AVX512_VBMI2",
+            8: "GFNI",
+            9: "VAES",
+            10: "VPCLMULQDQ",
+            11: "AVX512_VNNI",
+            12: "AVX512_BITALG",
+            14: "AVX512_VPOPCNTDQ",
+            16: "LA57",
+            22: "RDPID",
+        },
+        "edx": {
+            2: "AVX512_4VNNIW",
+            3: "AVX512_4FMAPS",
+            8: "AVX512_VP2INTERSECT",
+            14: "SERIALIZE",
+            15: "HYBRID",
+            16: "TSXLDTRK",
+            22: "AMX_BF16",
+            23: "AVX512_FP16",
+            24: "AMX_TILE",
+            25: "AMX_INT8",
+        },
+    },
+    (7, 1): {
+        "eax": {
+            4: "AVX_VNNI",
+            5: "AVX512_BF16",
+            21: "AMX_FP16",
+            23: "AVX_IFMA",
+        },
+        "edx": {
+            4: "AVX_VNNI_INT8",
+            5: "AVX_NE_CONVERT",
+            8: "AMX_COMPLEX",
+            19: "AVX10",
+            21: "APX_F",
+        },
+    },
+    # AMD
+    (0x80000001, 0): {
+        "edx": {
+            11: "SYSCALL",
+            19: "MP",
+            20: "NX",
+            22: "MMXEXT",
+            25: "FXSR_OPT",
+            26: "PDPE1GB",
+            27: "RDTSCP",
+            29: "LM",
+            30: "3DNOWEXT",
+            31: "3DNOW",
+        },
+        "ecx": {
+            0: "LAHF_LM",
+            1: "CMP_LEGACY",
+            2: "SVM",
+            3: "EXTAPIC",
+            4: "CR8_LEGACY",
+            5: "ABM",
+            6: "SSE4A",
+            7: "MISALIGNSSE",
+            8: "3DNOWPREFETCH",
+            9: "OSVW",
+            10: "IBS",
+            11: "XOP",
+            12: "SKINIT",
+            13: "WDT",
+            15: "LWP",
+            16: "FMA4",
+            17: "TCE",
+            19: "NODEID_MSR",
+            21: "TBM",
+            22: "TOPOEXT",
+            23: "PERFCTR_CORE",
+            24: "PERFCTR_NB",
+            26: "BPEXT",
+            27: "PTSC",
+            28: "PERFCTR_LLC",
+            29: "MWAITX",
+        },
+    },
+}
+
+#: All features names
+_FEATURES_NAMES = frozenset(
+    name
+    for registers in _FEATURE_BITS.values()
+    for features in registers.values()
+    for name in features.values()
+) | frozenset(f"AVX10_{version}" for version in (1, 2))
+
+#: AVX10 CPUID leaf, EBX bits 0-7 contain the AVX10 converged ISA version
+_AVX10_LEAF = (0x24, 0)
+
+#: XCR0 registers states bits: SSE (XMM), AVX (YMM)
+_XCR0_AVX = 0b110
+
+#: XCR0 registers states bits: AVX, AVX-512 opmask, ZMM_Hi256, Hi16_ZMM
+_XCR0_AVX512 = _XCR0_AVX | 0b11100000
+
+#: XCR0 registers states bits: AMX XTILECFG, XTILEDATA
+_XCR0_AMX = 0b11 << 17
+
+#: Linux "/proc/cpuinfo" flags with names different from features names
+_LINUX_FLAGS = {"pni": "SSE3", "dts": "DS", "hybrid_cpu": "HYBRID"}
+
+#: Linux "cpufeatures.h" words matching CPUID registers: {word: (leaf, register)}
+_LINUX_WORDS = {
+    0: ((1, 0), "edx"),
+    1: ((0x80000001, 0), "edx"),
+    4: ((1, 0), "ecx"),
+    6: ((0x80000001, 0), "ecx"),
+    9: ((7, 0), "ebx"),
+    12: ((7, 1), "eax"),
+    16: ((7, 0), "ecx"),
+    18: ((7, 0), "edx"),
+}
+
+#: Microarchitectures names (GCC/Clang "-march" values) from CPU family and model
+#: {(vendor, family): ((first model, last model, name), ...)}
+_MICROARCHITECTURES = {
+    ("GenuineIntel", 6): (
+        (0x1A, 0x1A, "nehalem"),
+        (0x1E, 0x1F, "nehalem"),
+        (0x25, 0x25, "westmere"),
+        (0x2A, 0x2A, "sandybridge"),
+        (0x2C, 0x2C, "westmere"),
+        (0x2D, 0x2D, "sandybridge"),
+        (0x2E, 0x2E, "nehalem"),
+        (0x2F, 0x2F, "westmere"),
+        (0x3A, 0x3A, "ivybridge"),
+        (0x3C, 0x3C, "haswell"),
+        (0x3D, 0x3D, "broadwell"),
+        (0x3E, 0x3E, "ivybridge"),
+        (0x3F, 0x3F, "haswell"),
+        (0x45, 0x46, "haswell"),
+        (0x47, 0x47, "broadwell"),
+        (0x4E, 0x4E, "skylake"),
+        (0x4F, 0x4F, "broadwell"),
+        (0x55, 0x55, "skylake-avx512"),
+        (0x56, 0x56, "broadwell"),
+        (0x5C, 0x5C, "goldmont"),
+        (0x5E, 0x5E, "skylake"),
+        (0x5F, 0x5F, "goldmont"),
+        (0x66, 0x66, "cannonlake"),
+        (0x6A, 0x6A, "icelake-server"),
+        (0x6C, 0x6C, "icelake-server"),
+        (0x7A, 0x7A, "goldmont-plus"),
+        (0x7D, 0x7E, "icelake-client"),
+        (0x86, 0x86, "tremont"),
+        (0x8C, 0x8D, "tigerlake"),
+        (0x8E, 0x8E, "skylake"),
+        (0x8F, 0x8F, "sapphirerapids"),
+        (0x96, 0x96, "tremont"),
+        (0x97, 0x97, "alderlake"),
+        (0x9A, 0x9A, "alderlake"),
+        (0x9C, 0x9C, "tremont"),
+        (0x9E, 0x9E, "skylake"),
+        (0xA5, 0xA6, "skylake"),
+        (0xA7, 0xA7, "rocketlake"),
+        (0xAA, 0xAA, "meteorlake"),
+        (0xAC, 0xAC, "meteorlake"),
+        (0xAD, 0xAE, "graniterapids"),
+        (0xB7, 0xB7, "alderlake"),
+        (0xBA, 0xBA, "alderlake"),
+        (0xBF, 0xBF, "alderlake"),
+        (0xCF, 0xCF, "emeraldrapids"),
+    ),
+    ("AuthenticAMD", 0x15): (
+        (0x00, 0x01, "bdver1"),
+        (0x02, 0x02, "bdver2"),
+        (0x03, 0x0F, "bdver1"),
+        (0x10, 0x2F, "bdver2"),
+        (0x30, 0x4F, "bdver3"),
+        (0x60, 0x7F, "bdver4"),
+    ),
+    ("AuthenticAMD", 0x16): ((0x00, 0xFF, "btver2"),),
+    ("AuthenticAMD", 0x17): ((0x00, 0x2F, "znver1"), (0x30, 0xFF, "znver2")),
+    ("AuthenticAMD", 0x19): (
+        (0x00, 0x0F, "znver3"),
+        (0x10, 0x1F, "znver4"),
+        (0x20, 0x5F, "znver3"),
+        (0x60, 0xAF, "znver4"),
+    ),
+    ("AuthenticAMD", 0x1A): ((0x00, 0xFF, "znver5"),),
+    ("HygonGenuine", 0x18): ((0x00, 0xFF, "znver1"),),
+}
+
+#: Microarchitectures sharing the same model, identified by features
+#: {name: ((features, name), ...)}
+_MICROARCHITECTURES_FEATURES = {
+    "skylake-avx512": (
+        (("AVX512_BF16",), "cooperlake"),
+        (("AVX512_VNNI",), "cascadelake"),
+    ),
+}
+
+#: x86-64 psABI microarchitecture levels features
+_X86_64_V1 = frozenset(("CMOV", "CX8", "FPU", "FXSR", "MMX", "SSE", "SSE2", "SYSCALL"))
+_X86_64_V2 = _X86_64_V1 | frozenset(
+    ("CX16", "LAHF_LM", "POPCNT", "SSE3", "SSE4_1", "SSE4_2", "SSSE3")
+)
+_X86_64_V3 = _X86_64_V2 | frozenset(
+    ("AVX", "AVX2", "BMI1", "BMI2", "F16C", "FMA", "ABM", "MOVBE", "OSXSAVE")
+)
+_X86_64_V4 = _X86_64_V3 | frozenset(
+    ("AVX512F", "AVX512BW", "AVX512CD", "AVX512DQ", "AVX512VL")
+)
+
+#: Microarchitectures instructions sets, based on x86-64 levels without "SYSCALL" that
+#: Intel CPUs only report in 64-bit mode
+_MARCH_V2 = _X86_64_V2 - {"SYSCALL"}
+_MARCH_V3 = _X86_64_V3 - {"SYSCALL"}
+_MARCH_V4 = _X86_64_V4 - {"SYSCALL"}
+_MARCH_ICELAKE = _MARCH_V4 | {
+    "AVX512IFMA",
+    "AVX512VBMI",
+    "AVX512_VBMI2",
+    "AVX512_VNNI",
+    "AVX512_BITALG",
+    "AVX512_VPOPCNTDQ",
+    "GFNI",
+}
+_MARCH_SAPPHIRERAPIDS = _MARCH_ICELAKE | {"AVX512_BF16", "AVX512_FP16", "AVX_VNNI"}
+_MARCH_BDVER1 = _MARCH_V2 | {"AVX", "SSE4A", "XOP", "FMA4", "ABM"}
+_MARCH_BDVER2 = _MARCH_BDVER1 | {"FMA", "F16C", "BMI1", "TBM"}
+_MARCH_ZNVER1 = _MARCH_V3 | {"SSE4A"}
+_MARCH_ZNVER4 = _MARCH_ZNVER1 | _MARCH_ICELAKE | {"AVX512_BF16"}
+
+#: Instructions sets used by code generated for microarchitectures ("-march").
+#: Instructions only available with intrinsics (Like AES or AMX) are not included.
+#: {name: features}
+MICROARCHITECTURES_ISA = {
+    "nehalem": _MARCH_V2,
+    "westmere": _MARCH_V2,
+    "sandybridge": _MARCH_V2 | {"AVX"},
+    "ivybridge": _MARCH_V2 | {"AVX", "F16C"},
+    "haswell": _MARCH_V3,
+    "broadwell": _MARCH_V3,
+    "skylake": _MARCH_V3,
+    "skylake-avx512": _MARCH_V4,
+    "cascadelake": _MARCH_V4 | {"AVX512_VNNI"},
+    "cooperlake": _MARCH_V4 | {"AVX512_VNNI", "AVX512_BF16"},
+    "cannonlake": _MARCH_V4 | {"AVX512IFMA", "AVX512VBMI"},
+    "icelake-client": _MARCH_ICELAKE,
+    "icelake-server": _MARCH_ICELAKE,
+    "tigerlake": _MARCH_ICELAKE,
+    "rocketlake": _MARCH_ICELAKE,
+    "sapphirerapids": _MARCH_SAPPHIRERAPIDS,
+    "emeraldrapids": _MARCH_SAPPHIRERAPIDS,
+    "graniterapids": _MARCH_SAPPHIRERAPIDS,
+    "alderlake": _MARCH_V3 | {"AVX_VNNI", "GFNI"},
+    "meteorlake": _MARCH_V3 | {"AVX_VNNI", "GFNI"},
+    "goldmont": _MARCH_V2 | {"MOVBE"},
+    "goldmont-plus": _MARCH_V2 | {"MOVBE"},
+    "tremont": _MARCH_V2 | {"MOVBE", "GFNI"},
+    "bdver1": _MARCH_BDVER1,
+    "bdver2": _MARCH_BDVER2,
+    "bdver3": _MARCH_BDVER2,
+    "bdver4": _MARCH_BDVER2 | {"AVX2", "BMI2", "MOVBE"},
+    "btver2": _MARCH_V2 | {"SSE4A", "ABM", "AVX", "BMI1", "F16C", "MOVBE"},
+    "znver1": _MARCH_ZNVER1,
+    "znver2": _MARCH_ZNVER1,
+    "znver3": _MARCH_ZNVER1,
+    "znver4": _MARCH_ZNVER4,
+    "znver5": _MARCH_ZNVER4 | {"AVX_VNNI"},
+}
+
+#: CPUID caches types: {type: name suffix}
+_CACHE_TYPES = {1: "d", 2: "i", 3: ""}
+
+#: CPUID topology levels types
+_TOPOLOGY_SMT = 1
+
+#: CPUID hybrid CPU cores types
+_CORE_TYPES = {0x20: "efficiency", 0x40: "performance"}
 
 
 class Processor(_ProcessorBase):
     """x86-32 CPU."""
 
+    _cached_properties = _ProcessorBase._cached_properties + (
+        "detection_backend",
+        "cpuid_highest_function",
+        "cpuid_highest_extended_function",
+        "cpuid_signature",
+        "os_supports_xsave",
+        "xcr0",
+    )
+
     def __init__(self, current_machine=False):
         _ProcessorBase.__init__(self, current_machine)
         self._default["os_supports_xsave"] = False
+        self._default["cpuid_highest_function"] = 0
         self._default["cpuid_highest_extended_function"] = 0
+        self._default["cpuid_signature"] = 0
+        self._default["family"] = 0
+        self._default["model"] = 0
+        self._default["stepping"] = 0
+        self._default["microarchitecture"] = ""
+        self._default["core_types"] = {}
+        self._default["detection_backend"] = ""
+        self._default["xcr0"] = 0
+        self._default["os_supports_avx"] = False
+        self._default["os_supports_avx512"] = False
+        self._default["os_supports_amx"] = False
+
+    @_ProcessorBase._memoized_property
+    def detection_backend(self):
+        """
+        Backend used to detect the current machine CPU.
+
+        "cpuid" runs the CPUID instruction from an executable memory page. "os" reads
+        information provided by the operating system (Linux only), without code
+        generation.
+
+        The backend is selected with the "cpu_detection" configuration value. In
+        "auto", "cross_check" and "per_core" modes, "cpuid" is used if executable
+        memory can be allocated, else "os".
+
+        Returns
+        -------
+        str
+            Backend name.
+        """
+        if not self.current_machine:
+            return None
+
+        mode = self._read("cpu_detection")
+        if mode in ("cpuid", "os"):
+            return mode
+
+        if self._read("cpuid_available"):
+            return "cpuid"
+        elif self._read("system") == "Linux":
+            return "os"
+        raise RuntimeError("CPUID can't run on this machine")
+
+    @_ProcessorBase._memoized_property
+    def cpuid_highest_function(self):
+        """
+        CPUID highest function.
+
+        Returns
+        -------
+        int
+            Related EAX value for CPUID.
+        """
+        if not self.current_machine or self.detection_backend == "os":
+            return None
+
+        return self._cpuid(((0, 0),))[0].eax
 
     @_ProcessorBase._memoized_property
     def cpuid_highest_extended_function(self):
@@ -23,10 +482,129 @@ class Processor(_ProcessorBase):
         int
             Related EAX value for CPUID.
         """
+        if not self.current_machine or self.detection_backend == "os":
+            return None
+
+        return self._cpuid(((0x80000000, 0),))[0].eax
+
+    @_ProcessorBase._memoized_property
+    def cpuid_signature(self):
+        """
+        CPUID processor signature (Stepping, model and family).
+
+        Returns
+        -------
+        int
+            Related EAX value for CPUID leaf 1.
+        """
+        if not self.current_machine or self.detection_backend == "os":
+            return None
+
+        return self._cpuid(((1, 0),))[0].eax
+
+    def _signature_field(self, name):
+        """
+        Get a field of the processor signature.
+
+        Parameters
+        ----------
+        name : str
+            "family", "model" or "stepping".
+
+        Returns
+        -------
+        int or None
+            Value. None if not available.
+        """
+        if not self.current_machine:
+            return None
+
+        if self.detection_backend == "os":
+            value = self._cpuinfo().get("cpu family" if name == "family" else name)
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return None
+
+        signature = self.cpuid_signature
+        family = (signature >> 8) & 0xF
+        if name == "stepping":
+            return signature & 0xF
+
+        elif name == "model":
+            model = (signature >> 4) & 0xF
+            if family in (6, 0xF):
+                model += (signature >> 12) & 0xF0
+            return model
+
+        if family == 0xF:
+            family += (signature >> 20) & 0xFF
+        return family
+
+    @_ProcessorBase._memoized_property
+    def family(self):
+        """
+        CPU family.
+
+        Returns
+        -------
+        int
+            Family.
+        """
+        return self._signature_field("family")
+
+    @_ProcessorBase._memoized_property
+    def model(self):
+        """
+        CPU model, in its family.
+
+        Returns
+        -------
+        int
+            Model.
+        """
+        return self._signature_field("model")
+
+    @_ProcessorBase._memoized_property
+    def stepping(self):
+        """
+        CPU stepping (Revision of the model).
+
+        Returns
+        -------
+        int
+            Stepping.
+        """
+        return self._signature_field("stepping")
+
+    @_ProcessorBase._memoized_property
+    def microarchitecture(self):
+        """
+        CPU microarchitecture.
+
+        Names are GCC and Clang "-march" values.
+
+        Returns
+        -------
+        str
+            Microarchitecture. Empty if unknown.
+        """
         if not self.current_machine:
             return None
 
-        return Cpuid(0x80000000).eax
+        model = self.model
+        for first, last, name in _MICROARCHITECTURES.get(
+            (self.vendor, self.family), ()
+        ):
+            if first <= model <= last:
+                break
+        else:
+            return None
+
+        for features, variant in _MICROARCHITECTURES_FEATURES.get(name, ()):
+            if self["features"].has_all(features):
+                return variant
+        return name
 
     @_ProcessorBase._memoized_property
     def vendor(self):
@@ -41,7 +619,10 @@ class Processor(_ProcessorBase):
         if not self.current_machine:
             return None
 
-        reg = Cpuid()
+        if self.detection_backend == "os":
+            return self._cpuinfo().get("vendor_id")
+
+        reg = self._cpuid(((0, 0),))[0]
         return Cpuid.registers_to_str(reg.ebx, reg.edx, reg.ecx)
 
     @_ProcessorBase._memoized_property
@@ -57,12 +638,16 @@ class Processor(_ProcessorBase):
         if not self.current_machine:
             return None
 
+        if self.detection_backend == "os":
+            return self._cpuinfo().get("model name")
+
         if self.cpuid_highest_extended_function < 0x80000004:
             return None
 
         brand_list = []
-        for eax in (0x80000002, 0x80000003, 0x80000004):
-            reg = Cpuid(eax)
+        for reg in self._cpuid(
+            (eax, 0) for eax in (0x80000002, 0x80000003, 0x80000004)
+        ):
             brand_list += [reg.eax, reg.ebx, reg.ecx, reg.edx]
         return Cpuid.registers_to_str(*brand_list)
 
@@ -73,7 +658,7 @@ class Processor(_ProcessorBase):
 
         Returns
         -------
-        list of str
+        compilertools.processors.Features
             Flags names.
 
         References
@@ -89,187 +674,351 @@ class Processor(_ProcessorBase):
         if not self.current_machine:
             return None
 
-        # Feature bits description
-        # feature_bits_desc: {(eax, ecx): registers_dict}
-        # registers_dict: {register_name: feature_dict}
-        # feature_dict: {bit: feature}
-        feature_bits_desc = {
-            # Intel
-            (1, 0): {
-                "edx": {
-                    0: "FPU",
-                    1: "VME",
-                    2: "DE",
-                    3: "PSE",
-                    4: "TSC",
-                    5: "MSR",
-                    6: "PAE",
-                    7: "MCE",
-                    8: "CX8",
-                    9: "APIC",
-                    11: "SEP",
-                    12: "MTRR",
-                    13: "PGE",
-                    14: "MCA",
-                    15: "CMOV",
-                    16: "PAT",
-                    17: "PSE36",
-                    18: "PN",
-                    19: "CLFLUSH",
-                    21: "DS",
-                    22: "ACPI",
-                    23: "MMX",
-                    24: "FXSR",
-                    25: "SSE",
-                    26: "SSE2",
-                    27: "SS",
-                    28: "HT",
-                    29: "TM",
-                    30: "IA64",
-                    31: "PBE",
-                },
-                "ecx": {
-                    0: "SSE3",
-                    1: "PCLMULQDQ",
-                    2: "DTES64",
-                    3: "MONITOR",
-                    4: "DS_CPL",
-                    5: "VMX",
-                    6: "SMX",
-                    7: "EST",
-                    8: "TM2",
-                    9: "SSSE3",
-                    10: "CID",
-                    11: "SDBG",
-                    12: "FMA",
-                    13: "CX16",
-                    14: "XTPR",
-                    15: "PDCM",
-                    17: "PCID",
-                    18: "DCA",
-                    19: "SSE4_1",
-                    20: "SSE4_2",
-                    21: "X2APIC",
-                    22: "MOVBE",
-                    23: "POPCNT",
-                    24: "TSC_DEADLINE_TIMER",
-                    25: "AES",
-                    26: "XSAVE",
-                    27: "OSXSAVE",
-                    28: "AVX",
-                    29: "F16C",
-                    30: "RDRAND",
-                    31: "HYPERVISOR",
-                },
-            },
-            # Intel structured extended
-            (7, 0): {
-                "ebx": {
-                    0: "FSGSBASE",
-                    1: "TSC_ADJUST",
-                    3: "BMI1",
-                    4: "HLE",
-                    5: "AVX2",
-                    7: "SMEP",
-                    8: "BMI2",
-                    9: "ERMS",
-                    10: "INVPCID",
-                    11: "RTM",
-                    12: "CQM",
-                    14: "MPX",
-                    15: "RDT_A",
-                    16: "AVX512F",
-                    17: "AVX512DQ",
-                    18: "RDSEED",
-                    19: "ADX",
-                    20: "SMAP",
-                    21: "AVX512IFMA",
-                    23: "CLFLUSHOPT",
-                    24: "CLWB",
-                    26: "AVX512PF",
-                    27: "AVX512ER",
-                    28: "AVX512CD",
-                    29: "SHA_NI",
-                    30: "AVX512BW",
-                    31: "AVX512VL",
-                },
-                "ecx": {
-                    0: "PREFETCHWT1",
-                    1: "AVX512VBMI",
-                    2: "UMIP",
-                    3: "PKU",
-                    4: "OSPKE",
-                    6: "AVX512_VBMI2",
-                    8: "GFNI",
-                    9: "VAES",
-                    10: "VPCLMULQDQ",
-                    11: "AVX512_VNNI",
-                    12: "AVX512_BITALG",
-                    14: "AVX512_VPOPCNTDQ",
-                    16: "LA57",
-                    22: "RDPID",
-                },
-                "edx": {2: "AVX512_4VNNIW", 3: "AVX512_4FMAPS"},
-            },
+        if self.detection_backend == "os":
+            return _Features(self._os_features())
+
+        features = _Features(self._cpuid_features())
+
+        if self._read("cpu_detection") == "cross_check":
+            differences = self.cross_check()
+            if any(differences.values()) and _CONFIG.get("logging", True):
+                from logging import getLogger
+
+                getLogger("compilertools").warning(
+                    "Compilertools: CPU features detected with CPUID and from the OS "
+                    "differ. Only with CPUID: %s. Only from the OS: %s.",
+                    ", ".join(sorted(differences["cpuid"])) or "None",
+                    ", ".join(sorted(differences["os"])) or "None",
+                )
+
+        return features
+
+    def cross_check(self):
+        """
+        Compare features detected with CPUID and from the operating system.
+
+        Returns
+        -------
+        dict
+            "cpuid" key contains features only detected with CPUID, "os" key contains
+            features only detected from the operating system. None if not the current
+            machine.
+        """
+        if not self.current_machine:
+            return None
+
+        cpuid_features = self._cpuid_features()
+        os_features = self._os_features()
+        return {
+            "cpuid": cpuid_features - os_features,
+            "os": os_features - cpuid_features,
         }
 
-        if self.cpuid_highest_extended_function >= 0x80000001:
-            # AMD
-            feature_bits_desc[(0x80000001, 0)] = {
-                "edx": {
-                    11: "SYSCALL",
-                    19: "MP",
-                    20: "NX",
-                    22: "MMXEXT",
-                    25: "FXSR_OPT",
-                    26: "PDPE1GB",
-                    27: "RDTSCP",
-                    29: "LM",
-                    30: "3DNOWEXT",
-                    31: "3DNOW",
-                },
-                "ecx": {
-                    0: "LAHF_LM",
-                    1: "CMP_LEGACY",
-                    2: "SVM",
-                    3: "EXTAPIC",
-                    4: "CR8_LEGACY",
-                    5: "ABM",
-                    6: "SSE4A",
-                    7: "MISALIGNSSE",
-                    8: "3DNOWPREFETCH",
-                    9: "OSVW",
-                    10: "IBS",
-                    11: "XOP",
-                    12: "SKINIT",
-                    13: "WDT",
-                    15: "LWP",
-                    16: "FMA4",
-                    17: "TCE",
-                    19: "NODEID_MSR",
-                    21: "TBM",
-                    22: "TOPOEXT",
-                    23: "PERFCTR_CORE",
-                    24: "PERFCTR_NB",
-                    26: "BPEXT",
-                    27: "PTSC",
-                    28: "PERFCTR_LLC",
-                    29: "MWAITX",
-                },
-            }
+    def _cpuid_features(self):
+        """
+        Features flags from CPUID.
+
+        Returns
+        -------
+        set of str
+            Flags names.
+        """
+        # Leaves are only available up to the highest (extended) function. Leaf 7
+        # returns zeros for unsupported subleaves.
+        highest = self.cpuid_highest_function
+        highest_extended = self.cpuid_highest_extended_function
+        leaves = [
+            leaf
+            for leaf in _FEATURE_BITS
+            if leaf[0] <= (highest if leaf[0] < 0x80000000 else highest_extended)
+        ]
+        if _AVX10_LEAF[0] <= highest:
+            leaves.append(_AVX10_LEAF)
+
+        # Only features available on all CPUs are kept
+        flags = None
+        for registers in self._cpuid_all_cpus(leaves):
+            cpu_flags = _decode_features(leaves, registers)
+            flags = cpu_flags if flags is None else flags & cpu_flags
+        return flags
+
+    def _os_features(self):
+        """
+        Features flags from the operating system.
+
+        Features are read from "/proc/cpuinfo" flags, or from
+        "/sys/devices/system/cpu/modalias" if not available, or from the
+        "getauxval(AT_HWCAP)" value (Only CPUID leaf 1 EDX register) as last resort.
+
+        Returns
+        -------
+        set of str
+            Flags names.
+        """
+        from compilertools.processors._linux import AT_HWCAP
 
         flags = set()
         add_flag = flags.add
-        for eax, ecx in feature_bits_desc:
-            reg = Cpuid(eax, ecx)
-            reg_desc = feature_bits_desc[(eax, ecx)]
-            for exx in reg_desc:
-                bits = getattr(reg, exx)
-                reg_exx = reg_desc[exx]
-                for bit in reg_exx:
-                    if ((1 << bit) & bits) != 0:
-                        add_flag(reg_exx[bit])
-        return flags
+        cpu_flags = self._cpuinfo().get("flags")
+        modalias = self._read("sysfs", "modalias") if cpu_flags is None else None
+
+        if cpu_flags is not None:
+            for flag in cpu_flags.split():
+                add_flag(_LINUX_FLAGS.get(flag, flag.upper()))
+
+        elif modalias and ":feature:" in modalias:
+            for number in modalias.split(":feature:", 1)[1].split(","):
+                if not number:
+                    continue
+                word, bit = divmod(int(number, 16), 32)
+                try:
+                    leaf, exx = _LINUX_WORDS[word]
+                    add_flag(_FEATURE_BITS[leaf][exx][bit])
+                except KeyError:
+                    continue
+
+        else:
+            bits = self._read("getauxval", AT_HWCAP) or 0
+            reg_exx = _FEATURE_BITS[(1, 0)]["edx"]
+            for bit in reg_exx:
+                if ((1 << bit) & bits) != 0:
+                    add_flag(reg_exx[bit])
+
+        # Linux enables XSAVE if supported, but hides the "OSXSAVE" flag
+        if "XSAVE" in flags:
+            add_flag("OSXSAVE")
+
+        return flags & _FEATURES_NAMES
+
+    @_ProcessorBase._memoized_property
+    def cache_hierarchy(self):
+        """
+        CPU caches from CPUID.
+
+        Caches are read from leaf 0x8000001D on AMD and from leaf 4 on Intel. With
+        the "os" detection backend or if not available, they are read from sysfs.
+
+        Returns
+        -------
+        dict
+            Keys are caches names ("L1d", "L1i", "L2", "L3"), values are dict with
+            "size" (bytes), "line_size" (bytes) and "associativity" (ways) keys.
+            Empty if not available.
+        """
+        if not self.current_machine:
+            return None
+
+        if self.detection_backend != "os":
+            if (
+                "TOPOEXT" in self["features"]
+                and self.cpuid_highest_extended_function >= 0x8000001D
+            ):
+                leaf = 0x8000001D
+            elif self.cpuid_highest_function >= 4:
+                leaf = 4
+            else:
+                leaf = None
+
+            caches = {}
+            if leaf is not None:
+                # Smallest caches are kept if they differ between CPUs
+                for registers in self._cpuid_all_cpus(
+                    [(leaf, index) for index in range(8)]
+                ):
+                    for name, cache in _decode_caches(registers).items():
+                        if name not in caches or cache["size"] < caches[name]["size"]:
+                            caches[name] = cache
+            if caches:
+                return caches
+
+        return self._read("caches")
+
+    @_ProcessorBase._memoized_property
+    def core_types(self):
+        """
+        Cores types of hybrid CPUs, from CPUID leaf 0x1A.
+
+        CPUID is run on each CPU allowed for the current process (Linux only).
+
+        Returns
+        -------
+        dict
+            Keys are cores types ("performance", "efficiency"), values are sorted
+            lists of CPUs numbers. Empty if not an hybrid CPU or not available.
+        """
+        if (
+            not self.current_machine
+            or self.detection_backend == "os"
+            or "HYBRID" not in self["features"]
+            or self.cpuid_highest_function < 0x1A
+        ):
+            return None
+
+        try:
+            per_cpu = self._cpuid_each_cpu([(0x1A, 0)])
+        except (AttributeError, OSError):
+            return None
+
+        core_types = {}
+        for cpu in sorted(per_cpu):
+            core_type = _CORE_TYPES.get(per_cpu[cpu][0].eax >> 24)
+            if core_type:
+                core_types.setdefault(core_type, []).append(cpu)
+        return core_types
+
+    def _cpuid_all_cpus(self, leaves):
+        """
+        Run CPUID on all CPUs in "per_core" detection mode, else on the current CPU.
+
+        Parameters
+        ----------
+        leaves : list of tuple of int
+            (EAX, ECX) input values.
+
+        Returns
+        -------
+        list of list of Cpuid
+            Results for each leaf, for each CPU.
+        """
+        if self._read("cpu_detection") == "per_core":
+            try:
+                return list(self._cpuid_each_cpu(leaves).values()) or [
+                    self._cpuid(leaves)
+                ]
+            except (AttributeError, OSError):
+                pass
+        return [self._cpuid(leaves)]
+
+    def _cpuid(self, leaves):
+        """
+        Run CPUID, or get its results from the replayed profile.
+
+        Parameters
+        ----------
+        leaves : iterable of tuple of int
+            (EAX, ECX) input values.
+
+        Returns
+        -------
+        list of Cpuid
+            Results for each leaf. Leaves not in the replayed profile returns zeros.
+        """
+        return self._cpuid_profile(leaves, "cpuid", Cpuid.batch)
+
+    def _cpuid_each_cpu(self, leaves):
+        """
+        Run CPUID on each allowed CPU, or get its results from the replayed profile.
+
+        Parameters
+        ----------
+        leaves : list of tuple of int
+            (EAX, ECX) input values.
+
+        Returns
+        -------
+        dict
+            Keys are CPUs numbers, values are lists of Cpuid for each leaf.
+        """
+        reads = self._reads
+        if reads is None:
+            return _cpuid_per_cpu(leaves)
+
+        if self._replay:
+            cpus = reads.get("cpus") or ()
+        else:
+            results = _cpuid_per_cpu(leaves)
+            cpus = reads["cpus"] = sorted(results)
+
+        return {
+            cpu: self._cpuid_profile(
+                leaves, f"cpu{cpu}:cpuid", lambda _, cpu=cpu: results[cpu]
+            )
+            for cpu in cpus
+        }
+
+    def _cpuid_profile(self, leaves, prefix, run):
+        """
+        Run CPUID with results recorded in the profile, or replayed from it.
+
+        Parameters
+        ----------
+        leaves : iterable of tuple of int
+            (EAX, ECX) input values.
+        prefix : str
+            Profile keys prefix.
+        run : callable
+            Function running CPUID for leaves.
+
+        Returns
+        -------
+        list of Cpuid
+            Results for each leaf.
+        """
+        leaves = list(leaves)
+        reads = self._reads
+        if reads is None:
+            return run(leaves)
+
+        keys = [f"{prefix}:{eax:#x}:{ecx}" for eax, ecx in leaves]
+        if self._replay:
+            return [_Registers(*(reads.get(key) or ())) for key in keys]
+
+        results = run(leaves)
+        for key, reg in zip(keys, results):
+            reads[key] = [reg.eax, reg.ebx, reg.ecx, reg.edx]
+        return results
+
+    def _cpuinfo(self):
+        """
+        Linux "/proc/cpuinfo" first processor block.
+
+        Returns
+        -------
+        dict
+            Content. Empty if not available.
+        """
+        return self._read("cpuinfo") or {}
+
+    @_ProcessorBase._memoized_property
+    def topology(self):
+        """
+        CPU topology from CPUID.
+
+        Threads per core and per package are read from leaf 0x1F or 0xB. With the
+        "os" detection backend or if not available, topology is read from sysfs.
+
+        Returns
+        -------
+        dict
+            "packages", "cores" (Physical cores) and "threads" (Logical CPUs)
+            counts. Empty if not available.
+        """
+        if not self.current_machine:
+            return None
+
+        highest = self.cpuid_highest_function
+        if self.detection_backend != "os" and highest >= 0xB:
+            per_core = per_package = 0
+            for reg in self._cpuid(
+                (0x1F if highest >= 0x1F else 0xB, index) for index in range(6)
+            ):
+                level_type = (reg.ecx >> 8) & 0xFF
+                if not level_type:
+                    break
+                # Logical processors at this level
+                per_package = reg.ebx & 0xFFFF
+                if level_type == _TOPOLOGY_SMT:
+                    per_core = per_package
+
+            if per_core and per_package:
+                threads = self._read("cpu_count") or per_package
+                return {
+                    "packages": -(-threads // per_package),
+                    "cores": max(threads // per_core, 1),
+                    "threads": threads,
+                }
+
+        return self._read("topology")
 
     @_ProcessorBase._memoized_property
     def os_supports_xsave(self):
@@ -286,134 +1035,271 @@ class Processor(_ProcessorBase):
 
         return "XSAVE" in self["features"] and "OSXSAVE" in self["features"]
 
+    @_ProcessorBase._memoized_property
+    def xcr0(self):
+        """
+        XCR0 extended control register value from XGETBV.
 
-class Cpuid:
-    """
-    Gets Processor CPUID.
+        Bits are set for each registers state saved by the OS on context switches.
 
-    Parameters
-    ----------
-    eax_value : int
-        EAX register value
-    ecx_value : int
-        ECX register value
-    """
+        Returns
+        -------
+        int
+            Register value. 0 if not available.
+        """
+        if (
+            not self.current_machine
+            or self.detection_backend == "os"
+            or not self.os_supports_xsave
+        ):
+            return None
 
-    def __init__(self, eax_value=0, ecx_value=0):
-        bytecode = []
-        for reg, value in ((0x0, eax_value), (0x1, ecx_value)):
-            if value == 0:
-                # Sets to 0 (XOR reg, reg)
-                bytecode += (
-                    # XOR
-                    b"\x31",
-                    # reg, reg
-                    (0b11000000 | reg | (reg << 3)).to_bytes(1, "little"),
-                )
-            else:
-                # Sets other value (MOV reg, value)
-                bytecode += (
-                    # MOV reg,
-                    (0b10111000 | reg).to_bytes(1, "little"),
-                    # Value
-                    value.to_bytes(4, "little"),
-                )
+        return self._read("xgetbv", 0)
 
-        self._bytecode_base = b"".join(
-            bytecode
-            +
-            # CPUID
-            [b"\x0f\xa2"]
-        )
+    def _os_supports_state(self, mask):
+        """
+        Check if the OS saves registers states.
+
+        Parameters
+        ----------
+        mask : int
+            XCR0 bits of registers states.
 
-    def _get_cpuid(self, reg):
+        Returns
+        -------
+        bool or None
+            Supports if True. None if not the current machine.
         """
-        Get the specified register CPUID result.
+        if not self.current_machine or not self.os_supports_xsave:
+            return None
+
+        if self.detection_backend == "os":
+            # Linux hides features if the related states are not enabled
+            return True
+
+        return self.xcr0 & mask == mask
+
+    @_ProcessorBase._memoized_property
+    def os_supports_avx(self):
+        """
+        OS saves AVX registers states (XMM, YMM).
+
+        Returns
+        -------
+        bool
+            Supports if True.
+        """
+        return self._os_supports_state(_XCR0_AVX)
+
+    @_ProcessorBase._memoized_property
+    def os_supports_avx512(self):
+        """
+        OS saves AVX-512 registers states (XMM, YMM, opmask, ZMM).
+
+        Returns
+        -------
+        bool
+            Supports if True.
+        """
+        return self._os_supports_state(_XCR0_AVX512)
+
+    @_ProcessorBase._memoized_property
+    def os_supports_amx(self):
+        """
+        OS saves AMX registers states (Tiles configuration and data).
+
+        On Linux, the permission to use AMX must also be requested by the process
+        before running AMX instructions. This is done on import of a file using
+        them.
+
+        Returns
+        -------
+        bool
+            Supports if True.
+        """
+        return self._os_supports_state(_XCR0_AMX)
+
+    @staticmethod
+    def _read_cpuid_available():
+        """
+        Check if CPUID can run, by running it with no leaves.
+
+        Returns
+        -------
+        bool
+            True if CPUID can run.
+        """
+        try:
+            _run_cpuid(())
+            return True
+        except (RuntimeError, OSError, AttributeError):
+            return False
+
+    @staticmethod
+    def _read_xgetbv(index):
+        """
+        Read an extended control register with XGETBV.
 
         Parameters
         ----------
-        reg : int
-            Register address.
+        index : int
+            Register index.
 
         Returns
         -------
         int
-            Raw CPUID Result as unsigned integer.
-        """
-        from platform import system
-        from ctypes import (
-            c_void_p,
-            c_size_t,
-            c_ulong,
-            c_uint32,
-            c_int,
-            CFUNCTYPE,
-            memmove,
-        )
-
-        bytecode = [self._bytecode_base]
-
-        if reg != 0x0:
-            # MOV EAX, reg
-            bytecode += [
-                # MOV
-                b"\x89",
-                # EAX, reg
-                (0b11000000 | (reg << 3)).to_bytes(1, "little"),
-            ]
-
-        bytecode = b"".join(
-            bytecode
-            +
-            # RET
-            [b"\xc3"]
-        )
-
-        is_windows = system() == "Windows"
-
-        size = len(bytecode)
-        if size < 0x1000:
-            size = 0x1000
+            Register value.
+        """
+        return _run_xgetbv(index)
+
+
+def _decode_features(leaves, registers):
+    """
+    Decode features flags from CPUID results.
+
+    Parameters
+    ----------
+    leaves : list of tuple of int
+        (EAX, ECX) input values.
+    registers : list of Cpuid
+        Results for each leaf.
 
+    Returns
+    -------
+    set of str
+        Flags names.
+    """
+    flags = set()
+    add_flag = flags.add
+    for leaf, reg in zip(leaves, registers):
+        if leaf == _AVX10_LEAF:
+            if "AVX10" in flags:
+                for version in range(1, (reg.ebx & 0xFF) + 1):
+                    add_flag(f"AVX10_{version}")
+            continue
+        reg_desc = _FEATURE_BITS[leaf]
+        for exx in reg_desc:
+            bits = getattr(reg, exx)
+            reg_exx = reg_desc[exx]
+            for bit in reg_exx:
+                if ((1 << bit) & bits) != 0:
+                    add_flag(reg_exx[bit])
+    return flags
+
+
+def _decode_caches(registers):
+    """
+    Decode caches from CPUID leaf 4 or 0x8000001D results.
+
+    Parameters
+    ----------
+    registers : list of Cpuid
+        Results for each subleaf.
+
+    Returns
+    -------
+    dict
+        Caches, like "Processor.cache_hierarchy".
+    """
+    caches = {}
+    for reg in registers:
+        cache_type = reg.eax & 0x1F
+        if cache_type not in _CACHE_TYPES:
+            break
+        ebx = reg.ebx
+        line_size = (ebx & 0xFFF) + 1
+        partitions = ((ebx >> 12) & 0x3FF) + 1
+        ways = (ebx >> 22) + 1
+        caches[f"L{(reg.eax >> 5) & 0x7}{_CACHE_TYPES[cache_type]}"] = {
+            "size": ways * partitions * line_size * (reg.ecx + 1),
+            "line_size": line_size,
+            "associativity": ways,
+        }
+    return caches
+
+
+def _cpuid_per_cpu(leaves):
+    """
+    Run CPUID on each CPU allowed for the current process (Linux only).
+
+    A helper thread is pinned to each CPU in turn, so the calling thread affinity
+    is not changed.
+
+    Parameters
+    ----------
+    leaves : list of tuple of int
+        (EAX, ECX) input values.
+
+    Returns
+    -------
+    dict
+        Keys are CPUs numbers, values are lists of Cpuid for each leaf.
+    """
+    from os import sched_getaffinity, sched_setaffinity
+    from threading import Thread
+
+    cpus = sorted(sched_getaffinity(0))
+    results = {}
+    errors = []
+
+    def run():
+        """Run CPUID on each CPU."""
         try:
-            if is_windows:
-                from ctypes import windll
+            for cpu in cpus:
+                try:
+                    # On Linux, "0" is the calling thread
+                    sched_setaffinity(0, (cpu,))
+                except OSError:
+                    # CPU removed from the allowed CPUs meanwhile
+                    continue
+                results[cpu] = Cpuid.batch(leaves)
+        except Exception as exception:
+            errors.append(exception)
+
+    thread = Thread(target=run, name="compilertools-cpuid", daemon=True)
+    thread.start()
+    thread.join()
+    if errors:
+        raise errors[0]
+    return results
 
-                lib = windll.kernel32
-                valloc = lib.VirtualAlloc
-                valloc.argtypes = [c_void_p, c_size_t, c_ulong, c_ulong]
-                args = (None, size, 0x1000, 0x40)
-            else:
-                from ctypes import cdll
 
-                lib = cdll.LoadLibrary(None)
-                mprotect = lib.mprotect
-                valloc = lib.valloc
-                valloc.argtypes = [c_size_t]
-                args = (c_size_t(size),)
+class Cpuid:
+    """
+    Gets Processor CPUID.
 
-            valloc.restype = c_void_p
-            address = valloc(*args)
-            if address == 0:
-                raise RuntimeError("Failed to allocate memory")
+    Parameters
+    ----------
+    eax_value : int
+        EAX register value
+    ecx_value : int
+        ECX register value
+    """
 
-            if not is_windows:
-                mprotect.restype = c_int
-                mprotect.argtypes = [c_void_p, c_size_t, c_int]
-                if mprotect(address, size, 1 | 2 | 4) != 0:
-                    raise RuntimeError("Failed to memory protect")
+    def __init__(self, eax_value=0, ecx_value=0):
+        self._registers = _run_cpuid(((eax_value, ecx_value),))[0]
 
-            memmove(address, bytecode, size)
+    @classmethod
+    def batch(cls, leaves):
+        """
+        Get CPUID of multiple leaves in a single native call.
 
-            result = CFUNCTYPE(c_uint32)(address)()
+        Parameters
+        ----------
+        leaves : iterable of tuple of int
+            (EAX register value, ECX register value) pairs.
 
-        finally:
-            if is_windows:
-                lib.VirtualFree(c_ulong(address), 0, 0x8000)
-            else:
-                mprotect(address, size, 1 | 2)
-                lib.free(c_void_p(address))
-        return result
+        Returns
+        -------
+        list of Cpuid
+            CPUID results, in the same order as leaves.
+        """
+        results = []
+        for registers in _run_cpuid(leaves):
+            cpuid = cls.__new__(cls)
+            cpuid._registers = registers
+            results.append(cpuid)
+        return results
 
     @property
     def eax(self):
@@ -425,7 +1311,7 @@ class Cpuid:
         int
             Raw EAX register value.
         """
-        return self._get_cpuid(0x0)
+        return self._registers.eax
 
     @property
     def ebx(self):
@@ -437,7 +1323,7 @@ class Cpuid:
         int
             Raw EAX register value.
         """
-        return self._get_cpuid(0x3)
+        return self._registers.ebx
 
     @property
     def ecx(self):
@@ -449,7 +1335,7 @@ class Cpuid:
         int
             Raw EAX register value.
         """
-        return self._get_cpuid(0x1)
+        return self._registers.ecx
 
     @property
     def edx(self):
@@ -461,7 +1347,7 @@ class Cpuid:
         int
             Raw EAX register value.
         """
-        return self._get_cpuid(0x2)
+        return self._registers.edx
 
     @staticmethod
     def registers_to_str(*uints):
@@ -481,3 +1367,301 @@ class Cpuid:
         from struct import pack
 
         return pack(f"<{'I' * len(uints)}", *uints).decode("ASCII").strip("\x00 ")
+
+
+class _Leaf(_Structure):
+    """CPUID input registers."""
+
+    _fields_ = [("eax", _c_uint32), ("ecx", _c_uint32)]
+
+
+class _Registers(_Structure):
+    """CPUID output registers."""
+
+    _fields_ = [
+        ("eax", _c_uint32),
+        ("ebx", _c_uint32),
+        ("ecx", _c_uint32),
+        ("edx", _c_uint32),
+    ]
+
+
+# CPUID routine machine code: "void cpuid(_Leaf *leaves, _Registers *out, size_t n)"
+
+#: x86-64 System V ABI prologue: Move arguments to R10, R11, R8
+_CPUID_PROLOGUE_SYSV = (
+    b"\x49\x89\xfa"  # MOV r10, rdi
+    b"\x49\x89\xf3"  # MOV r11, rsi
+    b"\x49\x89\xd0"  # MOV r8, rdx
+)
+
+#: x86-64 Microsoft ABI prologue: Move arguments to R10, R11, R8
+_CPUID_PROLOGUE_WIN64 = (
+    b"\x49\x89\xca"  # MOV r10, rcx
+    b"\x49\x89\xd3"  # MOV r11, rdx
+)
+
+#: x86-64 routine body: leaves in R10, output in R11, count in R8
+_CPUID_BODY_X86_64 = (
+    b"\x53"  # PUSH rbx
+    b"\x4d\x85\xc0"  # TEST r8, r8
+    b"\x74\x25"  # JZ done
+    # loop:
+    b"\x41\x8b\x02"  # MOV eax, [r10]
+    b"\x41\x8b\x4a\x04"  # MOV ecx, [r10+4]
+    b"\x0f\xa2"  # CPUID
+    b"\x41\x89\x03"  # MOV [r11], eax
+    b"\x41\x89\x5b\x04"  # MOV [r11+4], ebx
+    b"\x41\x89\x4b\x08"  # MOV [r11+8], ecx
+    b"\x41\x89\x53\x0c"  # MOV [r11+12], edx
+    b"\x49\x83\xc2\x08"  # ADD r10, 8
+    b"\x49\x83\xc3\x10"  # ADD r11, 16
+    b"\x49\xff\xc8"  # DEC r8
+    b"\x75\xdb"  # JNZ loop
+    # done:
+    b"\x5b"  # POP rbx
+    b"\xc3"  # RET
+)
+
+#: x86-32 routine (cdecl)
+_CPUID_X86_32 = (
+    b"\x53"  # PUSH ebx
+    b"\x56"  # PUSH esi
+    b"\x57"  # PUSH edi
+    b"\x55"  # PUSH ebp
+    b"\x8b\x74\x24\x14"  # MOV esi, [esp+20]
+    b"\x8b\x7c\x24\x18"  # MOV edi, [esp+24]
+    b"\x8b\x6c\x24\x1c"  # MOV ebp, [esp+28]
+    b"\x85\xed"  # TEST ebp, ebp
+    b"\x74\x1b"  # JZ done
+    # loop:
+    b"\x8b\x06"  # MOV eax, [esi]
+    b"\x8b\x4e\x04"  # MOV ecx, [esi+4]
+    b"\x0f\xa2"  # CPUID
+    b"\x89\x07"  # MOV [edi], eax
+    b"\x89\x5f\x04"  # MOV [edi+4], ebx
+    b"\x89\x4f\x08"  # MOV [edi+8], ecx
+    b"\x89\x57\x0c"  # MOV [edi+12], edx
+    b"\x83\xc6\x08"  # ADD esi, 8
+    b"\x83\xc7\x10"  # ADD edi, 16
+    b"\x4d"  # DEC ebp
+    b"\x75\xe5"  # JNZ loop
+    # done:
+    b"\x5d"  # POP ebp
+    b"\x5f"  # POP edi
+    b"\x5e"  # POP esi
+    b"\x5b"  # POP ebx
+    b"\xc3"  # RET
+)
+
+#: x86-64 XGETBV routine: "uint64_t xgetbv(uint32_t index)"
+_XGETBV_PROLOGUE_SYSV = b"\x89\xf9"  # MOV ecx, edi
+_XGETBV_BODY_X86_64 = (
+    b"\x0f\x01\xd0"  # XGETBV
+    b"\x48\xc1\xe2\x20"  # SHL rdx, 32
+    b"\x48\x09\xd0"  # OR rax, rdx
+    b"\xc3"  # RET
+)
+
+#: x86-32 XGETBV routine (cdecl), result already in EDX:EAX
+_XGETBV_X86_32 = (
+    b"\x8b\x4c\x24\x04"  # MOV ecx, [esp+4]
+    b"\x0f\x01\xd0"  # XGETBV
+    b"\xc3"  # RET
+)
+
+#: XGETBV routine offset in the executable memory page
+_XGETBV_OFFSET = 0x80
+
+#: Native routines: (CPUID routine, XGETBV routine)
+_ROUTINES = None
+_ROUTINES_LOCK = _allocate_lock()
+
+
+def _cpuid_machine_code(is_64bits, is_windows):
+    """
+    Return the CPUID routine machine code.
+
+    Parameters
+    ----------
+    is_64bits : bool
+        If True, x86-64 code, else x86-32 code.
+    is_windows : bool
+        If True, uses the Microsoft x86-64 calling convention.
+
+    Returns
+    -------
+    bytes
+        Machine code.
+    """
+    if not is_64bits:
+        return _CPUID_X86_32
+    if is_windows:
+        return _CPUID_PROLOGUE_WIN64 + _CPUID_BODY_X86_64
+    return _CPUID_PROLOGUE_SYSV + _CPUID_BODY_X86_64
+
+
+def _xgetbv_machine_code(is_64bits, is_windows):
+    """
+    Return the XGETBV routine machine code.
+
+    Parameters
+    ----------
+    is_64bits : bool
+        If True, x86-64 code, else x86-32 code.
+    is_windows : bool
+        If True, uses the Microsoft x86-64 calling convention.
+
+    Returns
+    -------
+    bytes
+        Machine code.
+    """
+    if not is_64bits:
+        return _XGETBV_X86_32
+    if is_windows:
+        # Argument already in ECX
+        return _XGETBV_BODY_X86_64
+    return _XGETBV_PROLOGUE_SYSV + _XGETBV_BODY_X86_64
+
+
+def _load_routines():
+    """
+    Copy the CPUID and XGETBV routines in an executable memory page.
+
+    The page is allocated once per process and never freed.
+
+    Returns
+    -------
+    tuple of ctypes functions
+        CPUID routine, XGETBV routine.
+    """
+    from platform import system
+    from ctypes import (
+        c_void_p,
+        c_size_t,
+        c_ulong,
+        c_int,
+        c_uint32,
+        c_uint64,
+        byref,
+        sizeof,
+        CFUNCTYPE,
+        POINTER,
+        memmove,
+    )
+
+    is_windows = system() == "Windows"
+    is_64bits = sizeof(c_void_p) == 8
+    code = _cpuid_machine_code(is_64bits, is_windows)
+    xgetbv_code = _xgetbv_machine_code(is_64bits, is_windows)
+    size = 0x1000
+
+    if is_windows:
+        from ctypes import windll
+
+        lib = windll.kernel32
+        valloc = lib.VirtualAlloc
+        valloc.argtypes = [c_void_p, c_size_t, c_ulong, c_ulong]
+        # MEM_COMMIT | MEM_RESERVE, PAGE_READWRITE
+        args = (None, size, 0x1000 | 0x2000, 0x04)
+    else:
+        from ctypes import cdll
+
+        lib = cdll.LoadLibrary(None)
+        valloc = lib.valloc
+        valloc.argtypes = [c_size_t]
+        args = (size,)
+
+    valloc.restype = c_void_p
+    address = valloc(*args)
+    if not address:
+        raise RuntimeError("Failed to allocate memory")
+
+    memmove(address, code, len(code))
+    memmove(address + _XGETBV_OFFSET, xgetbv_code, len(xgetbv_code))
+
+    # Memory is made executable but no longer writable
+    if is_windows:
+        protect = lib.VirtualProtect
+        protect.restype = c_int
+        protect.argtypes = [c_void_p, c_size_t, c_ulong, POINTER(c_ulong)]
+        # PAGE_EXECUTE_READ
+        protected = protect(address, size, 0x20, byref(c_ulong())) != 0
+    else:
+        protect = lib.mprotect
+        protect.restype = c_int
+        protect.argtypes = [c_void_p, c_size_t, c_int]
+        # PROT_READ | PROT_EXEC
+        protected = protect(address, size, 1 | 4) == 0
+
+    if not protected:
+        if is_windows:
+            # MEM_RELEASE
+            lib.VirtualFree(c_void_p(address), 0, 0x8000)
+        else:
+            lib.free(c_void_p(address))
+        raise RuntimeError("Failed to memory protect")
+
+    return (
+        CFUNCTYPE(None, POINTER(_Leaf), POINTER(_Registers), c_size_t)(address),
+        CFUNCTYPE(c_uint64, c_uint32)(address + _XGETBV_OFFSET),
+    )
+
+
+def _routines():
+    """
+    Return native routines, loading them on first call.
+
+    Returns
+    -------
+    tuple of ctypes functions
+        CPUID routine, XGETBV routine.
+    """
+    global _ROUTINES
+    if _ROUTINES is None:
+        with _ROUTINES_LOCK:
+            if _ROUTINES is None:
+                _ROUTINES = _load_routines()
+    return _ROUTINES
+
+
+def _run_xgetbv(index=0):
+    """
+    Run XGETBV to read an extended control register.
+
+    Must only be called if CPUID reports the "OSXSAVE" feature.
+
+    Parameters
+    ----------
+    index : int
+        Register index (0 for XCR0).
+
+    Returns
+    -------
+    int
+        Register value.
+    """
+    return _routines()[1](index)
+
+
+def _run_cpuid(leaves):
+    """
+    Run CPUID for multiple leaves in a single native call.
+
+    Parameters
+    ----------
+    leaves : iterable of tuple of int
+        (EAX register value, ECX register value) pairs.
+
+    Returns
+    -------
+    ctypes array of _Registers
+        Results.
+    """
+    leaves = tuple(leaves)
+    count = len(leaves)
+    inputs = (_Leaf * count)(*leaves)
+    outputs = (_Registers * count)()
+    _routines()[0](inputs, outputs, count)
+    return outputs
@@ -1,9 +1,48 @@
 """x86-64 Processors."""
 
-from compilertools.processors.x86_32 import Processor as _X86_32_Processor, Cpuid
+from compilertools.processors import ProcessorBase as _ProcessorBase
+from compilertools.processors.x86_32 import (
+    Processor as _X86_32_Processor,
+    Cpuid,
+    _X86_64_V1,
+    _X86_64_V2,
+    _X86_64_V3,
+    _X86_64_V4,
+)
 
-__all__ = ["Processor", "Cpuid"]
+__all__ = ["Processor", "Cpuid", "X86_64_LEVELS"]
+
+#: x86-64 psABI microarchitecture levels: {level: required features}
+X86_64_LEVELS = {1: _X86_64_V1, 2: _X86_64_V2, 3: _X86_64_V3, 4: _X86_64_V4}
 
 
 class Processor(_X86_32_Processor):
     """x86-64 CPU."""
+
+    def __init__(self, current_machine=False):
+        _X86_32_Processor.__init__(self, current_machine)
+        self._default["x86_64_level"] = 0
+
+    @_ProcessorBase._memoized_property
+    def x86_64_level(self):
+        """
+        Highest x86-64 psABI microarchitecture level supported.
+
+        Levels 3 and 4 also require the OS to save AVX and AVX-512 registers states.
+
+        Returns
+        -------
+        int
+            Level (1 to 4). 0 if not x86-64 compatible.
+        """
+        if not self.current_machine:
+            return None
+
+        features = self["features"]
+        os_supports = {3: self.os_supports_avx, 4: self.os_supports_avx512}
+        level = 0
+        for number, required in X86_64_LEVELS.items():
+            if not features.has_all(required) or not os_supports.get(number, True):
+                break
+            level = number
+        return level
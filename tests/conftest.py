@@ -0,0 +1,28 @@
+"""Pytest configuration."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def disable_cache():
+    """Disable the persistent detection cache to not use real machine results."""
+    from compilertools._config import CONFIG
+
+    config_cache = CONFIG["cache"]
+    CONFIG["cache"] = False
+    try:
+        yield
+    finally:
+        CONFIG["cache"] = config_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    """Use new compilers and processors instances in each test."""
+    from compilertools import clear_registry
+
+    clear_registry()
+    try:
+        yield
+    finally:
+        clear_registry()
@@ -17,3 +17,17 @@ def tests_get_compiler():
     from compilertools.compilers import get_compiler as _get_compiler
 
     assert compilertools.get_compiler() == _get_compiler(current_compiler=True)
+
+
+def tests_clear_registry():
+    """Test clear_registry."""
+    import compilertools
+
+    processor = compilertools.get_processor()
+    compiler = compilertools.get_compiler()
+    assert compilertools.get_processor() is processor
+    assert compilertools.get_compiler() is compiler
+
+    compilertools.clear_registry()
+    assert compilertools.get_processor() is not processor
+    assert compilertools.get_compiler() is not compiler
@@ -0,0 +1,181 @@
+"""Tests for persistent detection cache."""
+
+
+def _mock_cache_dir(tmp):
+    """Use a temporary cache directory and enable cache."""
+    import compilertools._cache as cache
+    from compilertools._config import CONFIG
+
+    cache._cache_dir = lambda: tmp
+    cache._CACHE = None
+    CONFIG["cache"] = True
+
+
+def tests_load_store():
+    """Test load & store."""
+    from json import load as json_load
+    from os.path import join, isfile
+    from tempfile import TemporaryDirectory
+    import compilertools._cache as cache
+    from compilertools._config import CONFIG
+
+    cache_dir = cache._cache_dir
+    try:
+        with TemporaryDirectory() as tmp:
+            _mock_cache_dir(tmp)
+            path = join(tmp, cache.CACHE_FILE)
+
+            # Not cached
+            assert cache.load("section", "key") is None
+            assert not isfile(path)
+
+            # Cached
+            cache.store("section", "key", [1, 2])
+            assert cache.load("section", "key") == [1, 2]
+            with open(path, "rt") as file:
+                content = json_load(file)
+            assert content["section"] == {"key": [1, 2]}
+            assert content["version"] == cache.CACHE_VERSION
+            assert content["machine"] == cache.machine_fingerprint()
+
+            # Reloaded from file
+            cache._CACHE = None
+            assert cache.load("section", "key") == [1, 2]
+
+            # Invalidated on machine change
+            cache._CACHE = None
+            machine = cache._MACHINE
+            cache._MACHINE = "other_machine"
+            try:
+                assert cache.load("section", "key") is None
+            finally:
+                cache._MACHINE = machine
+
+            # Invalidated on version change
+            cache._CACHE = None
+            cache_version = cache.CACHE_VERSION
+            cache.CACHE_VERSION = -1
+            try:
+                assert cache.load("section", "key") is None
+            finally:
+                cache.CACHE_VERSION = cache_version
+
+            # Corrupted file
+            with open(path, "wt") as file:
+                file.write("{")
+            cache._CACHE = None
+            assert cache.load("section", "key") is None
+
+            # Disabled cache
+            cache.store("section", "key", 1)
+            CONFIG["cache"] = False
+            assert cache.load("section", "key") is None
+            cache.store("section", "key", 2)
+            CONFIG["cache"] = True
+            assert cache.load("section", "key") == 1
+
+    finally:
+        cache._cache_dir = cache_dir
+        cache._CACHE = None
+
+
+def tests_cached_call():
+    """Test cached_call & binary_fingerprint."""
+    import sys
+    from tempfile import TemporaryDirectory
+    import compilertools._cache as cache
+
+    calls = []
+
+    def probe(value):
+        """Mock probing function."""
+        calls.append(value)
+        return value
+
+    cache_dir = cache._cache_dir
+    binary_fingerprint = cache.binary_fingerprint
+    try:
+        with TemporaryDirectory() as tmp:
+            _mock_cache_dir(tmp)
+
+            # Real binary
+            assert cache.binary_fingerprint(sys.executable)
+            assert cache.binary_fingerprint("compilertools_not_exists") is None
+
+            binary = "binary1"
+            cache.binary_fingerprint = lambda _: binary
+
+            # Call and cache
+            assert cache.cached_call("cmd", "probe", probe, 1) == 1
+            assert cache.cached_call("cmd", "probe", probe, 2) == 1
+            assert calls == [1]
+
+            # Binary change
+            binary = "binary2"
+            assert cache.cached_call("cmd", "probe", probe, 2) == 2
+            assert calls == [1, 2]
+
+            # Binary not found
+            binary = None
+            assert cache.cached_call("cmd", "probe", probe, 3) == 3
+            assert calls == [1, 2, 3]
+
+    finally:
+        cache._cache_dir = cache_dir
+        cache.binary_fingerprint = binary_fingerprint
+        cache._CACHE = None
+
+
+def tests_cached_processor():
+    """Test cached_processor."""
+    from tempfile import TemporaryDirectory
+    import compilertools._cache as cache
+    from compilertools.processors import ProcessorBase
+
+    class Processor(ProcessorBase):
+        """Mock processor."""
+
+        detections = 0
+
+        @ProcessorBase._memoized_property
+        def features(self):
+            """Features."""
+            Processor.detections += 1
+            if Processor.detections > 2:
+                raise RuntimeError
+            return {"feature2", "feature1"}
+
+    cache_dir = cache._cache_dir
+    try:
+        with TemporaryDirectory() as tmp:
+            _mock_cache_dir(tmp)
+            key = f"{Processor().arch}|auto"
+
+            # Detect and cache
+            processor = cache.cached_processor(Processor(current_machine=True))
+            assert processor.features == {"feature1", "feature2"}
+            assert Processor.detections == 1
+            assert cache.load("processors", key)["features"] == [
+                "feature1",
+                "feature2",
+            ]
+
+            # Load from cache
+            processor = cache.cached_processor(Processor(current_machine=True))
+            assert processor.features == {"feature1", "feature2"}
+            assert Processor.detections == 1
+
+            # Invalid cached value
+            cache.store("processors", key, {"features": []})
+            processor = cache.cached_processor(Processor(current_machine=True))
+            assert processor.features == {"feature1", "feature2"}
+            assert Processor.detections == 2
+
+            # Detection error
+            cache.store("processors", key, None)
+            processor = cache.cached_processor(Processor(current_machine=True))
+            assert cache.load("processors", key) is None
+
+    finally:
+        cache._cache_dir = cache_dir
+        cache._CACHE = None
@@ -33,6 +33,18 @@ def tests_get_build_compile_args():
 
         def _compile_args_matrix(self, arch, cpu):
             """Return test args matrix."""
+            if arch == "arch3":
+                return [
+                    [
+                        self.Arg(args="-march=uarch-1", suffix="march_uarch-1"),
+                        self.Arg(args="-march=uarch2", suffix="march_uarch2"),
+                        self.Arg(),
+                    ],
+                    [
+                        self.Arg(args="-mtune=uarch-1", suffix="mtune_uarch-1"),
+                        self.Arg(),
+                    ],
+                ]
             return [
                 [
                     self.Arg(
@@ -108,6 +120,29 @@ def tests_get_build_compile_args():
     }
     ConfigBuild.suffixes_includes.remove("arch2")
 
+    # Test selected suffixes combinations
+    ConfigBuild.suffixes_combinations = {"arch2_opt"}
+    ConfigBuild.suffixes_excludes.add("arch2_opt")
+    try:
+        assert get_build_compile_args(compiler, "arch2") == {
+            f".arch2_opt{ext_suffix}": ["--arch2_opt"]
+        }
+    finally:
+        ConfigBuild.suffixes_combinations = set()
+        ConfigBuild.suffixes_excludes.remove("arch2_opt")
+
+    # Test microarchitectures suffixes, not built by default
+    assert get_build_compile_args(compiler, "arch3") == {ext_suffix: []}
+    ConfigBuild.microarchitectures.add("uarch-1")
+    try:
+        assert get_build_compile_args(compiler, "arch3") == {
+            f".march_uarch_1{ext_suffix}": ["-march=uarch-1"],
+            f".mtune_uarch_1{ext_suffix}": ["-mtune=uarch-1"],
+            ext_suffix: [],
+        }
+    finally:
+        ConfigBuild.microarchitectures.remove("uarch-1")
+
 
 def tests_get_build_link_args():
     """Test get_build_link_args."""
@@ -204,6 +239,7 @@ def tests_add_args():
 
 def tests_update_extension():
     """Test _update_extension and other monkey patches."""
+    from json import load, dump
     from os.path import join
     from os import makedirs
     from tempfile import TemporaryDirectory
@@ -235,8 +271,14 @@ def tests_update_extension():
         def _compile_args_matrix(self, arch, cpu):
             """Return test args matrix."""
             return [
-                [self.Arg(args="--inst", suffix="inst"), self.Arg()],
-                [self.Arg(args="--arch", suffix="arch"), self.Arg()],
+                [
+                    self.Arg(args="--inst", suffix="inst", features=("INST",)),
+                    self.Arg(),
+                ],
+                [
+                    self.Arg(args="--arch", suffix="arch", features=("ARCH",)),
+                    self.Arg(),
+                ],
             ]
 
     compiler = Compiler()
@@ -359,10 +401,46 @@ def tests_update_extension():
         excepted_file = join(
             dummy_build_ext.build_lib, "package", "module.compilertools"
         )
-        assert dummy_build_ext.get_outputs() == [excepted_file]
+        excepted_manifest = join(
+            dummy_build_ext.build_lib, "package", "__compilertools__.json"
+        )
+        assert dummy_build_ext.get_outputs() == [excepted_file, excepted_manifest]
         with open(excepted_file, "rt") as file:
             assert file.read() == dummy_build_ext.compilertools_compiler_name
 
+        # Test manifest
+        with open(excepted_manifest, "rt") as file:
+            manifest = load(file)
+        assert manifest["version"] == 1
+        variants = manifest["extensions"]["module"]["variants"]
+        assert manifest["extensions"]["module"]["compiler"] == compiler.name
+        assert set(variants) == set(excepted_args)
+        assert variants["inst-arch"] == {
+            "file": f"module.inst-arch{ext_suffix}",
+            "features": ["ARCH", "INST"],
+            "requires": {"features": ["ARCH", "INST"]},
+        }
+        assert variants[""] == {
+            "file": f"module{ext_suffix}",
+            "features": [],
+            "requires": {},
+        }
+
+        # Test manifest update with existing content
+        manifest["extensions"]["other"] = manifest["extensions"]["module"]
+        with open(excepted_manifest, "wt") as file:
+            dump(manifest, file)
+        dummy_build_ext.get_outputs()
+        with open(excepted_manifest, "rt") as file:
+            assert set(load(file)["extensions"]) == {"module", "other"}
+
+        # Test top level extension are not in manifest
+        build_ext = DummyBuildExt()
+        dummy_ext = DummyExtension()
+        dummy_ext.name = "module"
+        build_ext.build_extension(dummy_ext)
+        assert not build_ext.compilertools_manifests
+
     # Test after disabling optimization with CONFIG_BUILD
     ConfigBuild.disabled = True
     dummy_ext = DummyExtension()
@@ -49,6 +49,15 @@ def tests_get_compiler():
                 == f"compilertools.compilers.{unix_compiler}"
             )
 
+    # Interned compilers
+    from compilertools.compilers import clear_compilers
+
+    compiler = get_compiler("gcc", current_compiler=True)
+    assert get_compiler("gcc", current_compiler=True) is compiler
+    assert get_compiler("gcc") is not compiler
+    clear_compilers()
+    assert get_compiler("gcc", current_compiler=True) is not compiler
+
 
 def tests_get_arch_and_cpu():
     """Test _get_arch_and_cpu."""
@@ -139,6 +148,24 @@ def tests_compiler_base():
 
     compiler2 = Compiler2()
 
+    class Compiler3(CompilerBase):
+        """Mock Compiler."""
+
+        def _compile_args_matrix(self, arch, cpu):
+            """Return test args matrix."""
+            return [
+                [
+                    self.Arg(args="--inst1", suffix="inst1", features=("INST1",)),
+                    self.Arg(),
+                ],
+                [
+                    self.Arg(args="--arch1", suffix="arch1", features=("ARCH1",)),
+                    self.Arg(args="--arch2", suffix="arch2"),
+                ],
+            ]
+
+    compiler3 = Compiler3()
+
     # Excepted args results
     excepted = OrderedDict(
         [
@@ -189,9 +216,19 @@ def tests_compiler_base():
         == excepted_currentcompiler
     )
 
+    # Test compile_args_features
+    assert compiler3.compile_args_features(arch="arch1") == OrderedDict(
+        [
+            ("inst1-arch1", ["ARCH1", "INST1"]),
+            ("inst1-arch2", ["INST1"]),
+            ("arch1", ["ARCH1"]),
+            ("arch2", []),
+        ]
+    )
+
     # Test compile_args_current_machine
-    assert compiler2.compile_args_current_machine() == excepted["inst1-arch1"]
-    assert compiler1.compile_args_current_machine() == []
+    assert compiler2.compile_args_current_machine() == " ".join(excepted["inst1-arch1"])
+    assert compiler1.compile_args_current_machine() == ""
 
     # Test Properties
     assert compiler1.version == 0.0
@@ -199,6 +236,254 @@ def tests_compiler_base():
     assert compiler1.version == 9.9
 
 
+def tests_compiler_base_x86_args():
+    """Test CompilerBase x86 arguments helpers."""
+    from compilertools.compilers import CompilerBase
+    from compilertools.processors.x86_64 import Processor
+
+    compiler = CompilerBase()
+    compiler["version"] = 10.0
+    versions = {"uarch1": 9.0, "uarch2": 11.0}
+
+    # x86-64 levels
+    cpu = Processor(current_machine=True)
+    cpu["features"] = {"AVX2"}
+    arg = compiler._x86_64_level_arg(cpu, 3)
+    assert arg.args == "-march=x86-64-v3"
+    assert arg.suffix == "x86_64_v3"
+    assert "AVX2" in arg.import_if.features
+    assert arg.import_if.os == ("os_supports_avx",)
+    assert compiler._x86_64_level_arg(cpu, 2).import_if.os == ()
+
+    from compilertools.processors.x86_64 import X86_64_LEVELS
+
+    cpu["features"] = X86_64_LEVELS[3]
+    cpu["os_supports_avx"] = True
+    assert arg.import_if.match(cpu, compiler)
+    assert not compiler._x86_64_level_arg(cpu, 4).import_if.match(cpu, compiler)
+    cpu["os_supports_avx"] = False
+    assert not arg.import_if.match(cpu, compiler)
+
+    # Microarchitectures, not current machine
+    cpu = Processor()
+    args = compiler._microarchitecture_args(cpu, "march", versions)
+    assert [arg.args for arg in args] == ["-march=uarch1", "-march=uarch2"]
+    assert [arg.suffix for arg in args] == ["march_uarch1", "march_uarch2"]
+    assert [arg.build_if.match(compiler=compiler) for arg in args] == [True, False]
+    assert not any(arg.import_if.match(cpu, compiler) for arg in args)
+
+    # Microarchitectures, current machine
+    isa = {"uarch1": {"SSE4_2"}, "uarch2": {"AVX", "FMA"}}
+    cpu = Processor(current_machine=True)
+    cpu["microarchitecture"] = "uarch2"
+    cpu["features"] = {"AVX", "FMA"}
+    cpu["os_supports_avx"] = True
+    (arg,) = compiler._microarchitecture_args(cpu, "mtune", versions)
+    assert arg.args == "-mtune=uarch2"
+    assert arg.import_if.match(cpu, compiler)
+    (march,) = compiler._microarchitecture_args(cpu, "march", versions, isa)
+    assert march.import_if.features == ("AVX", "FMA")
+    assert march.import_if.os == ("os_supports_avx",)
+    assert march.import_if.match(cpu, compiler)
+
+    cpu["os_supports_avx"] = False
+    assert not march.import_if.match(cpu, compiler)
+    assert arg.import_if.match(cpu, compiler)
+
+    # Microarchitecture features masked (Like by an hypervisor)
+    cpu["os_supports_avx"] = True
+    cpu["features"] = {"AVX"}
+    assert not march.import_if.match(cpu, compiler)
+    assert arg.import_if.match(cpu, compiler)
+
+    cpu["microarchitecture"] = "unknown"
+    assert compiler._microarchitecture_args(cpu, "march", versions, isa) == []
+
+
+def tests_compiler_base_x86_march_masked_features():
+    """Test CompilerBase "-march" arguments with CPU features masked."""
+    from compilertools.compilers import CompilerBase
+    from compilertools.processors.x86_32 import MICROARCHITECTURES_ISA
+    from compilertools.processors.x86_64 import Processor, X86_64_LEVELS
+
+    compiler = CompilerBase()
+    versions = {"skylake-avx512": 6.0}
+
+    def skylake_sp(features, xcr0):
+        """Return a Skylake-SP processor."""
+        cpu = Processor(current_machine=True)
+        cpu["microarchitecture"] = "skylake-avx512"
+        cpu["features"] = features | {"XSAVE"}
+        cpu["xcr0"] = xcr0
+        return cpu
+
+    (march,) = compiler._microarchitecture_args(
+        skylake_sp(X86_64_LEVELS[4], 0b111), "march", versions, MICROARCHITECTURES_ISA
+    )
+    assert march.import_if.os == ("os_supports_avx512",)
+
+    # AVX-512 masked by the hypervisor
+    assert not march.import_if.match(skylake_sp(X86_64_LEVELS[3], 0b111), compiler)
+
+    # AVX-512 available, but registers states not saved by the OS
+    assert not march.import_if.match(skylake_sp(X86_64_LEVELS[4], 0b111), compiler)
+
+    # AVX-512 available
+    assert march.import_if.match(skylake_sp(X86_64_LEVELS[4], 0b11100111), compiler)
+
+    # All microarchitectures supported by compilers have their features defined
+    from compilertools.compilers import gcc, llvm
+
+    for module in (gcc, llvm):
+        assert set(module._MICROARCHITECTURES_VERSIONS) <= set(MICROARCHITECTURES_ISA)
+
+
+def tests_compile_args_cache():
+    """Test CompilerBase.compile_args results cache."""
+    from compilertools.compilers import CompilerBase, Requires
+    from compilertools.processors.x86_64 import Processor
+
+    calls = []
+
+    class Compiler(CompilerBase):
+        """Mock Compiler."""
+
+        def _compile_args_matrix(self, arch, cpu):
+            """Return test args matrix."""
+            calls.append(arch)
+            return [
+                [
+                    self.Arg(
+                        args="--avx",
+                        suffix="avx",
+                        import_if=Requires(features=("AVX",)),
+                        build_if=Requires(version=2.0),
+                    ),
+                    self.Arg(),
+                ]
+            ]
+
+    compiler = Compiler(current_compiler=True)
+    compiler["version"] = 1.0
+
+    # Results are cached, and modifying a result does not change the cache
+    args = compiler.compile_args("x86_64")
+    assert args == {"": []}
+    args[""].append("--other")
+    del args[""]
+    assert compiler.compile_args("amd64") == {"": []}
+    assert calls == ["x86_64"]
+
+    # Cached by compiler version
+    compiler["version"] = 2.0
+    assert compiler.compile_args("x86_64") == {"avx": ["--avx"], "": []}
+    assert len(calls) == 2
+
+    # Requirements
+    assert compiler.compile_args_features("x86_64") == {"avx": ["AVX"], "": []}
+    assert compiler.compile_args_requires("x86_64")["avx"].features == ("AVX",)
+    assert len(calls) == 3
+
+    # Not cached with a processor instance
+    processor = Processor(current_machine=True)
+    processor["features"] = {"AVX"}
+    assert list(compiler.compile_args(current_machine=processor)) == ["avx", ""]
+    assert list(compiler.compile_args(current_machine=processor)) == ["avx", ""]
+    assert len(calls) == 5
+
+
+def tests_requires():
+    """Test Requires & _evaluate_args_matrix."""
+    from compilertools.compilers import CompilerBase, Requires
+    from compilertools.compilers._core import (
+        _evaluate_args_matrix,
+        _order_args_matrix,
+        _order_args_requires,
+    )
+    from compilertools.processors.x86_64 import Processor
+
+    compiler = CompilerBase()
+    compiler["version"] = 10.0
+    cpu = Processor(current_machine=True)
+    cpu["features"] = {"AVX", "AVX2"}
+    cpu["vendor"] = "GenuineIntel"
+    cpu["brand"] = "Intel(R) Atom(TM) CPU"
+    cpu["os_supports_avx"] = True
+
+    # Requirements
+    assert Requires() == ((), (), "", "", "", 0.0)
+    assert Requires().match()
+    assert Requires(features=["AVX"]).features == ("AVX",)
+    assert Requires(features=("AVX", "AVX2"), os=("os_supports_avx",)).match(cpu)
+    assert not Requires(features=("AVX512F",)).match(cpu)
+    assert not Requires(features=("AVX",)).match()
+    assert not Requires(os=("os_supports_avx512",)).match(cpu)
+    assert not Requires(os=("not_a_property",)).match(cpu)
+    assert Requires(vendor="GenuineIntel", brand="Atom").match(cpu)
+    assert not Requires(vendor="AuthenticAMD").match(cpu)
+    assert not Requires(brand="Xeon").match(cpu)
+    assert not Requires(microarchitecture="skylake").match(cpu)
+    cpu["microarchitecture"] = "skylake"
+    assert Requires(microarchitecture="skylake").match(cpu)
+    assert Requires(version=10).match(compiler=compiler)
+    assert not Requires(version=11).match(cpu, compiler)
+    assert not Requires(version=1).match(cpu)
+
+    # Same matrix evaluated with many processors
+    args_matrix = [
+        [CompilerBase.Arg(args="--generic")],
+        [
+            CompilerBase.Arg(
+                args="--avx2",
+                suffix="avx2",
+                import_if=Requires(features=("AVX2",), os=("os_supports_avx",)),
+                build_if=Requires(version=9),
+            ),
+            CompilerBase.Arg(
+                args="--avx",
+                suffix="avx",
+                features=("AVX",),
+                import_if=True,
+                build_if=Requires(version=11),
+            ),
+            CompilerBase.Arg(),
+        ],
+        [
+            CompilerBase.Arg(
+                args="--intel",
+                suffix="intel",
+                import_if=Requires(vendor="GenuineIntel"),
+            ),
+            CompilerBase.Arg(),
+        ],
+    ]
+    evaluated = _evaluate_args_matrix(args_matrix, cpu, compiler)
+    assert [arg.import_if for arg in evaluated[1]] == [True, True, True]
+    assert [arg.build_if for arg in evaluated[1]] == [True, False, True]
+    assert list(_order_args_matrix(evaluated, True, True)) == [
+        "avx2-intel",
+        "avx2",
+        "intel",
+        "",
+    ]
+
+    other = Processor(current_machine=True)
+    other["features"] = {"AVX"}
+    other["vendor"] = "AuthenticAMD"
+    evaluated = _evaluate_args_matrix(args_matrix, other, compiler)
+    assert list(_order_args_matrix(evaluated, True)) == ["avx", ""]
+    assert evaluated[0] is not args_matrix[0]
+    assert evaluated[0][0] is args_matrix[0][0]
+
+    # Requirements of combinations
+    requires = _order_args_requires(args_matrix)
+    assert requires["avx2-intel"] == Requires(
+        features=("AVX2",), os=("os_supports_avx",), vendor="GenuineIntel"
+    )
+    assert requires["avx"] == Requires(features=("AVX",))
+    assert requires[""] == Requires()
+
+
 def test_which_unix_compiler():
     """Test _which_unix_compiler."""
     import subprocess
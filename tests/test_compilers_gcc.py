@@ -82,6 +82,60 @@ def tests_compiler():
         assert compiler._compile_args_matrix(arch_x86, cpu_x86)
         assert compiler._compile_args_matrix(arch_amd64, cpu_amd64)
 
+        # Test instructions sets rows version gates
+        suffixes = "-".join(compiler.compile_args(arch_amd64))
+        assert "avx512" in suffixes
+        assert "amx" not in suffixes
+        assert "avxvnni" not in suffixes
+        assert "x86_64_v3" not in suffixes
+        assert "march_skylake_avx512" in suffixes
+        assert "march_znver3" not in suffixes
+        compiler["version"] = 12.0
+        suffixes = "-".join(compiler.compile_args(arch_amd64))
+        assert "amx" in suffixes
+        assert "avx512_bf16" in suffixes
+        assert "avxvnni" in suffixes
+        assert "x86_64_v3" in suffixes
+        assert "march_znver3" in suffixes
+        assert "mtune_znver3" in suffixes
+        assert "-march=x86-64-v4" in compiler.compile_args(arch_amd64)["x86_64_v4"]
+        compiler["version"] = 4.3
+        suffixes = "-".join(compiler.compile_args(arch_amd64))
+        assert "avx2" not in suffixes
+        assert "avx" not in suffixes.split("-")
+        suffixes = "-".join(compiler.compile_args(arch_x86))
+        assert "sse4a" not in suffixes
+        compiler["version"] = 6.3
+
+        # Test ARM 64-bit rows version gates
+        arch_arm64, cpu_arm64 = _get_arch_and_cpu("aarch64")
+        assert arch_arm64 == "arm_64"
+        suffixes = "-".join(compiler.compile_args(arch_arm64))
+        assert "lse" in suffixes
+        assert "sve" not in suffixes
+        assert "mcpu_cortex_a72" in suffixes
+        assert "mcpu_neoverse_v1" not in suffixes
+        compiler["version"] = 11.0
+        args = compiler.compile_args(arch_arm64)
+        assert "-march=armv8.2-a+sve2+bf16+i8mm+dotprod" in args["sve2"]
+        assert "-mcpu=neoverse-v1" in args["mcpu_neoverse_v1"]
+        compiler["version"] = 6.3
+
+        # Test POWER and RISC-V rows version gates
+        suffixes = "-".join(compiler.compile_args("ppc64le"))
+        assert "power9" in suffixes
+        assert "power10" not in suffixes
+        suffixes = "-".join(compiler.compile_args("riscv64"))
+        assert "rvv" not in suffixes
+        compiler["version"] = 14.0
+        args = compiler.compile_args("ppc64le")
+        assert "-mcpu=power10" in args["power10"]
+        args = compiler.compile_args("riscv64")
+        assert "-march=rv64gcv_zba_zbb" in args["rvv_zba_zbb"]
+        assert "-march=rv64gcv" in args["rvv"]
+        assert "-march=rv64gc_zba_zbb" in args["zba_zbb"]
+        compiler["version"] = 6.3
+
         # Test _compile_args_current_machine with x86
         args = compiler._compile_args_current_machine(arch_x86, cpu_x86)
         assert args
@@ -90,6 +144,43 @@ def tests_compiler():
         # Check return a result also with amd64
         assert compiler._compile_args_current_machine(arch_amd64, cpu_amd64)
 
+        # Check POWER and RISC-V
+        arch_ppc, cpu_ppc = _get_arch_and_cpu("ppc64le")
+        args = compiler._compile_args_current_machine(arch_ppc, cpu_ppc)
+        assert "-mcpu=native" in args
+        arch_riscv, cpu_riscv = _get_arch_and_cpu("riscv64", current_machine=True)
+        cpu_riscv["features"] = {"V"}
+        args = compiler._compile_args_current_machine(arch_riscv, cpu_riscv)
+        assert "-march=native" not in args
+
+        # RISC-V optimized files require the RV64GC extensions
+        assert list(Compiler().compile_args(current_machine=cpu_riscv)) == [""]
+        cpu_riscv["features"] = {"I", "M", "A", "F", "D", "C", "V"}
+        assert list(Compiler().compile_args(current_machine=cpu_riscv)) == ["rvv", ""]
+
+        # RISC-V current machine arguments only use arguments supported by compiler
+        cpu_riscv["features"] = {"I", "M", "A", "F", "D", "C", "V", "ZBA", "ZBB"}
+        compiler["version"] = 12.0
+        args = compiler._compile_args_current_machine(arch_riscv, cpu_riscv)
+        assert isinstance(args, str)
+        assert "-march=rv64gc_zba_zbb" in args
+        assert "rv64gcv" not in args
+        compiler["version"] = 14.0
+        args = compiler._compile_args_current_machine(arch_riscv, cpu_riscv)
+        assert "-march=rv64gcv_zba_zbb" in args.split()
+        compiler["version"] = 6.3
+        args = compiler._compile_args_current_machine(arch_riscv, cpu_riscv)
+        assert "-march" not in args
+
+        # Check caches sizes
+        cpu_amd64["cache_hierarchy"] = {
+            "L1d": {"size": 49152, "line_size": 64, "associativity": 12},
+            "L2": {"size": 2097152, "line_size": 64, "associativity": 16},
+        }
+        args = compiler._compile_args_current_machine(arch_amd64, cpu_amd64)
+        assert "--param l1-cache-size=48 --param l1-cache-line-size=64" in args
+        assert "--param l2-cache-size=2048" in args
+
         # Check -mfpmath with or without SSE
         cpu_x86["features"] = ["SSE"]
         args = compiler._compile_args_current_machine(arch_x86, cpu_x86)
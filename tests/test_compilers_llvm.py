@@ -7,6 +7,7 @@ def tests_compiler():
     import subprocess
     from compilertools.compilers._core import _get_arch_and_cpu
     from compilertools.compilers.llvm import Compiler
+    from compilertools.processors.riscv64 import Processor
 
     cmd = {
         "python": "",
@@ -81,6 +82,64 @@ def tests_compiler():
         assert compiler._compile_args_matrix(arch_x86, cpu_x86)
         assert compiler._compile_args_matrix(arch_amd64, cpu_amd64)
 
+        # Test instructions sets rows version gates
+        suffixes = "-".join(compiler.compile_args(arch_amd64))
+        assert "avx512" in suffixes
+        assert "amx" not in suffixes
+        assert "avxvnni" not in suffixes
+        assert "x86_64_v3" not in suffixes
+        assert "march_skylake_avx512" in suffixes
+        assert "mtune_skylake_avx512" not in suffixes
+        compiler["version"] = 14.0
+        suffixes = "-".join(compiler.compile_args(arch_amd64))
+        assert "amx" in suffixes
+        assert "avx512_bf16" in suffixes
+        assert "avxvnni" in suffixes
+        assert "x86_64_v3" in suffixes
+        assert "mtune_skylake_avx512" in suffixes
+        assert "-march=x86-64-v4" in compiler.compile_args(arch_amd64)["x86_64_v4"]
+        compiler["version"] = 7.0
+
+        # Test ARM 64-bit rows version gates
+        arch_arm64, cpu_arm64 = _get_arch_and_cpu("aarch64")
+        suffixes = "-".join(compiler.compile_args(arch_arm64))
+        assert "sve" in suffixes
+        assert "sve2" not in suffixes
+        assert "mcpu_cortex_a72" in suffixes
+        assert "mcpu_neoverse_n1" not in suffixes
+        compiler["version"] = 12.0
+        args = compiler.compile_args(arch_arm64)
+        assert "-march=armv8.2-a+sve+dotprod" in args["sve"]
+        assert "-mcpu=neoverse-n2" in args["mcpu_neoverse_n2"]
+        compiler["version"] = 7.0
+
+        # Test POWER and RISC-V rows version gates
+        suffixes = "-".join(compiler.compile_args("ppc64le"))
+        assert "power9" in suffixes
+        assert "power10" not in suffixes
+        assert "zba_zbb" not in "-".join(compiler.compile_args("riscv64"))
+        compiler["version"] = 16.0
+        assert "-mcpu=power10" in compiler.compile_args("ppc64le")["power10"]
+        assert "-march=rv64gcv" in compiler.compile_args("riscv64")["rvv"]
+
+        # RISC-V optimized files require the RV64GC extensions
+        cpu_riscv = Processor(current_machine=True)
+        cpu_riscv["features"] = {"V", "ZBA", "ZBB"}
+        assert list(Compiler().compile_args(current_machine=cpu_riscv)) == [""]
+        cpu_riscv["features"] = {"I", "M", "A", "F", "D", "C", "ZBA", "ZBB"}
+        suffixes = list(Compiler().compile_args(current_machine=cpu_riscv))
+        assert suffixes == ["zba_zbb", ""]
+
+        # RISC-V current machine arguments only use arguments supported by compiler
+        cpu_riscv["features"] = {"I", "M", "A", "F", "D", "C", "V", "ZBA", "ZBB"}
+        args = compiler._compile_args_current_machine("riscv64", cpu_riscv)
+        assert isinstance(args, str)
+        assert "-march=rv64gcv_zba_zbb" in args.split()
+        compiler["version"] = 14.0
+        args = compiler._compile_args_current_machine("riscv64", cpu_riscv)
+        assert "-march=rv64gc_zba_zbb" in args.split()
+        compiler["version"] = 7.0
+
         # Test _compile_args_current_machine with x86
         args = compiler._compile_args_current_machine(arch_x86, cpu_x86)
         assert args
@@ -0,0 +1,223 @@
+"""Tests for fleet planning."""
+
+
+def profile(features, nodes=None):
+    """
+    Return an ARM 64-bit CPU profile.
+
+    Parameters
+    ----------
+    features : str
+        "/proc/cpuinfo" features.
+    nodes : int
+        Number of nodes.
+
+    Returns
+    -------
+    dict
+        Profile.
+    """
+    from compilertools.processors._core import PROFILE_VERSION
+
+    content = {
+        "version": PROFILE_VERSION,
+        "arch": "arm_64",
+        "reads": {"cpuinfo": {"Features": f"fp asimd crc32 {features}"}},
+    }
+    if nodes is not None:
+        content["nodes"] = nodes
+    return content
+
+
+#: Fleet profiles
+PROFILES = {
+    "cortex_a72": profile(""),
+    "graviton2": profile("atomics asimdrdm asimddp"),
+    "graviton3": profile("atomics fphp asimdhp asimdrdm lrcpc asimddp sve i8mm bf16"),
+    "graviton4": profile("atomics asimdrdm asimddp sve sve2 bf16 i8mm"),
+}
+
+
+def tests_load_fleet():
+    """Test load_fleet."""
+    from json import dump
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from compilertools.fleet import load_fleet
+    from compilertools.processors.arm_64 import Processor
+
+    with TemporaryDirectory() as tmp:
+        for name, content in PROFILES.items():
+            with open(join(tmp, f"{name}.json"), "wt") as file:
+                dump(dict(content, nodes=3) if name == "graviton3" else content, file)
+        with open(join(tmp, "README"), "wt") as file:
+            file.write("Not a profile")
+
+        fleet = load_fleet(tmp, nodes={"graviton2": 10})
+
+    assert sorted(fleet) == sorted(PROFILES)
+    assert isinstance(fleet["graviton4"][0], Processor)
+    assert "SVE2" in fleet["graviton4"][0].features
+    assert fleet["cortex_a72"][1] == 1
+    assert fleet["graviton2"][1] == 10
+    assert fleet["graviton3"][1] == 3
+
+
+def tests_plan():
+    """Test plan."""
+    from compilertools.compilers.gcc import Compiler
+    from compilertools.fleet import plan
+    from compilertools.processors.arm_64 import Processor
+    from compilertools._config_build import ConfigBuild
+
+    compiler = Compiler(current_compiler=True)
+    compiler["version"] = 12.0
+    fleet = {
+        name: (Processor.from_profile(content), nodes)
+        for (name, content), nodes in zip(PROFILES.items(), (2, 10, 20, 5))
+    }
+
+    # Best files for all machines
+    result = plan(fleet, compiler)
+    assert result.suffixes == {"dotprod", "sve", "sve2"}
+    assert result.imports == {
+        "cortex_a72": "",
+        "graviton2": "dotprod",
+        "graviton3": "sve",
+        "graviton4": "sve2",
+    }
+    assert result.coverage == 1.0
+
+    # Limited number of files, weighted by nodes
+    result = plan(fleet, compiler, max_variants=1)
+    assert result.suffixes == {"sve"}
+    assert result.imports["graviton4"] == "sve"
+    assert result.imports["graviton2"] == ""
+    assert result.coverage == 22 / 37
+
+    result = plan(fleet, compiler, max_variants=2)
+    assert result.suffixes == {"sve", "dotprod"}
+    assert result.coverage == 32 / 37
+
+    # Microarchitectures
+    fleet["graviton3"][0]["microarchitecture"] = "neoverse-v1"
+    assert "mcpu_neoverse_v1" not in plan(fleet, compiler).suffixes
+    ConfigBuild.microarchitectures.add("neoverse-v1")
+    try:
+        result = plan(fleet, compiler)
+        assert result.imports["graviton3"] == "mcpu_neoverse_v1"
+    finally:
+        ConfigBuild.microarchitectures.remove("neoverse-v1")
+
+    # Empty fleet
+    assert plan({}, compiler) == (set(), {}, 1.0)
+
+
+def tests_plan_imports():
+    """Test plan only selects files that machines import."""
+    from compilertools.compilers.gcc import Compiler
+    from compilertools.fleet import plan
+    from compilertools.processors.arm_64 import Processor
+
+    compiler = Compiler(current_compiler=True)
+    compiler["version"] = 12.0
+    fleet = {
+        name: (Processor.from_profile(content), 1) for name, content in PROFILES.items()
+    }
+
+    # Row with import condition depending on the compiler
+    compile_args_matrix = compiler._compile_args_matrix
+
+    def _compile_args_matrix(arch, cpu):
+        """Mock method."""
+        return compile_args_matrix(arch, cpu) + [
+            [
+                compiler.Arg(
+                    args="-mversioned",
+                    suffix="versioned",
+                    import_if=compiler.Requires(version=1.0),
+                ),
+                compiler.Arg(),
+            ]
+        ]
+
+    compiler._compile_args_matrix = _compile_args_matrix
+
+    # Planned files are ranked by the import machinery for each machine
+    import_compiler = Compiler()
+    import_compiler._compile_args_matrix = _compile_args_matrix
+    for max_variants in (None, 1, 2):
+        result = plan(fleet, compiler, max_variants=max_variants)
+        for name, (processor, _) in fleet.items():
+            suffixes = import_compiler.compile_args(current_machine=processor)
+            assert result.imports[name] in suffixes
+        assert not any("versioned" in suffixes for suffixes in result.suffixes)
+
+
+def tests_simulate():
+    """Test simulate."""
+    import sys
+    from compilertools.compilers.gcc import Compiler
+    from compilertools.fleet import simulate
+    from compilertools.processors import Features
+
+    compiler = Compiler(current_compiler=True)
+    compiler["version"] = 12.0
+    hosts = (
+        [{"ASIMD", "CRC32"}] * 2
+        + [Features({"ASIMD", "CRC32", "LSE", "ASIMDRDM", "DOTPROD"})] * 10
+        + [Features.mask_of(("ASIMD", "CRC32", "LSE", "ASIMDRDM", "DOTPROD", "SVE"))]
+        * 20
+        + [
+            {
+                "ASIMD",
+                "CRC32",
+                "LSE",
+                "ASIMDRDM",
+                "DOTPROD",
+                "SVE",
+                "SVE2",
+                "BF16",
+                "I8MM",
+            }
+        ]
+        * 5
+    )
+
+    numpy = sys.modules.get("numpy")
+    for available in (True, False):
+        if not available:
+            # Pure Python fallback
+            sys.modules["numpy"] = None
+        try:
+            result = simulate(hosts, compiler, "arm_64")
+        finally:
+            if numpy is None:
+                sys.modules.pop("numpy", None)
+            else:
+                sys.modules["numpy"] = numpy
+
+        assert result.suffixes == ["sve2", "sve", "dotprod", "lse", ""]
+        assert list(result.selection[:3]) == [4, 4, 2]
+        assert list(result.selection[-1:]) == [0]
+        assert result.counts == {"sve2": 5, "sve": 20, "dotprod": 10, "lse": 0, "": 2}
+        assert result.fallback_rate == 2 / 37
+
+    # Built combinations
+    result = simulate(hosts, compiler, "arm_64", combinations={"dotprod"})
+    assert result.suffixes == ["dotprod", ""]
+    assert result.counts == {"dotprod": 35, "": 2}
+
+    # Arguments without features are not simulated
+    result = simulate([{"AVX", "AVX2"}], compiler, "x86_64")
+    assert "intel" not in result.counts
+    assert result.counts["avx2"] == 1
+
+    # Arguments also depending on the microarchitecture are not simulated
+    from compilertools.processors.x86_64 import X86_64_LEVELS
+
+    result = simulate([X86_64_LEVELS[4]], compiler, "x86_64")
+    assert not any(suffixes.startswith("march_") for suffixes in result.counts)
+
+    # No hosts
+    assert simulate([], compiler, "arm_64").fallback_rate == 0.0
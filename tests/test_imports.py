@@ -6,12 +6,19 @@ def tests_update_ext_suffixes():
     from collections import OrderedDict
     from importlib.machinery import EXTENSION_SUFFIXES
     import compilertools._core as core
+    import compilertools.imports as imports
     from compilertools._core import suffix_from_args
-    from compilertools.imports import ARCH_SUFFIXES, update_extensions_suffixes
+    from compilertools.imports import update_extensions_suffixes
+
+    arch_suffixes = imports.ARCH_SUFFIXES
+    suffixes_tables = imports._SUFFIXES_TABLES
 
     # Create fake compiler and extensions on environments without ARCH_SUFFIXES
-    if not ARCH_SUFFIXES:
-        ARCH_SUFFIXES += [".fake1", ".fake2"]
+    if not arch_suffixes:
+        imports._ARCH_SUFFIXES = (
+            f".fake1{EXTENSION_SUFFIXES[0]}",
+            f".fake2{EXTENSION_SUFFIXES[0]}",
+        )
 
         def get_compile_args(*_, **__):
             """Mock function."""
@@ -34,7 +41,7 @@ def tests_update_ext_suffixes():
     # Test
     try:
         # Test update
-        update_extensions_suffixes("gcc")
+        assert update_extensions_suffixes("gcc") == "gcc"
 
         get_compile_args("gcc", current_machine=True)
         suffixes = suffix_from_args(
@@ -42,25 +49,33 @@ def tests_update_ext_suffixes():
         )
 
         for suffixe in suffixes:
-            assert suffixe in ARCH_SUFFIXES
+            assert suffixe in imports.ARCH_SUFFIXES
 
         # Test extensions presence
         result = []
         for ext in EXTENSION_SUFFIXES:
             result.append(False)
-            for arch_ext in ARCH_SUFFIXES:
+            for arch_ext in imports.ARCH_SUFFIXES:
                 if ext in arch_ext:
                     result[-1] = True
                     break
 
         assert all(result)
 
+        # Compiler table
+        assert imports._SUFFIXES_TABLES["gcc"] == tuple(suffixes)
+
         # Tests not crash on exception
-        update_extensions_suffixes("fake_compiler")
+        assert update_extensions_suffixes("fake_compiler") is None
+        assert "fake_compiler" not in imports._SUFFIXES_TABLES
+
+        # Tables are replaced, not modified
+        assert isinstance(imports.ARCH_SUFFIXES, tuple)
 
     finally:
         if core_get_compile_args:
-            ARCH_SUFFIXES.clear()
+            imports._ARCH_SUFFIXES = arch_suffixes
+            imports._SUFFIXES_TABLES = suffixes_tables
             core.get_compile_args = core_get_compile_args
 
 
@@ -69,22 +84,27 @@ def tests_extension_file_finder():
     import sys
     from os.path import join
     from tempfile import TemporaryDirectory
-    import importlib.machinery as machinery
+    from importlib.machinery import EXTENSION_SUFFIXES
     import compilertools.imports as imports
-    from compilertools.imports import (
-        _ExtensionFileFinder,
-        ARCH_SUFFIXES,
-        _PROCESSED_COMPILERS,
-    )
+    from compilertools.imports import _ExtensionFileFinder
+
+    arch_suffixes = imports.ARCH_SUFFIXES
+    suffixes_tables = imports._SUFFIXES_TABLES
 
     # Create fake compiler and extensions on environments without ARCH_SUFFIXES
-    if not ARCH_SUFFIXES:
-        ARCH_SUFFIXES += [".fake1", ".fake2"]
-        _PROCESSED_COMPILERS.add("fake_compiler")
+    if not arch_suffixes:
+        imports._ARCH_SUFFIXES = (
+            f".fake1{EXTENSION_SUFFIXES[0]}",
+            f".fake2{EXTENSION_SUFFIXES[0]}",
+        )
+        imports._SUFFIXES_TABLES = {"fake_compiler": imports._ARCH_SUFFIXES}
 
         def update_extensions_suffixes(compiler):
             """Mock function."""
-            _PROCESSED_COMPILERS.add(compiler)
+            imports._SUFFIXES_TABLES = {
+                **imports._SUFFIXES_TABLES,
+                compiler: imports._ARCH_SUFFIXES,
+            }
 
         imports_update_extensions_suffixes = imports.update_extensions_suffixes
         imports.update_extensions_suffixes = update_extensions_suffixes
@@ -96,36 +116,22 @@ def tests_extension_file_finder():
     assert isinstance(sys.meta_path[0], _ExtensionFileFinder)
 
     # Test find_spec
-    # Monkey patch importlib machinery for don't need to import unexisting file.
-    module_spec = machinery.ModuleSpec
-    extension_file_loader = machinery.ExtensionFileLoader
-
-    def dummy_spec(_, loader, *, origin=None):
-        """Mock ModuleSpec."""
-        assert loader == origin
-        return origin
-
-    def dummy_fileloader(_, path):
-        """Mock ExtensionFileLoader."""
-        return path
-
-    machinery.ModuleSpec = dummy_spec
-    machinery.ExtensionFileLoader = dummy_fileloader
-
     try:
         for use_compiler_file in (False, True):
             with TemporaryDirectory() as tmp:
                 sys.path.insert(0, tmp)
 
                 name = "compilertools_dummy_file"
-                ext = ARCH_SUFFIXES[0]
+                ext = imports.ARCH_SUFFIXES[0]
                 file_path = join(tmp, "".join([name, ext]))
                 with open(file_path, "wt") as file:
                     file.write("")
 
                 if use_compiler_file:
-                    compiler = _PROCESSED_COMPILERS.pop()
-                    assert compiler not in _PROCESSED_COMPILERS
+                    tables = imports._SUFFIXES_TABLES.copy()
+                    compiler = next(iter(tables))
+                    del tables[compiler]
+                    imports._SUFFIXES_TABLES = tables
                     path_compiler = join(tmp, "".join([name, ".compilertools"]))
                     with open(path_compiler, "wt") as file:
                         file.write(compiler)
@@ -133,24 +139,613 @@ def tests_extension_file_finder():
                 file_finder = _ExtensionFileFinder()
 
                 # Existing file
-                assert file_finder.find_spec(name, "") == file_path
+                spec = file_finder.find_spec(name, None)
+                assert spec.origin == file_path
+                assert spec.loader.path == file_path
 
                 if use_compiler_file:
-                    assert compiler in _PROCESSED_COMPILERS
+                    assert compiler in imports._SUFFIXES_TABLES
 
                     # Checks called twice
-                    assert file_finder.find_spec(name, "") == file_path
+                    assert file_finder.find_spec(name, None).origin == file_path
 
                 # non-existing file
-                assert file_finder.find_spec("compilertools_notexists_file", "") is None
+                assert (
+                    file_finder.find_spec("compilertools_notexists_file", None) is None
+                )
 
                 sys.path.remove(tmp)
 
     finally:
-        machinery.ModuleSpec = module_spec
-        machinery.ExtensionFileLoader = extension_file_loader
-
         if imports_update_extensions_suffixes:
-            ARCH_SUFFIXES.clear()
-            _PROCESSED_COMPILERS.discard("fake_compiler")
+            imports._ARCH_SUFFIXES = arch_suffixes
+            imports._SUFFIXES_TABLES = suffixes_tables
             imports.update_extensions_suffixes = imports_update_extensions_suffixes
+
+
+def tests_lazy_detection():
+    """Test suffixes detection is only performed when required."""
+    import sys
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from importlib.machinery import EXTENSION_SUFFIXES
+    from threading import Thread
+    import compilertools.imports as imports
+    from compilertools.imports import _ExtensionFileFinder, _directory_index
+
+    calls = []
+
+    def update_extensions_suffixes(compiler):
+        """Mock function."""
+        calls.append(compiler)
+
+    imports_update_extensions_suffixes = imports.update_extensions_suffixes
+    imports.update_extensions_suffixes = update_extensions_suffixes
+    detected = imports._DETECTED
+    imports._DETECTED = False
+
+    try:
+        with TemporaryDirectory() as tmp:
+            sys.path.insert(0, tmp)
+            file_finder = _ExtensionFileFinder()
+
+            # Module without variants
+            with open(join(tmp, f"compilertools_dummy{EXTENSION_SUFFIXES[0]}"), "wt"):
+                pass
+            assert file_finder.find_spec("compilertools_dummy", None) is None
+            assert _directory_index(tmp)[1] == frozenset()
+            assert not calls
+
+            # Module with variants
+            with open(
+                join(tmp, f"compilertools_dummy.var{EXTENSION_SUFFIXES[0]}"), "wt"
+            ):
+                pass
+            assert _directory_index(tmp)[1] == {"compilertools_dummy"}
+            file_finder.find_spec("compilertools_dummy", None)
+            assert calls == [None]
+
+            # Detected only once
+            file_finder.find_spec("compilertools_dummy", None)
+            assert calls == [None]
+
+            sys.path.remove(tmp)
+
+        # Not existing directory
+        assert _directory_index(tmp) == (frozenset(), frozenset(), {})
+
+        # Detection on "ARCH_SUFFIXES" access
+        imports._DETECTED = False
+        assert imports.ARCH_SUFFIXES is imports._ARCH_SUFFIXES
+        assert calls == [None, None]
+
+        # Detection in background
+        imports._DETECTED = False
+        imports.warm_up().join()
+        assert calls == [None, None, None]
+        assert imports._DETECTED
+
+        # Import of a module with variants during detection
+        def detect_reentrant(compiler):
+            """Mock function, importing modules like the detection."""
+            calls.append(compiler)
+            imports._detect_suffixes()
+            imports._suffixes_table()
+
+        imports.update_extensions_suffixes = detect_reentrant
+        imports._DETECTED = False
+        thread = Thread(target=imports._detect_suffixes, daemon=True)
+        thread.start()
+        thread.join(10)
+        assert not thread.is_alive()
+        assert calls == [None, None, None, None]
+        assert imports._DETECTED
+
+        # Other attributes
+        from pytest import raises
+
+        with raises(AttributeError):
+            imports.not_exists
+
+    finally:
+        imports.update_extensions_suffixes = imports_update_extensions_suffixes
+        imports._DETECTED = detected
+
+
+def tests_directory_index():
+    """Test _directory_index cache."""
+    from os import listdir
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from importlib import invalidate_caches
+    from compilertools.imports import _directory_index, _DIRECTORIES
+
+    with TemporaryDirectory() as tmp:
+        # Index content
+        assert _directory_index(tmp) == (frozenset(), frozenset(), {})
+
+        # Refreshed on modification time change
+        with open(join(tmp, "file"), "wt"):
+            pass
+        names = _directory_index(tmp)[0]
+        assert names == {"file"}
+
+        # Cached
+        assert _directory_index(tmp)[0] is names
+
+        # Refreshed on "importlib.invalidate_caches"
+        mtime, _ = _DIRECTORIES[tmp]
+        _DIRECTORIES[tmp] = mtime, (frozenset(), frozenset(), {})
+        assert _directory_index(tmp)[0] == frozenset()
+        invalidate_caches()
+        assert _directory_index(tmp)[0] == set(listdir(tmp))
+
+
+def tests_extension_file_finder_package():
+    """Test _ExtensionFileFinder with modules inside packages."""
+    import sys
+    from os import makedirs
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from compilertools.imports import _ExtensionFileFinder, ARCH_SUFFIXES
+
+    if not ARCH_SUFFIXES:
+        from pytest import skip
+
+        skip("ARCH_SUFFIXES is empty on current environment")
+
+    file_finder = _ExtensionFileFinder()
+    with TemporaryDirectory() as tmp:
+        package = join(tmp, "compilertools_dummy_package", "sub")
+        makedirs(package)
+        file_path = join(package, f"_ext{ARCH_SUFFIXES[0]}")
+        with open(file_path, "wt"):
+            pass
+
+        # Found in package path
+        spec = file_finder.find_spec("compilertools_dummy_package.sub._ext", [package])
+        assert spec.name == "compilertools_dummy_package.sub._ext"
+        assert spec.origin == file_path
+
+        # Not searched in "sys.path"
+        sys.path.insert(0, package)
+        try:
+            assert (
+                file_finder.find_spec("compilertools_dummy_package.sub._ext", [tmp])
+                is None
+            )
+        finally:
+            sys.path.remove(package)
+
+        # Top level module with the same name is not found in the package
+        assert file_finder.find_spec("_ext", None) is None
+
+
+def tests_extension_file_finder_manifest():
+    """Test _ExtensionFileFinder with build manifest."""
+    from json import dump
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from compilertools.imports import (
+        _ExtensionFileFinder,
+        ARCH_SUFFIXES,
+        _SUFFIXES_TABLES,
+        MANIFEST_NAME,
+        MANIFEST_VERSION,
+    )
+
+    compiler = next(
+        (name for name, table in _SUFFIXES_TABLES.items() if len(table) > 1), None
+    )
+    if compiler is None:
+        from pytest import skip
+
+        skip("ARCH_SUFFIXES is too short on current environment")
+
+    file_finder = _ExtensionFileFinder()
+    fullname = "compilertools_dummy_package._ext"
+    with TemporaryDirectory() as tmp:
+        for suffix in ARCH_SUFFIXES[:2]:
+            with open(join(tmp, f"_ext{suffix}"), "wt"):
+                pass
+
+        # Without manifest, best file is found
+        assert file_finder.find_spec(fullname, [tmp]).origin == join(
+            tmp, f"_ext{ARCH_SUFFIXES[0]}"
+        )
+
+        # With manifest, only files in manifest are used
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "extensions": {
+                "_ext": {
+                    "compiler": compiler,
+                    "variants": {
+                        "variant": {"file": f"_ext{ARCH_SUFFIXES[1]}", "features": []}
+                    },
+                }
+            },
+        }
+        with open(join(tmp, MANIFEST_NAME), "wt") as file:
+            dump(manifest, file)
+        assert file_finder.find_spec(fullname, [tmp]).origin == join(
+            tmp, f"_ext{ARCH_SUFFIXES[1]}"
+        )
+
+        # Other modules in manifest directory are not found
+        assert file_finder.find_spec("compilertools_dummy_package.other", [tmp]) is None
+
+        # Files in manifest but missing on disk are skipped
+        with open(join(tmp, f"_missing{ARCH_SUFFIXES[1]}"), "wt"):
+            pass
+        manifest["extensions"]["_missing"] = {
+            "compiler": compiler,
+            "variants": {
+                variant: {"file": f"_missing{suffix}", "features": []}
+                for variant, suffix in zip(("best", "other"), ARCH_SUFFIXES[:2])
+            },
+        }
+        with open(join(tmp, MANIFEST_NAME), "wt") as file:
+            dump(manifest, file)
+        file_finder.invalidate_caches()
+        assert file_finder.find_spec(
+            "compilertools_dummy_package._missing", [tmp]
+        ).origin == join(tmp, f"_missing{ARCH_SUFFIXES[1]}")
+
+        # Invalid manifest
+        manifest["version"] = -1
+        with open(join(tmp, MANIFEST_NAME), "wt") as file:
+            dump(manifest, file)
+        file_finder.invalidate_caches()
+        assert file_finder.find_spec(fullname, [tmp]).origin == join(
+            tmp, f"_ext{ARCH_SUFFIXES[0]}"
+        )
+
+
+def tests_stats():
+    """Test import statistics."""
+    from json import loads
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from compilertools.imports import (
+        stats,
+        _dump_stats,
+        _ExtensionFileFinder,
+        _ExtensionFileLoader,
+        _Timer,
+    )
+
+    stats(reset=True)
+    assert stats() == {
+        "update_extensions_suffixes": {"calls": 0, "time": 0.0},
+        "cpu_detection": {"calls": 0, "time": 0.0},
+        "compiler_probing": {"calls": 0, "time": 0.0},
+        "find_spec_calls": 0,
+        "find_spec_hits": 0,
+        "find_spec_misses": 0,
+        "filesystem_probes": 0,
+        "directory_cache_hits": 0,
+        "directory_cache_misses": 0,
+        "dlopen": {},
+    }
+
+    # Timers
+    with _Timer("cpu_detection"):
+        pass
+    result = stats()
+    assert result["cpu_detection"]["calls"] == 1
+    assert result["cpu_detection"]["time"] >= 0.0
+
+    # Returned statistics are a copy
+    result["cpu_detection"]["calls"] = 10
+    assert stats()["cpu_detection"]["calls"] == 1
+
+    # Finder counters
+    file_finder = _ExtensionFileFinder()
+    with TemporaryDirectory() as tmp:
+        stats(reset=True)
+        file_finder.find_spec("compilertools_notexists_file", [tmp])
+        file_finder.find_spec("compilertools_notexists_file", [tmp])
+        result = stats()
+        assert result["find_spec_calls"] == 2
+        assert result["find_spec_misses"] == 2
+        assert result["find_spec_hits"] == 0
+        assert result["directory_cache_misses"] == 1
+        assert result["directory_cache_hits"] == 1
+        assert result["filesystem_probes"] == 3
+
+        # Dump
+        path = join(tmp, "stats.jsonl")
+        _dump_stats(path)
+        _dump_stats(path)
+        with open(path, "rt") as file:
+            lines = file.read().splitlines()
+        assert len(lines) == 2
+        assert loads(lines[0]) == result
+
+    # Loading time
+    import _json as module
+
+    if getattr(module, "__file__", None):
+        stats(reset=True)
+        loader = _ExtensionFileLoader("_json", module.__file__)
+        spec = type(module.__spec__)("_json", loader, origin=module.__file__)
+        loader.create_module(spec)
+        assert stats()["dlopen"]["_json"] >= 0.0
+
+
+def tests_detection_handoff():
+    """Test detection results handoff to child processes."""
+    from json import loads, dumps
+    from os import environ
+    import compilertools.imports as imports
+    import compilertools._cache as cache
+    from compilertools.compilers import get_compiler
+    from compilertools.processors import get_processor
+    from compilertools.imports import (
+        export_detection,
+        _inherit_detection,
+        HANDOFF_ENV_VAR,
+    )
+
+    calls = []
+
+    def update_extensions_suffixes(compiler):
+        """Mock function."""
+        calls.append(compiler)
+
+    arch_suffixes = imports._ARCH_SUFFIXES
+    suffixes_tables = imports._SUFFIXES_TABLES
+    default_compiler = imports._DEFAULT_COMPILER
+    inherited = cache._INHERITED_PROCESSORS.copy()
+    detected = imports._DETECTED
+    imports_update_extensions_suffixes = imports.update_extensions_suffixes
+    environ_value = environ.get(HANDOFF_ENV_VAR)
+    try:
+        # Export
+        content = loads(export_detection())
+        assert environ[HANDOFF_ENV_VAR] == dumps(content)
+        assert content["default"] == default_compiler
+        assert content["tables"] == {
+            name: list(table) for name, table in suffixes_tables.items()
+        }
+
+        # Import in "child process"
+        compiler = get_compiler("gcc")
+        compiler.compile_args(current_machine=True)
+        imports.update_extensions_suffixes = update_extensions_suffixes
+        imports._ARCH_SUFFIXES = ()
+        imports._SUFFIXES_TABLES = {}
+        imports._DEFAULT_COMPILER = None
+        cache._INHERITED_PROCESSORS.clear()
+        imports._DETECTED = False
+        imports._detect_suffixes()
+        assert not calls
+        assert imports._SUFFIXES_TABLES == suffixes_tables
+        assert imports._DEFAULT_COMPILER == default_compiler
+        if default_compiler is not None:
+            assert imports._ARCH_SUFFIXES[: len(suffixes_tables[default_compiler])] == (
+                suffixes_tables[default_compiler]
+            )
+        assert cache._INHERITED_PROCESSORS == content["processors"]
+
+        # Compilers arguments computed with previous processors are not reused
+        assert get_compiler("gcc") is not compiler
+
+        # Inherited processor detection results
+        for arch, state in content["processors"].items():
+            state = state.copy()
+            state["brand"] = "inherited"
+            cache._INHERITED_PROCESSORS[arch] = state
+            assert get_processor(arch, current_machine=True).brand == "inherited"
+
+        # Invalid or not matching content
+        for key, value in (
+            ("version", -1),
+            ("machine", "other"),
+            ("extensions", [".other"]),
+            ("tables", {"gcc": [1]}),
+            ("default", "not_exists"),
+        ):
+            invalid = content.copy()
+            invalid[key] = value
+            environ[HANDOFF_ENV_VAR] = dumps(invalid)
+            assert not _inherit_detection()
+
+        for value in ("", "{", "[]"):
+            environ[HANDOFF_ENV_VAR] = value
+            assert not _inherit_detection()
+
+        # Detection is performed if nothing to inherit
+        imports._DETECTED = False
+        imports._detect_suffixes()
+        assert calls == [None]
+
+    finally:
+        imports.update_extensions_suffixes = imports_update_extensions_suffixes
+        imports._ARCH_SUFFIXES = arch_suffixes
+        imports._SUFFIXES_TABLES = suffixes_tables
+        imports._DEFAULT_COMPILER = default_compiler
+        cache._INHERITED_PROCESSORS.clear()
+        cache._INHERITED_PROCESSORS.update(inherited)
+        imports._DETECTED = detected
+        if environ_value is None:
+            del environ[HANDOFF_ENV_VAR]
+        else:
+            environ[HANDOFF_ENV_VAR] = environ_value
+
+
+def tests_concurrent_suffixes_update():
+    """Test suffixes tables concurrent updates."""
+    from threading import Thread
+    import compilertools.imports as imports
+    from compilertools.imports import _add_suffixes_table
+
+    arch_suffixes = imports._ARCH_SUFFIXES
+    suffixes_tables = imports._SUFFIXES_TABLES
+    imports._ARCH_SUFFIXES = ()
+    imports._SUFFIXES_TABLES = {}
+    try:
+        tables = []
+
+        def update(name):
+            """Add suffixes, and read tables."""
+            _add_suffixes_table(name, [f".{name}{index}" for index in range(20)])
+            tables.append(imports._ARCH_SUFFIXES)
+
+        threads = [Thread(target=update, args=(f"c{index}",)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # No update lost, and order preserved
+        assert len(imports._ARCH_SUFFIXES) == 160
+        assert set(imports._SUFFIXES_TABLES) == {f"c{index}" for index in range(8)}
+        for index in range(8):
+            suffixes = [
+                suffix
+                for suffix in imports._ARCH_SUFFIXES
+                if suffix.startswith(f".c{index}")
+            ]
+            assert suffixes == [f".c{index}{number}" for number in range(20)]
+
+        # Tables read by threads are complete
+        for table in tables:
+            assert len(table) % 20 == 0
+
+    finally:
+        imports._ARCH_SUFFIXES = arch_suffixes
+        imports._SUFFIXES_TABLES = suffixes_tables
+
+
+def tests_extension_file_finder_compiler_tables():
+    """Test _ExtensionFileFinder only probes suffixes of the module compiler."""
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from importlib.machinery import EXTENSION_SUFFIXES
+    import compilertools.imports as imports
+    from compilertools.imports import _ExtensionFileFinder
+
+    ext = EXTENSION_SUFFIXES[0]
+    tables = {
+        "compiler1": (f".inst1{ext}", ext),
+        "compiler2": (f".inst2{ext}", ext),
+    }
+
+    def update_extensions_suffixes(compiler):
+        """Mock function."""
+        imports._SUFFIXES_TABLES = {
+            **imports._SUFFIXES_TABLES,
+            compiler: tables[compiler],
+        }
+        return compiler
+
+    arch_suffixes = imports._ARCH_SUFFIXES
+    suffixes_tables = imports._SUFFIXES_TABLES
+    default_compiler = imports._DEFAULT_COMPILER
+    detected = imports._DETECTED
+    imports_update_extensions_suffixes = imports.update_extensions_suffixes
+    imports.update_extensions_suffixes = update_extensions_suffixes
+    imports._ARCH_SUFFIXES = tables["compiler1"] + tables["compiler2"][:1]
+    imports._SUFFIXES_TABLES = {"compiler1": tables["compiler1"]}
+    imports._DEFAULT_COMPILER = "compiler1"
+    imports._DETECTED = True
+
+    file_finder = _ExtensionFileFinder()
+    try:
+        with TemporaryDirectory() as tmp:
+            for name in ("_ext1", "_ext2"):
+                for suffix in (f".inst1{ext}", f".inst2{ext}"):
+                    with open(join(tmp, f"{name}{suffix}"), "wt"):
+                        pass
+            with open(join(tmp, "_ext2.compilertools"), "wt") as file:
+                file.write("compiler2")
+
+            # Default compiler
+            spec = file_finder.find_spec("package._ext1", [tmp])
+            assert spec.origin == join(tmp, f"_ext1.inst1{ext}")
+
+            # Other compiler, table computed on first need
+            spec = file_finder.find_spec("package._ext2", [tmp])
+            assert spec.origin == join(tmp, f"_ext2.inst2{ext}")
+            assert imports._SUFFIXES_TABLES["compiler2"] == tables["compiler2"]
+
+    finally:
+        imports.update_extensions_suffixes = imports_update_extensions_suffixes
+        imports._ARCH_SUFFIXES = arch_suffixes
+        imports._SUFFIXES_TABLES = suffixes_tables
+        imports._DEFAULT_COMPILER = default_compiler
+        imports._DETECTED = detected
+
+
+def tests_extension_file_finder_permissions():
+    """Test _ExtensionFileFinder requests permissions before selecting a file."""
+    import sys
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from importlib.machinery import EXTENSION_SUFFIXES
+    import compilertools.imports as imports
+    from compilertools.imports import _ExtensionFileFinder
+    from compilertools.processors import _linux
+
+    ext = EXTENSION_SUFFIXES[0]
+    table = (f".amx-avx512{ext}", f".avx512{ext}", ext)
+    granted = False
+    calls = []
+
+    def request_xstate_permission(xfeature):
+        """Mock function."""
+        calls.append(xfeature)
+        return granted
+
+    arch_suffixes = imports._ARCH_SUFFIXES
+    suffixes_tables = imports._SUFFIXES_TABLES
+    default_compiler = imports._DEFAULT_COMPILER
+    detected = imports._DETECTED
+    permissions = imports._PERMISSIONS
+    platform = sys.platform
+    linux_request_xstate_permission = _linux.request_xstate_permission
+    _linux.request_xstate_permission = request_xstate_permission
+    imports._ARCH_SUFFIXES = table
+    imports._SUFFIXES_TABLES = {"compiler": table}
+    imports._DEFAULT_COMPILER = "compiler"
+    imports._DETECTED = True
+    imports._PERMISSIONS = {}
+    sys.platform = "linux"
+
+    file_finder = _ExtensionFileFinder()
+    try:
+        with TemporaryDirectory() as tmp:
+            for suffix in table:
+                with open(join(tmp, f"_ext{suffix}"), "wt"):
+                    pass
+
+            # Permission refused: next file is used, request is done only once
+            for _ in range(2):
+                spec = file_finder.find_spec("package._ext", [tmp])
+                assert spec.origin == join(tmp, f"_ext.avx512{ext}")
+            assert calls == [_linux.XFEATURE_XTILEDATA]
+
+            # Permission granted
+            imports._PERMISSIONS = {}
+            granted = True
+            spec = file_finder.find_spec("package._ext", [tmp])
+            assert spec.origin == join(tmp, f"_ext.amx-avx512{ext}")
+
+            # No permission required on other platforms
+            imports._PERMISSIONS = {}
+            granted = False
+            sys.platform = "win32"
+            spec = file_finder.find_spec("package._ext", [tmp])
+            assert spec.origin == join(tmp, f"_ext.amx-avx512{ext}")
+            assert len(calls) == 2
+
+    finally:
+        sys.platform = platform
+        _linux.request_xstate_permission = linux_request_xstate_permission
+        imports._ARCH_SUFFIXES = arch_suffixes
+        imports._SUFFIXES_TABLES = suffixes_tables
+        imports._DEFAULT_COMPILER = default_compiler
+        imports._DETECTED = detected
+        imports._PERMISSIONS = permissions
@@ -45,10 +45,30 @@ def tests_get_processor():
         assert processor.__class__.__module__ == f"compilertools.processors.{name}"
         assert processor.current_machine is current_machine
 
+        # Interned processors
+        assert get_processor(name, current_machine) is processor
+
+    from compilertools.processors import clear_processors
+
+    processor = get_processor("x86_64", current_machine=True)
+    assert get_processor("amd64", current_machine=True) is processor
+    assert get_processor("x86_64") is not processor
+
+    # Compilers arguments computed with previous processors are cleared
+    from compilertools.compilers import get_compiler
+
+    compiler = get_compiler("gcc")
+    compiler.compile_args(current_machine=True)
+    assert compiler._args_cache
+
+    clear_processors()
+    assert get_processor("x86_64", current_machine=True) is not processor
+    assert not compiler._args_cache
+
 
 def tests_processor_base():
     """Test ProcessorBase."""
-    from compilertools.processors import ProcessorBase
+    from compilertools.processors import ProcessorBase, Features
 
     # Test current machine
     processor = ProcessorBase()
@@ -66,9 +86,128 @@ def tests_processor_base():
     processor["brand"] = "brand"
     assert processor.brand == "brand"
 
-    assert processor.features == []
+    assert processor.features == set()
     processor["features"] = ["feature1", "feature2"]
-    assert processor.features == ["feature1", "feature2"]
+    assert processor.features == {"feature1", "feature2"}
+    assert isinstance(processor.features, Features)
 
     # Test arch
     assert processor.arch == "_core"
+
+
+def tests_features():
+    """Test Features."""
+    from pickle import dumps, loads
+    from compilertools.processors import Features
+
+    features = Features(("feature1", "feature2", "feature3"))
+    assert features == {"feature1", "feature2", "feature3"}
+    assert "feature1" in features
+    assert "feature4" not in features
+    assert Features() == set()
+    assert Features().mask == 0
+
+    # Masks
+    mask = Features.mask_of(("feature1", "feature2"))
+    assert Features(("feature2", "feature1")).mask == mask
+    assert Features.mask_of(("feature1", "feature2")) == mask
+    assert features.mask & mask == mask
+    assert features.has_all(("feature1", "feature2"))
+    assert features.has_all(mask)
+    assert features.has_all(())
+    assert not features.has_all(("feature1", "feature4"))
+    assert not Features(("feature1",)).has_all(mask)
+
+    # Immutable
+    from pytest import raises
+
+    with raises(AttributeError):
+        features.add("feature4")
+
+    # Pickle
+    assert loads(dumps(features)).mask == features.mask
+
+    # Representation
+    assert repr(Features(("b", "a"))) == "Features(['a', 'b'])"
+
+
+def tests_processor_profile():
+    """Test ProcessorBase.snapshot and ProcessorBase.from_profile."""
+    from json import load
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from pytest import raises
+    from compilertools.compilers.gcc import Compiler
+    from compilertools.processors import ProcessorBase, get_arch
+    from compilertools.processors._core import PROFILE_VERSION
+    from compilertools.processors.arm_64 import Processor as Arm64Processor
+
+    # Current machine profile, replayed with the same results
+    with TemporaryDirectory() as tmp:
+        path = join(tmp, "profile.json")
+        profile = ProcessorBase.snapshot(path)
+        with open(path, "rt") as file:
+            assert load(file) == profile
+
+        processor = ProcessorBase.from_profile(path)
+
+    assert profile["version"] == PROFILE_VERSION
+    assert processor.arch == profile["arch"]
+    current = get_processor_class(get_arch())(current_machine=True)
+    for name in ("vendor", "brand", "features", "cache_hierarchy", "topology"):
+        assert processor[name] == current[name]
+
+    # Profile selecting compiler arguments
+    compiler = Compiler(current_compiler=True)
+    compiler["version"] = 12.0
+    assert compiler.compile_args(current_machine=processor) == compiler.compile_args(
+        current_machine=True
+    )
+
+    # Profile recorded on another architecture
+    profile = {
+        "version": PROFILE_VERSION,
+        "arch": "arm_64",
+        "reads": {
+            "cpuinfo": {
+                "Features": (
+                    "fp asimd atomics fphp asimdhp asimdrdm crc32 lrcpc asimddp"
+                    " sve i8mm bf16"
+                ),
+                "CPU implementer": "0x41",
+                "CPU part": "0xd40",
+            }
+        },
+    }
+    processor = Arm64Processor.from_profile(profile)
+    assert processor.microarchitecture == "neoverse-v1"
+    assert processor.features.has_all(("SVE", "DOTPROD", "LSE"))
+    assert processor.cache_hierarchy == {}
+    args = compiler.compile_args(current_machine=processor)
+    assert list(args) == ["mcpu_neoverse_v1", "sve", "dotprod", "lse", ""]
+
+    # Bad profiles
+    with raises(ValueError):
+        ProcessorBase.from_profile(dict(profile, version=0))
+    with raises(ValueError):
+        Arm64Processor.from_profile(dict(profile, arch="x86_64"))
+
+
+def get_processor_class(arch):
+    """
+    Return the processor class of an architecture.
+
+    Parameters
+    ----------
+    arch : str
+        Architecture.
+
+    Returns
+    -------
+    class
+        Processor class.
+    """
+    from compilertools._utils import import_class
+    from compilertools.processors import ProcessorBase
+
+    return import_class("processors", arch, "Processor", ProcessorBase)
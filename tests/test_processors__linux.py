@@ -0,0 +1,141 @@
+"""Tests for Linux CPU information."""
+
+CPUINFO = """processor	: 0
+vendor_id	: GenuineIntel
+cpu family	: 6
+model name	: Intel(R) Xeon(R) Processor
+flags		: fpu pni sse4_1 xsave
+
+processor	: 1
+vendor_id	: GenuineIntel
+"""
+
+
+def tests_cpuinfo():
+    """Test cpuinfo."""
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from compilertools.processors._linux import cpuinfo
+
+    with TemporaryDirectory() as tmp:
+        path = join(tmp, "cpuinfo")
+
+        # Not existing
+        assert cpuinfo(path) is None
+
+        # Empty
+        with open(path, "wt") as file:
+            file.write("\n")
+        assert cpuinfo(path) is None
+
+        # First block only
+        with open(path, "wt") as file:
+            file.write(CPUINFO)
+        assert cpuinfo(path) == {
+            "processor": "0",
+            "vendor_id": "GenuineIntel",
+            "cpu family": "6",
+            "model name": "Intel(R) Xeon(R) Processor",
+            "flags": "fpu pni sse4_1 xsave",
+        }
+
+
+def tests_read_sysfs():
+    """Test read_sysfs."""
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    import compilertools.processors._linux as linux
+
+    sysfs_cpu = linux.SYSFS_CPU
+    try:
+        with TemporaryDirectory() as tmp:
+            linux.SYSFS_CPU = tmp
+            with open(join(tmp, "modalias"), "wt") as file:
+                file.write("cpu:type:x86\n")
+            assert linux.read_sysfs("modalias") == "cpu:type:x86"
+            assert linux.read_sysfs("not_exists") is None
+    finally:
+        linux.SYSFS_CPU = sysfs_cpu
+
+
+def tests_getauxval():
+    """Test getauxval."""
+    from platform import system
+    from compilertools.processors._linux import getauxval, AT_HWCAP
+
+    assert isinstance(getauxval(AT_HWCAP), int)
+    if system() != "Linux":
+        assert getauxval(AT_HWCAP) == 0
+
+
+def tests_request_xstate_permission():
+    """Test request_xstate_permission."""
+    from platform import system
+    from compilertools.processors._linux import (
+        request_xstate_permission,
+        XFEATURE_XTILEDATA,
+    )
+
+    # Not a dynamically enabled state
+    assert request_xstate_permission(0) is False
+
+    granted = request_xstate_permission(XFEATURE_XTILEDATA)
+    assert isinstance(granted, bool)
+    if system() != "Linux":
+        assert granted is False
+
+
+def tests_caches_topology():
+    """Test caches and topology."""
+    from os import makedirs
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    import compilertools.processors._linux as linux
+
+    def write(path, content):
+        """Write sysfs file."""
+        path = join(tmp, path)
+        makedirs(path.rsplit("/", 1)[0], exist_ok=True)
+        with open(path, "wt") as file:
+            file.write(f"{content}\n")
+
+    sysfs_cpu = linux.SYSFS_CPU
+    try:
+        with TemporaryDirectory() as tmp:
+            linux.SYSFS_CPU = tmp
+
+            # Not available
+            assert linux.caches() is None
+            assert linux.topology() is None
+
+            # Caches
+            for index, (level, cache_type, size, ways) in enumerate(
+                (
+                    (1, "Data", "48K", 12),
+                    (1, "Instruction", "32K", 8),
+                    (2, "Unified", "2048K", 16),
+                    (3, "Unified", "105M", 15),
+                )
+            ):
+                path = f"cpu0/cache/index{index}/"
+                write(path + "level", level)
+                write(path + "type", cache_type)
+                write(path + "size", size)
+                write(path + "coherency_line_size", 64)
+                write(path + "ways_of_associativity", ways)
+            assert linux.caches() == {
+                "L1d": {"size": 49152, "line_size": 64, "associativity": 12},
+                "L1i": {"size": 32768, "line_size": 64, "associativity": 8},
+                "L2": {"size": 2097152, "line_size": 64, "associativity": 16},
+                "L3": {"size": 110100480, "line_size": 64, "associativity": 15},
+            }
+
+            # Topology: 2 packages, 2 cores per package, 2 threads per core
+            for cpu in range(8):
+                write(f"cpu{cpu}/topology/physical_package_id", cpu // 4)
+                write(f"cpu{cpu}/topology/core_id", (cpu // 2) % 2)
+            write("cpu8/online", 0)
+            write("cpufreq/policy0", "")
+            assert linux.topology() == {"packages": 2, "cores": 4, "threads": 8}
+    finally:
+        linux.SYSFS_CPU = sysfs_cpu
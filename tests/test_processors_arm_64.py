@@ -0,0 +1,169 @@
+"""Tests for ARM 64-bit CPU."""
+
+#: "/proc/cpuinfo" first block of an AWS Graviton2 (Neoverse N1)
+CPUINFO_NEOVERSE_N1 = """processor	: 0
+BogoMIPS	: 243.75
+Features	: fp asimd evtstrm aes pmull sha1 sha2 crc32 atomics fphp asimdhp cpuid \
+asimdrdm lrcpc dcpop asimddp ssbs
+CPU implementer	: 0x41
+CPU architecture: 8
+CPU variant	: 0x3
+CPU part	: 0xd0c
+CPU revision	: 1
+
+processor	: 1
+"""
+
+#: "/proc/cpuinfo" first block of an AWS Graviton3 (Neoverse V1)
+CPUINFO_NEOVERSE_V1 = """processor	: 0
+BogoMIPS	: 2100.00
+Features	: fp asimd evtstrm aes pmull sha1 sha2 crc32 atomics fphp asimdhp cpuid \
+asimdrdm jscvt fcma lrcpc dcpop sha3 sm3 sm4 asimddp sha512 sve asimdfhm dit uscat \
+ilrcpc flagm ssbs paca pacg dcpodp svei8mm svebf16 i8mm bf16 dgh rng
+CPU implementer	: 0x41
+CPU architecture: 8
+CPU variant	: 0x1
+CPU part	: 0xd40
+CPU revision	: 1
+"""
+
+
+def tests_processor():
+    """Tests Processor."""
+    import compilertools.processors._linux as linux
+    from compilertools.processors.arm_64 import Processor, _HWCAP, _HWCAP2
+
+    # Not current machine
+    processor = Processor()
+    assert processor.features == set()
+    assert processor.implementer == 0
+    assert processor.part == 0
+    assert processor.vendor == ""
+    assert processor.microarchitecture == ""
+
+    linux_cpuinfo = linux.cpuinfo
+    linux_getauxval = linux.getauxval
+    auxv = {linux.AT_HWCAP: 0, linux.AT_HWCAP2: 0}
+    cpuinfo = {"text": CPUINFO_NEOVERSE_N1}
+
+    def dummy_cpuinfo(*_, **__):
+        """Mock "/proc/cpuinfo" reading."""
+        from os.path import join
+        from tempfile import TemporaryDirectory
+
+        with TemporaryDirectory() as tmp:
+            path = join(tmp, "cpuinfo")
+            with open(path, "wt") as file:
+                file.write(cpuinfo["text"])
+            return linux_cpuinfo(path)
+
+    def dummy_getauxval(key):
+        """Mock "getauxval"."""
+        return auxv[key]
+
+    linux.cpuinfo = dummy_cpuinfo
+    linux.getauxval = dummy_getauxval
+
+    try:
+        # Features from "/proc/cpuinfo"
+        processor = Processor(current_machine=True)
+        assert processor.implementer == 0x41
+        assert processor.part == 0xD0C
+        assert processor.vendor == "ARM"
+        assert processor.brand == ""
+        assert processor.microarchitecture == "neoverse-n1"
+        assert processor.features.has_all(("ASIMD", "DOTPROD", "LSE", "ASIMDRDM"))
+        assert "ASIMDDP" not in processor.features
+        assert "ATOMICS" not in processor.features
+        assert "SVE" not in processor.features
+
+        cpuinfo["text"] = CPUINFO_NEOVERSE_V1
+        processor = Processor(current_machine=True)
+        assert processor.microarchitecture == "neoverse-v1"
+        assert processor.features.has_all(("SVE", "BF16", "I8MM", "DOTPROD"))
+        assert "SVE2" not in processor.features
+
+        # Features from "getauxval"
+        cpuinfo["text"] = ""
+        auxv[linux.AT_HWCAP] = (1 << 1) | (1 << 8) | (1 << 20) | (1 << 22)
+        auxv[linux.AT_HWCAP2] = (1 << 1) | (1 << 40)
+        processor = Processor(current_machine=True)
+        assert processor.features == {"ASIMD", "LSE", "DOTPROD", "SVE", "SVE2"}
+        assert processor.implementer == 0
+        assert processor.vendor == ""
+        assert processor.microarchitecture == ""
+
+        # Names are unique
+        assert not set(_HWCAP.values()) & set(_HWCAP2.values())
+
+        # Cached properties
+        cpuinfo["text"] = CPUINFO_NEOVERSE_V1
+        processor = Processor(current_machine=True)
+        state = processor._export_state()
+        restored = Processor(current_machine=True)
+        restored._import_state(state)
+        assert restored.features == processor.features
+        assert restored.microarchitecture == "neoverse-v1"
+
+    finally:
+        linux.cpuinfo = linux_cpuinfo
+        linux.getauxval = linux_getauxval
+
+
+def tests_processor_args():
+    """Tests compilers arguments selected for ARM 64-bit CPU."""
+    from compilertools.compilers.gcc import Compiler
+    from compilertools.compilers._core import _evaluate_args_matrix
+    from compilertools.processors.arm_64 import Processor
+
+    compiler = Compiler(current_compiler=True)
+    compiler["version"] = 12.0
+
+    # Graviton3 like CPU
+    processor = Processor(current_machine=True)
+    features = {"FP", "ASIMD", "LSE", "ASIMDRDM", "CRC32", "DOTPROD", "SVE"}
+    features |= {"FPHP", "ASIMDHP", "LRCPC", "BF16", "I8MM"}
+    processor["features"] = features
+    processor["implementer"] = 0x41
+    processor["part"] = 0xD40
+    args = _evaluate_args_matrix(
+        compiler._compile_args_matrix("arm_64", processor), processor, compiler
+    )[1]
+    imported = [arg.suffix for arg in args if arg.import_if]
+    assert imported == ["mcpu_neoverse-v1", "sve", "dotprod", "lse", ""]
+
+    # Same CPU with SVE disabled by the kernel or the hypervisor
+    processor = Processor(current_machine=True)
+    processor["features"] = features - {"SVE"}
+    processor["implementer"] = 0x41
+    processor["part"] = 0xD40
+    assert processor.microarchitecture == "neoverse-v1"
+    args = _evaluate_args_matrix(
+        compiler._compile_args_matrix("arm_64", processor), processor, compiler
+    )[1]
+    imported = [arg.suffix for arg in args if arg.import_if]
+    assert imported == ["dotprod", "lse", ""]
+
+    # All microarchitectures have their features defined
+    from compilertools.compilers import gcc, llvm
+    from compilertools.processors.arm_64 import (
+        MICROARCHITECTURES_ISA,
+        _MICROARCHITECTURES,
+    )
+
+    assert set(_MICROARCHITECTURES.values()) <= set(MICROARCHITECTURES_ISA)
+    for module in (gcc, llvm):
+        assert set(module._ARM_64_MICROARCHITECTURES_VERSIONS) <= set(
+            MICROARCHITECTURES_ISA
+        )
+
+    # Unknown CPU without SVE
+    processor = Processor(current_machine=True)
+    processor["features"] = {"ASIMD", "LSE", "ASIMDRDM", "CRC32"}
+    processor["implementer"] = 0
+    processor["part"] = 0
+    args = _evaluate_args_matrix(
+        compiler._compile_args_matrix("arm_64", processor), processor, compiler
+    )[1]
+    imported = [arg.suffix for arg in args if arg.import_if]
+    assert imported == ["lse", ""]
@@ -0,0 +1,52 @@
+"""Tests for POWER 64-bit little-endian CPU."""
+
+
+def tests_processor():
+    """Tests Processor."""
+    import compilertools.processors._linux as linux
+    from compilertools.processors.ppc64le import Processor
+
+    # Not current machine
+    processor = Processor()
+    assert processor.features == set()
+    assert processor.vendor == ""
+    assert processor.microarchitecture == ""
+
+    linux_cpuinfo = linux.cpuinfo
+    linux_getauxval = linux.getauxval
+    info = {"cpu": "POWER9 (raw), altivec supported", "revision": "2.2 (pvr 004e 1202)"}
+    auxv = {
+        # PPC64, ALTIVEC, FPU, VSX, ARCH_2_06, TRUE_LE
+        linux.AT_HWCAP: 0x58000182,
+        # ARCH_2_07, ARCH_3_00, VEC_CRYPTO, DARN, IEEE128
+        linux.AT_HWCAP2: 0x82E00000,
+    }
+    linux.cpuinfo = lambda *_, **__: info
+    linux.getauxval = lambda key: auxv[key]
+
+    try:
+        processor = Processor(current_machine=True)
+        assert processor.vendor == "IBM"
+        assert processor.brand == "POWER9 (raw), altivec supported"
+        assert processor.microarchitecture == "power9"
+        assert processor.features.has_all(
+            ("ALTIVEC", "VSX", "ARCH_2_07", "ARCH_3_00", "IEEE128")
+        )
+        assert "MMA" not in processor.features
+
+        # MMA and microarchitecture from ISA level
+        info = {}
+        auxv[linux.AT_HWCAP2] |= (1 << 18) | (1 << 17)
+        processor = Processor(current_machine=True)
+        assert processor.brand == ""
+        assert processor.microarchitecture == "power10"
+        assert processor.features.has_all(("ARCH_3_1", "MMA"))
+
+        # Unknown
+        auxv[linux.AT_HWCAP2] = 0
+        processor = Processor(current_machine=True)
+        assert processor.microarchitecture == ""
+
+    finally:
+        linux.cpuinfo = linux_cpuinfo
+        linux.getauxval = linux_getauxval
@@ -0,0 +1,107 @@
+"""Tests for RISC-V 64-bit CPU."""
+
+#: "/proc/cpuinfo" first block of a SpacemiT K1
+CPUINFO_K1 = {
+    "processor": "0",
+    "hart": "0",
+    "model name": "Spacemit(R) X60",
+    "isa": (
+        "rv64imafdcv_zicbom_zicboz_zicntr_zicond_zicsr_zifencei_zihintpause_"
+        "zihpm_zfh_zfhmin_zca_zcd_zba_zbb_zbc_zbs_zkt_zve32f_zve32x_zve64d_zve64f_"
+        "zve64x_zvfh_zvfhmin_zvkt_sscofpmf_sstc_svinval_svnapot_svpbmt"
+    ),
+    "mmu": "sv39",
+    "mvendorid": "0x710",
+    "marchid": "0x8000000058000001",
+    "mimpid": "0x1000000049772200",
+}
+
+
+def tests_parse_isa():
+    """Tests ISA strings parsing."""
+    from compilertools.processors.riscv64 import _parse_isa
+
+    assert _parse_isa("rv64imafdc") == {"I", "M", "A", "F", "D", "C"}
+    assert _parse_isa("rv64gc") == {
+        "I",
+        "M",
+        "A",
+        "F",
+        "D",
+        "C",
+        "ZICSR",
+        "ZIFENCEI",
+    }
+    assert _parse_isa("rv64imafdcv_zba_zbb_sstc") == {
+        "I",
+        "M",
+        "A",
+        "F",
+        "D",
+        "C",
+        "V",
+        "ZBA",
+        "ZBB",
+        "SSTC",
+    }
+
+    # Multi-letter extension without separator
+    assert _parse_isa("rv64imaczicsr_zifencei") == {
+        "I",
+        "M",
+        "A",
+        "C",
+        "ZICSR",
+        "ZIFENCEI",
+    }
+
+    # Versions
+    assert _parse_isa("rv64i2p1_m2p0_v1p0_zba1p0_zvl128b1p0") == {
+        "I",
+        "M",
+        "V",
+        "ZBA",
+        "ZVL128B",
+    }
+
+    # Not RISC-V
+    assert _parse_isa("") == set()
+    assert _parse_isa("x86_64") == set()
+
+
+def tests_processor():
+    """Tests Processor."""
+    import compilertools.processors._linux as linux
+    from compilertools.processors.riscv64 import Processor
+
+    # Not current machine
+    processor = Processor()
+    assert processor.features == set()
+    assert processor.vendor == ""
+    assert processor.brand == ""
+
+    linux_cpuinfo = linux.cpuinfo
+    linux_getauxval = linux.getauxval
+    info = dict(CPUINFO_K1)
+    auxv = {linux.AT_HWCAP: 0}
+    linux.cpuinfo = lambda *_, **__: info
+    linux.getauxval = lambda key: auxv[key]
+
+    try:
+        # Features from "/proc/cpuinfo"
+        processor = Processor(current_machine=True)
+        assert processor.vendor == ""
+        assert processor.features.has_all(("I", "M", "A", "F", "D", "C", "V"))
+        assert processor.features.has_all(("ZBA", "ZBB", "ZVE64D"))
+
+        # Features from "getauxval"
+        info = {"uarch": "sifive,u74-mc", "mvendorid": "0x489"}
+        auxv[linux.AT_HWCAP] = 0x112D  # IMAFDC
+        processor = Processor(current_machine=True)
+        assert processor.vendor == "SiFive"
+        assert processor.brand == "sifive,u74-mc"
+        assert processor.features == {"I", "M", "A", "F", "D", "C"}
+
+    finally:
+        linux.cpuinfo = linux_cpuinfo
+        linux.getauxval = linux_getauxval
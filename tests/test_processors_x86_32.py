@@ -4,7 +4,7 @@
 def tests_processor_nocpu():
     """Tests Processor methods that don't need a real x86_32 CPU."""
     from compilertools.processors.x86_32 import Processor
-    from compilertools.processors import x86_32
+    from compilertools.processors import x86_32, _linux
 
     # Initialise dummy CPUID
     string = "Test"
@@ -12,9 +12,18 @@ def tests_processor_nocpu():
     flags = 0b10000000000000000000000000000001
 
     registers = {
-        0: {"ebx": encoded, "ecx": encoded, "edx": encoded},
-        1: {"ecx": flags, "edx": flags},
+        0: {"eax": 0x24, "ebx": encoded, "ecx": encoded, "edx": encoded},
+        1: {"eax": 0x000806F8, "ecx": flags, "edx": flags},
         7: {"ebx": flags, "ecx": flags, "edx": flags},
+        (7, 1): {"eax": flags, "edx": flags | 1 << 19},
+        0x24: {"ebx": 2},
+        # L1 data cache: 8 ways, 64 bytes lines, 64 sets
+        4: {"eax": 0x121, "ebx": 0x01C0003F, "ecx": 0x3F},
+        (4, 1): {"eax": 0},
+        # 2 threads per core, 8 threads per package
+        0x1F: {"ebx": 2, "ecx": 0x100},
+        (0x1F, 1): {"ebx": 8, "ecx": 0x201},
+        (0x1F, 2): {"ebx": 0, "ecx": 0x2},
         0x80000000: {"eax": flags, "ebx": flags, "ecx": flags, "edx": flags},
         0x80000001: {"eax": flags, "ebx": flags, "ecx": flags, "edx": flags},
         0x80000002: {"eax": encoded, "ebx": encoded, "ecx": encoded, "edx": encoded},
@@ -26,30 +35,36 @@ def tests_processor_nocpu():
         """Mock CPUID function."""
 
         def __init__(self, eax=0, ecx=None):
-            self._eax = eax
-            self._ecx = ecx
+            self._leaf = (eax, ecx) if ecx else eax
+
+        @classmethod
+        def batch(cls, leaves):
+            """Batch."""
+            return [cls(eax, ecx) for eax, ecx in leaves]
 
         @property
         def eax(self):
             """EAX."""
-            return registers[self._eax]["eax"]
+            return registers[self._leaf]["eax"]
 
         @property
         def ebx(self):
             """EBX."""
-            return registers[self._eax]["ebx"]
+            return registers[self._leaf]["ebx"]
 
         @property
         def ecx(self):
             """ECX."""
-            return registers[self._eax]["ecx"]
+            return registers[self._leaf]["ecx"]
 
         @property
         def edx(self):
             """EDX."""
-            return registers[self._eax]["edx"]
+            return registers[self._leaf]["edx"]
 
     x86_cpuid = x86_32.Cpuid
+    x86_run_xgetbv = x86_32._run_xgetbv
+    linux_request_xstate_permission = _linux.request_xstate_permission
     x86_32.Cpuid = Cpuid
 
     try:
@@ -60,10 +75,13 @@ def tests_processor_nocpu():
         processor = Processor()
         assert processor.current_machine is False
         assert processor.vendor == ""
+        assert processor.cpuid_highest_function == 0
         assert processor.cpuid_highest_extended_function == 0
         assert processor.brand == ""
         assert processor.os_supports_xsave is False
-        assert processor.features == []
+        assert processor.features == set()
+        assert processor.cache_hierarchy == {}
+        assert processor.topology == {}
 
         # Initialize processor as current one
         processor = Processor(current_machine=True)
@@ -84,6 +102,40 @@ def tests_processor_nocpu():
         del processor["brand"]
         assert processor.brand == string * 12
 
+        # Test signature (With dummy CPUID)
+        assert processor.cpuid_signature == 0x000806F8
+        assert processor.family == 6
+        assert processor.model == 0x8F
+        assert processor.stepping == 8
+
+        # Test microarchitecture
+        assert processor.microarchitecture == ""
+        processor["vendor"] = "GenuineIntel"
+        del processor["microarchitecture"]
+        assert processor.microarchitecture == "sapphirerapids"
+
+        # Test extended family
+        processor["cpuid_signature"] = 0x00A10F11
+        for name in ("family", "model", "stepping", "microarchitecture"):
+            del processor[name]
+        processor["vendor"] = "AuthenticAMD"
+        assert (processor.family, processor.model, processor.stepping) == (
+            0x19,
+            0x11,
+            1,
+        )
+        assert processor.microarchitecture == "znver4"
+
+        # Test microarchitecture identified with features
+        skylake = Processor(current_machine=True)
+        skylake["vendor"] = "GenuineIntel"
+        skylake["cpuid_signature"] = 0x00050657
+        skylake["features"] = {"AVX512F", "AVX512_VNNI"}
+        assert skylake.microarchitecture == "cascadelake"
+
+        # Test cpuid_highest_function
+        assert processor.cpuid_highest_function == 0x24
+
         # Test limited features (With dummy CPUID)
         processor["cpuid_highest_extended_function"] = 0x80000000
         assert processor.features == {
@@ -94,8 +146,23 @@ def tests_processor_nocpu():
             "FSGSBASE",
             "AVX512VL",
             "SSE3",
+            "AVX10",
+            "AVX10_1",
+            "AVX10_2",
         }
 
+        # Test no AVX10 leaf
+        processor["cpuid_highest_function"] = 7
+        del processor["features"]
+        assert "AVX10" in processor.features
+        assert "AVX10_1" not in processor.features
+
+        # Test no structured extended leaves
+        processor["cpuid_highest_function"] = 1
+        del processor["features"]
+        assert processor.features == {"PBE", "FPU", "HYPERVISOR", "SSE3"}
+        processor["cpuid_highest_function"] = 0x24
+
         # Test full features (With dummy CPUID)
         processor["cpuid_highest_extended_function"] = 0x80000001
         del processor["features"]
@@ -109,16 +176,394 @@ def tests_processor_nocpu():
             "PBE",
             "PREFETCHWT1",
             "SSE3",
+            "AVX10",
+            "AVX10_1",
+            "AVX10_2",
+        }
+
+        # Test cache_hierarchy (With dummy CPUID)
+        assert processor.cache_hierarchy == {
+            "L1d": {"size": 32768, "line_size": 64, "associativity": 8}
+        }
+
+        # Test topology (With dummy CPUID)
+        from os import cpu_count
+
+        threads = cpu_count()
+        assert processor.topology == {
+            "packages": -(-threads // 8),
+            "cores": max(threads // 2, 1),
+            "threads": threads,
         }
 
         # Test os_support_avx
         assert processor.os_supports_xsave is False
         del processor["os_supports_xsave"]
-        processor["features"].update(("XSAVE", "OSXSAVE"))
+        processor["features"] = processor["features"] | {"XSAVE", "OSXSAVE"}
         assert processor.os_supports_xsave is True
 
+        # Test OS registers states support (With dummy XGETBV)
+        xcr0 = 0b111
+        xgetbv_calls = []
+
+        def dummy_xgetbv(index):
+            """Mock XGETBV."""
+            xgetbv_calls.append(index)
+            return xcr0
+
+        xstate_permission_calls = []
+
+        def dummy_request_xstate_permission(xfeature):
+            """Mock request_xstate_permission."""
+            xstate_permission_calls.append(xfeature)
+            return True
+
+        x86_32._run_xgetbv = dummy_xgetbv
+        _linux.request_xstate_permission = dummy_request_xstate_permission
+        assert processor.xcr0 == 0b111
+        assert xgetbv_calls == [0]
+        assert processor.os_supports_avx is True
+        assert processor.os_supports_avx512 is False
+        assert processor.os_supports_amx is False
+
+        xcr0 = 0b1100000000011100111
+        for name in (
+            "xcr0",
+            "os_supports_avx",
+            "os_supports_avx512",
+            "os_supports_amx",
+        ):
+            del processor[name]
+        assert processor.os_supports_avx is True
+        assert processor.os_supports_avx512 is True
+        assert processor.os_supports_amx is True
+
+        # Detection must not request AMX permission
+        assert xstate_permission_calls == []
+
+        # XGETBV must not run without OS XSAVE support
+        xgetbv_calls.clear()
+        processor = Processor(current_machine=True)
+        processor["features"] = {"XSAVE"}
+        assert processor.os_supports_avx is False
+        assert processor.xcr0 == 0
+        assert xgetbv_calls == []
+
+        # Not current machine
+        processor = Processor()
+        assert processor.xcr0 == 0
+        assert processor.os_supports_avx512 is False
+
     finally:
         x86_32.Cpuid = x86_cpuid
+        x86_32._run_xgetbv = x86_run_xgetbv
+        _linux.request_xstate_permission = linux_request_xstate_permission
+
+
+def tests_processor_microarchitecture():
+    """Tests Processor microarchitecture from CPU signature."""
+    from compilertools.processors.x86_32 import Processor
+
+    for vendor, family, model, microarchitecture in (
+        ("GenuineIntel", 6, 0x55, "skylake-avx512"),
+        ("GenuineIntel", 6, 0x01, ""),
+        ("AuthenticAMD", 0x15, 0x01, "bdver1"),
+        ("AuthenticAMD", 0x15, 0x02, "bdver2"),
+        ("AuthenticAMD", 0x15, 0x0F, "bdver1"),
+        ("AuthenticAMD", 0x15, 0x10, "bdver2"),
+        ("AuthenticAMD", 0x15, 0x2F, "bdver2"),
+        ("AuthenticAMD", 0x15, 0x30, "bdver3"),
+        ("AuthenticAMD", 0x15, 0x4F, "bdver3"),
+        ("AuthenticAMD", 0x15, 0x50, ""),
+        ("AuthenticAMD", 0x15, 0x60, "bdver4"),
+        ("AuthenticAMD", 0x16, 0x00, "btver2"),
+        ("AuthenticAMD", 0x16, 0x30, "btver2"),
+        ("AuthenticAMD", 0x17, 0x2F, "znver1"),
+        ("AuthenticAMD", 0x17, 0x30, "znver2"),
+        ("AuthenticAMD", 0x19, 0x0F, "znver3"),
+        ("AuthenticAMD", 0x19, 0x10, "znver4"),
+        ("AuthenticAMD", 0x19, 0x5F, "znver3"),
+        ("AuthenticAMD", 0x19, 0x60, "znver4"),
+        ("AuthenticAMD", 0x19, 0x80, "znver4"),
+        ("AuthenticAMD", 0x19, 0xAF, "znver4"),
+        ("AuthenticAMD", 0x19, 0xB0, ""),
+        ("AuthenticAMD", 0x1A, 0x00, "znver5"),
+        ("HygonGenuine", 0x18, 0x00, "znver1"),
+    ):
+        processor = Processor(current_machine=True)
+        processor["vendor"] = vendor
+        processor["family"] = family
+        processor["model"] = model
+        processor["features"] = set()
+        assert processor.microarchitecture == microarchitecture, (vendor, family, model)
+
+
+def tests_processor_os_nocpu():
+    """Tests Processor OS detection backend without a real x86 CPU on Linux."""
+    from compilertools._config import CONFIG
+    from compilertools.processors import x86_32, _linux
+    from compilertools.processors.x86_32 import Processor
+
+    info = {}
+    sysfs = {}
+    hwcap = 0
+
+    def cpuinfo():
+        """Mock cpuinfo."""
+        return info
+
+    def read_sysfs(name):
+        """Mock read_sysfs."""
+        return sysfs.get(name)
+
+    def getauxval(key):
+        """Mock getauxval."""
+        assert key == _linux.AT_HWCAP
+        return hwcap
+
+    def run_cpuid(leaves):
+        """Mock _run_cpuid, failing like without executable memory."""
+        raise RuntimeError("Failed to memory protect")
+
+    linux_cpuinfo = _linux.cpuinfo
+    linux_read_sysfs = _linux.read_sysfs
+    linux_getauxval = _linux.getauxval
+    x86_run_cpuid = x86_32._run_cpuid
+    cpu_detection = CONFIG.get("cpu_detection")
+    _linux.cpuinfo = cpuinfo
+    _linux.read_sysfs = read_sysfs
+    _linux.getauxval = getauxval
+    try:
+        # Backend selected from configuration
+        for mode in ("cpuid", "os"):
+            CONFIG["cpu_detection"] = mode
+            assert Processor(current_machine=True).detection_backend == mode
+        assert Processor().detection_backend == ""
+
+        # Auto selection without executable memory
+        x86_32._run_cpuid = run_cpuid
+        CONFIG["cpu_detection"] = "auto"
+        from platform import system
+
+        if system() == "Linux":
+            assert Processor(current_machine=True).detection_backend == "os"
+        else:
+            from pytest import raises
+
+            with raises(RuntimeError):
+                Processor(current_machine=True).detection_backend
+
+        # Features from "/proc/cpuinfo"
+        CONFIG["cpu_detection"] = "os"
+        info.update(
+            {
+                "vendor_id": "GenuineIntel",
+                "model name": "Intel(R) Xeon(R) Processor",
+                "cpu family": "6",
+                "model": "85",
+                "stepping": "7",
+                "flags": "fpu pni dts sse4_1 avx512f xsave hybrid_cpu constant_tsc",
+            }
+        )
+        processor = Processor(current_machine=True)
+        assert processor.vendor == "GenuineIntel"
+        assert processor.brand == "Intel(R) Xeon(R) Processor"
+        assert processor.cpuid_highest_extended_function == 0
+        assert processor.cpuid_signature == 0
+        assert (processor.family, processor.model, processor.stepping) == (6, 85, 7)
+        assert processor.microarchitecture == "skylake-avx512"
+        assert processor.features == {
+            "FPU",
+            "SSE3",
+            "DS",
+            "SSE4_1",
+            "AVX512F",
+            "XSAVE",
+            "OSXSAVE",
+            "HYBRID",
+        }
+        assert processor.os_supports_xsave is True
+        assert processor.os_supports_avx512 is True
+        assert processor.xcr0 == 0
+
+        # Caches from sysfs
+        sysfs.update(
+            {
+                "cpu0/cache/index0/level": "1",
+                "cpu0/cache/index0/type": "Data",
+                "cpu0/cache/index0/size": "32K",
+                "cpu0/cache/index0/coherency_line_size": "64",
+                "cpu0/cache/index0/ways_of_associativity": "8",
+            }
+        )
+        assert processor.cache_hierarchy == {
+            "L1d": {"size": 32768, "line_size": 64, "associativity": 8}
+        }
+        sysfs.clear()
+
+        # Features from "/sys/devices/system/cpu/modalias"
+        info.clear()
+        sysfs["modalias"] = (
+            "cpu:type:x86,ven0000fam0006mod0055:feature:,0000,0080,0093,0130,0184,03FF"
+        )
+        processor = Processor(current_machine=True)
+        assert processor.vendor == ""
+        assert processor.brand == ""
+        assert processor.features == {"FPU", "SSE3", "SSE4_1", "AVX512F", "AVX_VNNI"}
+
+        # Features from "getauxval(AT_HWCAP)"
+        sysfs.clear()
+        hwcap = 0b11
+        assert Processor(current_machine=True).features == {"FPU", "VME"}
+
+    finally:
+        _linux.cpuinfo = linux_cpuinfo
+        _linux.read_sysfs = linux_read_sysfs
+        _linux.getauxval = linux_getauxval
+        x86_32._run_cpuid = x86_run_cpuid
+        if cpu_detection is None:
+            del CONFIG["cpu_detection"]
+        else:
+            CONFIG["cpu_detection"] = cpu_detection
+
+
+def tests_processor_cross_check():
+    """Tests Processor cross check between CPUID and OS features."""
+    from logging import getLogger, Handler
+    from compilertools._config import CONFIG
+    from compilertools.processors import x86_32
+    from compilertools.processors.x86_32 import Processor
+
+    class TestProcessor(Processor):
+        """Mock processor."""
+
+        def _cpuid_features(self):
+            """CPUID features."""
+            return {"FPU", "SSE3", "LA57"}
+
+        @staticmethod
+        def _os_features():
+            """OS features."""
+            return {"FPU", "SSE3", "AVX"}
+
+    records = []
+
+    class TestHandler(Handler):
+        """Store records."""
+
+        def emit(self, record):
+            """Emit."""
+            records.append(record.getMessage())
+
+    handler = TestHandler()
+    logger = getLogger("compilertools")
+    cpu_detection = CONFIG.get("cpu_detection")
+    x86_run_cpuid = x86_32._run_cpuid
+    x86_32._run_cpuid = lambda leaves: []
+    logger.addHandler(handler)
+    try:
+        assert Processor().cross_check() is None
+        assert TestProcessor(current_machine=True).cross_check() == {
+            "cpuid": {"LA57"},
+            "os": {"AVX"},
+        }
+
+        # Differences not logged by default
+        CONFIG["cpu_detection"] = "auto"
+        processor = TestProcessor(current_machine=True)
+        assert processor.features == {"FPU", "SSE3", "LA57"}
+        assert processor.detection_backend == "cpuid"
+        assert not records
+
+        # Differences logged in cross check mode
+        CONFIG["cpu_detection"] = "cross_check"
+        assert TestProcessor(current_machine=True).features == {"FPU", "SSE3", "LA57"}
+        assert len(records) == 1
+        assert "LA57" in records[0] and "AVX" in records[0]
+
+    finally:
+        logger.removeHandler(handler)
+        x86_32._run_cpuid = x86_run_cpuid
+        if cpu_detection is None:
+            del CONFIG["cpu_detection"]
+        else:
+            CONFIG["cpu_detection"] = cpu_detection
+
+
+def tests_processor_per_core_nocpu():
+    """Tests Processor per core detection without hybrid x86 CPU."""
+    from compilertools._config import CONFIG
+    from compilertools.processors import x86_32
+    from compilertools.processors.x86_32 import Processor
+
+    class Registers:
+        """Mock CPUID result."""
+
+        def __init__(self, eax=0, ebx=0, ecx=0, edx=0):
+            self.eax = eax
+            self.ebx = ebx
+            self.ecx = ecx
+            self.edx = edx
+
+    # CPU 0: Performance core, CPU 1: Efficiency core without AVX512F
+    registers = {
+        (1, 0): (Registers(ecx=1), Registers(ecx=1)),
+        (7, 0): (
+            Registers(ebx=1 << 16 | 1 << 5, edx=1 << 15),
+            Registers(ebx=1 << 5, edx=1 << 15),
+        ),
+        (7, 1): (Registers(), Registers()),
+        (0x1A, 0): (Registers(eax=0x40 << 24), Registers(eax=0x20 << 24)),
+        # L1 data caches: 48K and 32K
+        (4, 0): (
+            Registers(eax=0x121, ebx=0x02C0003F, ecx=0x3F),
+            Registers(eax=0x121, ebx=0x01C0003F, ecx=0x3F),
+        ),
+    }
+
+    def cpuid_per_cpu(leaves):
+        """Mock _cpuid_per_cpu."""
+        return {
+            cpu: [
+                registers.get(leaf, (Registers(), Registers()))[cpu] for leaf in leaves
+            ]
+            for cpu in (0, 1)
+        }
+
+    def cpuid_batch(leaves):
+        """Mock Cpuid.batch, running on CPU 0."""
+        return cpuid_per_cpu(list(leaves))[0]
+
+    x86_cpuid_per_cpu = x86_32._cpuid_per_cpu
+    x86_cpuid_batch = x86_32.Cpuid.__dict__["batch"]
+    cpu_detection = CONFIG.get("cpu_detection")
+    x86_32._cpuid_per_cpu = cpuid_per_cpu
+    x86_32.Cpuid.batch = cpuid_batch
+    try:
+        for mode, features, l1_size in (
+            ("cpuid", {"SSE3", "AVX2", "AVX512F", "HYBRID"}, 49152),
+            ("per_core", {"SSE3", "AVX2", "HYBRID"}, 32768),
+        ):
+            CONFIG["cpu_detection"] = mode
+            processor = Processor(current_machine=True)
+            processor["cpuid_highest_function"] = 0x1A
+            processor["cpuid_highest_extended_function"] = 0
+            assert processor.features == features
+            assert processor.cache_hierarchy["L1d"]["size"] == l1_size
+            assert processor.core_types == {"performance": [0], "efficiency": [1]}
+
+        # Not an hybrid CPU
+        processor = Processor(current_machine=True)
+        processor["features"] = {"SSE3"}
+        assert processor.core_types == {}
+
+    finally:
+        x86_32._cpuid_per_cpu = x86_cpuid_per_cpu
+        x86_32.Cpuid.batch = x86_cpuid_batch
+        if cpu_detection is None:
+            del CONFIG["cpu_detection"]
+        else:
+            CONFIG["cpu_detection"] = cpu_detection
 
 
 def tests_cpuid_nocpu():
@@ -128,6 +573,47 @@ def tests_cpuid_nocpu():
     # Initialize dummy testing environment
     import platform
     import ctypes
+    from compilertools.processors import x86_32
+    from compilertools.processors.x86_32 import (
+        Cpuid,
+        _cpuid_machine_code,
+        _xgetbv_machine_code,
+        _run_xgetbv,
+        _XGETBV_OFFSET,
+    )
+
+    # Check assembly bytecode
+    body = _cpuid_machine_code(True, False)[9:]
+    assert (
+        _cpuid_machine_code(True, False)
+        == (
+            b"\x49\x89\xfa"  # MOV r10, rdi
+            b"\x49\x89\xf3"  # MOV r11, rsi
+            b"\x49\x89\xd0"  # MOV r8, rdx
+        )
+        + body
+    )
+    assert (
+        _cpuid_machine_code(True, True)
+        == (
+            b"\x49\x89\xca"  # MOV r10, rcx
+            b"\x49\x89\xd3"  # MOV r11, rdx
+        )
+        + body
+    )
+    assert b"\x0f\xa2" in body  # CPUID
+    assert body[-1:] == b"\xc3"  # RET
+    assert _cpuid_machine_code(False, False) == _cpuid_machine_code(False, True)
+    assert _cpuid_machine_code(False, False)[-1:] == b"\xc3"
+    assert len(_cpuid_machine_code(True, False)) <= _XGETBV_OFFSET
+    assert len(_cpuid_machine_code(False, False)) <= _XGETBV_OFFSET
+
+    body = _xgetbv_machine_code(True, True)
+    assert _xgetbv_machine_code(True, False) == b"\x89\xf9" + body  # MOV ecx, edi
+    assert body[:3] == b"\x0f\x01\xd0"  # XGETBV
+    assert body[-1:] == b"\xc3"  # RET
+    assert _xgetbv_machine_code(False, False) == _xgetbv_machine_code(False, True)
+    assert b"\x0f\x01\xd0" in _xgetbv_machine_code(False, False)
 
     platform_system = platform.system
     ctypes_cdll = ctypes.cdll
@@ -137,13 +623,14 @@ def tests_cpuid_nocpu():
         ctypes_windll = None
     ctypes_cfunctype = ctypes.CFUNCTYPE
     ctypes_memmove = ctypes.memmove
-    ctypes_c_void_p = ctypes.c_void_p
+    routines = x86_32._ROUTINES
 
     try:
         system = "Unix"
         mem_address = 1
-        mprotect_success = 0
-        func_result = {}
+        protect_success = True
+        memory = {}
+        calls = []
 
         def dummy_system():
             """Mock platform.system."""
@@ -154,9 +641,7 @@ def tests_cpuid_nocpu():
 
         def dummy_memmove(address, bytecode, size):
             """Mock ctypes.memmove. Store bytecode to execute."""
-            func_result["address"] = address
-            func_result["bytecode"] = bytecode
-            func_result["size"] = size
+            memory[address] = (bytecode, size)
 
         class DummyValloc:
             """Mock valloc."""
@@ -170,20 +655,40 @@ def tests_cpuid_nocpu():
 
             def __call__(self, *args, **kwargs):
                 """Mock call."""
-                return mprotect_success
+                return 0 if protect_success else -1
+
+        class DummyVirtualProtect:
+            """Mock VirtualProtect."""
+
+            def __call__(self, *args, **kwargs):
+                """Mock call."""
+                return 1 if protect_success else 0
 
         class DummyCFuncType:
             """Mock ctypes.CFUNCTYPE."""
 
-            def __init__(self, *args, **kwargs):
+            def __init__(self, restype, *args, **kwargs):
                 """Mock init."""
+                self.restype = restype
 
-            def __call__(self, *args, **kwargs):
+            def __call__(self, address):
                 """Mock call."""
+                if self.restype is not None:
 
-                def func(*_, **__):
-                    """Return executed bytecode."""
-                    return func_result
+                    def xgetbv(index):
+                        """Return routine address and index."""
+                        return address << 32 | index
+
+                    return xgetbv
+
+                def func(inputs, outputs, count):
+                    """Fill outputs with inputs values."""
+                    calls.append(count)
+                    for index in range(count):
+                        outputs[index].eax = inputs[index].eax
+                        outputs[index].ebx = inputs[index].ecx
+                        outputs[index].ecx = address
+                        outputs[index].edx = index
 
                 return func
 
@@ -207,66 +712,50 @@ def tests_cpuid_nocpu():
                 """Mock ctypes.windll.kernel32."""
 
                 VirtualAlloc = DummyValloc
+                VirtualProtect = DummyVirtualProtect()
                 VirtualFree = dummy_generic
 
         platform.system = dummy_system
         ctypes.memmove = dummy_memmove
-        ctypes.c_void_p = dummy_generic
         ctypes.CFUNCTYPE = DummyCFuncType
         ctypes.cdll = DummyCDll
         ctypes.windll = DummyWinDll
 
-        from compilertools.processors.x86_32 import Cpuid
-
         for system in ("Unix", "Windows"):
-            # Check assembly bytecode
-            cpuid = Cpuid()
-            assert cpuid.eax["bytecode"] == (
-                b"\x31\xc0"  # XOR eax, eax
-                b"\x31\xc9"  # XOR ecx, ecx
-                b"\x0f\xa2"  # CPUID
-                b"\xc3"
-            )  # RET
-            assert cpuid.ebx["bytecode"] == (
-                b"\x31\xc0"  # XOR eax, eax
-                b"\x31\xc9"  # XOR ecx, ecx
-                b"\x0f\xa2"  # CPUID
-                b"\x89\xd8"  # MOV eax, ebx
-                b"\xc3"
-            )  # RET
-            assert cpuid.ecx["bytecode"] == (
-                b"\x31\xc0"  # XOR eax, eax
-                b"\x31\xc9"  # XOR ecx, ecx
-                b"\x0f\xa2"  # CPUID
-                b"\x89\xc8"  # MOV eax, ecx
-                b"\xc3"
-            )  # RET
-            assert cpuid.edx["bytecode"] == (
-                b"\x31\xc0"  # XOR eax, eax
-                b"\x31\xc9"  # XOR ecx, ecx
-                b"\x0f\xa2"  # CPUID
-                b"\x89\xd0"  # MOV eax, edx
-                b"\xc3"
-            )  # RET
-
-            assert Cpuid(7, 5).eax["bytecode"] == (
-                b"\xb8\x07\x00\x00\x00"  # MOV eax, 0x00000007
-                b"\xb9\x05\x00\x00\x00"  # MOV ecx, 0x00000005
-                b"\x0f\xa2"  # CPUID
-                b"\xc3"
-            )  # RET
+            x86_32._ROUTINES = None
+            calls.clear()
+            memory.clear()
+
+            # Single leaf
+            cpuid = Cpuid(7, 5)
+            assert (cpuid.eax, cpuid.ebx, cpuid.ecx, cpuid.edx) == (7, 5, 1, 0)
+            for address in (mem_address, mem_address + _XGETBV_OFFSET):
+                bytecode, size = memory[address]
+                assert size == len(bytecode)
+
+            # Multiple leaves in a single call, routine loaded once
+            leaves = [(0, 0), (1, 0), (7, 1)]
+            results = Cpuid.batch(leaves)
+            assert [(cpuid.eax, cpuid.ebx) for cpuid in results] == leaves
+            assert [cpuid.edx for cpuid in results] == [0, 1, 2]
+            assert calls == [1, 3]
+
+            # XGETBV routine in the same memory page
+            assert _run_xgetbv(0) == (mem_address + _XGETBV_OFFSET) << 32
+            assert len(memory) == 2
 
             # Test failed to allocate memory
+            x86_32._ROUTINES = None
             mem_address = 0
             with raises(RuntimeError):
-                Cpuid().eax
+                Cpuid()
             mem_address = 1
 
-        # Test failed to mprotect
-        system = "Unix"
-        mprotect_success = 1
-        with raises(RuntimeError):
-            Cpuid().eax
+            # Test failed to protect memory
+            protect_success = False
+            with raises(RuntimeError):
+                Cpuid()
+            protect_success = True
 
     finally:
         platform.system = platform_system
@@ -277,7 +766,7 @@ def tests_cpuid_nocpu():
             del ctypes.windll
         ctypes.CFUNCTYPE = ctypes_cfunctype
         ctypes.memmove = ctypes_memmove
-        ctypes.c_void_p = ctypes_c_void_p
+        x86_32._ROUTINES = routines
 
 
 def tests_cpuid():
@@ -297,7 +786,7 @@ def tests_cpuid():
         skip("x86cpu package not installed")
     from compilertools.processors.x86_32 import Cpuid
 
-    for eax, ecx in (
+    leaves = (
         (0, 0),
         (1, 0),
         (2, 0),
@@ -309,13 +798,89 @@ def tests_cpuid():
         (0x80000002, 0),
         (0x80000003, 0),
         (0x80000004, 0),
-    ):
+    )
+    for (eax, ecx), batch_cpuid in zip(leaves, Cpuid.batch(leaves)):
         ref = cpuid_ref(eax, ecx)
-        cpuid = Cpuid(eax, ecx)
-        assert cpuid.eax == ref["eax"]
-        assert cpuid.ecx == ref["ecx"]
-        assert cpuid.ebx == ref["ebx"]
-        assert cpuid.edx == ref["edx"]
+        for cpuid in (Cpuid(eax, ecx), batch_cpuid):
+            assert cpuid.eax == ref["eax"]
+            assert cpuid.ecx == ref["ecx"]
+            assert cpuid.ebx == ref["ebx"]
+            assert cpuid.edx == ref["edx"]
+
+
+def tests_cpuid_batch():
+    """Test cpuid batch with a real x86 CPU."""
+    from compilertools.processors import get_arch
+
+    if get_arch().split("_")[0] != "x86":
+        from pytest import skip
+
+        skip("Current processor is not x86")
+
+    from compilertools.processors.x86_32 import Cpuid
+
+    highest_function = Cpuid().eax
+    assert highest_function > 0
+
+    leaves = [(0, 0), (1, 0), (0x80000000, 0)]
+    for cpuid, batch_cpuid in zip(
+        (Cpuid(eax, ecx) for eax, ecx in leaves), Cpuid.batch(leaves)
+    ):
+        # EBX not compared: May contain the APIC ID of the core running the code
+        assert cpuid.eax == batch_cpuid.eax
+        assert cpuid.ecx == batch_cpuid.ecx
+        assert cpuid.edx == batch_cpuid.edx
+
+    assert Cpuid.batch([]) == []
+
+
+def tests_cpuid_per_cpu():
+    """Test cpuid on each CPU with a real x86 CPU."""
+    from compilertools.processors import get_arch
+    from pytest import skip
+
+    if get_arch().split("_")[0] != "x86":
+        skip("Current processor is not x86")
+
+    try:
+        from os import sched_getaffinity
+    except ImportError:
+        skip("CPU affinity not available")
+
+    from compilertools.processors.x86_32 import Cpuid, _cpuid_per_cpu
+
+    cpus = sched_getaffinity(0)
+    results = _cpuid_per_cpu([(0, 0), (1, 0)])
+    assert set(results) == cpus
+    for registers in results.values():
+        assert registers[0].eax == Cpuid().eax
+        assert registers[1].ecx == Cpuid(1).ecx
+
+    # Calling thread affinity not changed
+    assert sched_getaffinity(0) == cpus
+
+
+def tests_xgetbv():
+    """Test xgetbv with a real x86 CPU."""
+    from compilertools.processors import get_arch
+
+    if get_arch().split("_")[0] != "x86":
+        from pytest import skip
+
+        skip("Current processor is not x86")
+
+    from compilertools.processors.x86_32 import Cpuid, _run_xgetbv
+
+    # OSXSAVE
+    if not Cpuid(1).ecx & 1 << 27:
+        from pytest import skip
+
+        skip("XGETBV not enabled by the OS")
+
+    # x87 FPU state is always saved
+    xcr0 = _run_xgetbv(0)
+    assert xcr0 & 1
+    assert xcr0 == _run_xgetbv(0)
 
 
 def tests_processor():
@@ -20,3 +20,39 @@ def tests_processor():
 
     processor = Processor(current_machine=True)
     assert processor.features
+    assert 1 <= processor.x86_64_level <= 4
+
+
+def tests_x86_64_level():
+    """Tests x86-64 psABI microarchitecture level."""
+    from compilertools.processors.x86_64 import Processor, X86_64_LEVELS
+
+    # Not current machine
+    assert Processor().x86_64_level == 0
+
+    # Levels are cumulative
+    for level in (2, 3, 4):
+        assert X86_64_LEVELS[level - 1] < X86_64_LEVELS[level]
+
+    for level, features in X86_64_LEVELS.items():
+        processor = Processor(current_machine=True)
+        processor["features"] = features
+        processor["os_supports_avx"] = True
+        processor["os_supports_avx512"] = True
+        assert processor.x86_64_level == level
+
+    # Missing feature
+    processor["features"] = X86_64_LEVELS[3] - {"MOVBE"}
+    del processor["x86_64_level"]
+    assert processor.x86_64_level == 2
+
+    # OS not saving AVX-512 registers states
+    processor["features"] = X86_64_LEVELS[4]
+    processor["os_supports_avx512"] = False
+    del processor["x86_64_level"]
+    assert processor.x86_64_level == 3
+
+    # Not x86-64
+    processor["features"] = {"FPU"}
+    del processor["x86_64_level"]
+    assert processor.x86_64_level == 0